@@ -0,0 +1,80 @@
+"""
+Distance Matrix Benchmark
+
+Compares the original per-technician/per-server Python loop used by
+POST /floor_updates against the vectorized DistanceEngine.
+
+Usage:
+    python benchmark_distances.py [--full]
+
+By default the Python loop is timed on a sample of technician rows and
+extrapolated to the full matrix; pass --full to run it over every row.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import config
+from distance_engine import compute_distance_matrix
+
+SIZES = [(100, 10_000), (1_000, 50_000)]
+SAMPLE_ROWS = 20
+
+
+def naive_distances(technician_coords, server_coords):
+    """The scalar loop that previously lived in post_distances."""
+    distances = []
+    for tx, ty, tz in technician_coords:
+        tech_distances = []
+        for sx, sy, sz in server_coords:
+            distance = int(
+                ((tx - sx) ** 2 + (ty - sy) ** 2) ** 0.5
+                + abs(tz - sz) * config.FLOOR_WEIGHT
+            )
+            tech_distances.append(distance)
+        distances.append(tech_distances)
+    return distances
+
+
+def random_coords(rng, count):
+    coords = rng.uniform(0, 200, size=(count, 3))
+    coords[:, 2] = rng.integers(1, 6, size=count)
+    return coords
+
+
+def run_benchmark(num_techs, num_servers, full=False):
+    rng = np.random.default_rng(0)
+    techs = random_coords(rng, num_techs)
+    servers = random_coords(rng, num_servers)
+
+    start = time.perf_counter()
+    vectorized = compute_distance_matrix(techs, servers)
+    vectorized_time = time.perf_counter() - start
+
+    rows = num_techs if full else min(SAMPLE_ROWS, num_techs)
+    tech_list = techs[:rows].tolist()
+    server_list = servers.tolist()
+    start = time.perf_counter()
+    naive = naive_distances(tech_list, server_list)
+    naive_time = (time.perf_counter() - start) * (num_techs / rows)
+
+    if not np.array_equal(np.array(naive), vectorized[:rows]):
+        raise AssertionError("Vectorized distances differ from the Python loop")
+
+    label = "" if rows == num_techs else " (extrapolated)"
+    print(f"{num_techs} technicians x {num_servers} servers")
+    print(f"  Python loop:  {naive_time:8.3f} s{label}")
+    print(f"  Vectorized:   {vectorized_time:8.3f} s")
+    print(f"  Speedup:      {naive_time / vectorized_time:8.1f}x\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--full", action="store_true", help="Run the Python loop over every row"
+    )
+    args = parser.parse_args()
+    for num_techs, num_servers in SIZES:
+        run_benchmark(num_techs, num_servers, full=args.full)
@@ -0,0 +1,140 @@
+"""
+Incremental Assignment Benchmark
+
+Measures how long TaskAssigner takes to produce a new optimal assignment
+after a single-entity change (one technician moves, one ticket appears, one
+ticket closes), comparing the warm-started incremental solver against a full
+OR-Tools graph rebuild and re-solve.
+
+Usage:
+    python benchmark_incremental.py [--technicians 500] [--tickets 5000]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+import numpy as np
+
+import config
+from models import JiraTicket, Location, Technician
+from task_assignment import Graph, TaskAssigner
+
+REPEATS = 20
+FULL_REPEATS = 3
+
+
+def random_location(rng):
+    return Location(
+        x=float(rng.uniform(0, 200)),
+        y=float(rng.uniform(0, 200)),
+        z=float(rng.integers(1, 6)),
+    )
+
+
+def build_assigner(rng, num_techs, num_tickets):
+    assigner = TaskAssigner()
+    tickets = [
+        JiraTicket(key=f"OPS-{i}", server_id=f"SRV-{i}") for i in range(num_tickets)
+    ]
+    assigner.refresh_tasks(tickets, [random_location(rng) for _ in tickets])
+    assigner.update_floor(
+        [
+            Technician(id=f"tech-{i}", location=random_location(rng))
+            for i in range(num_techs)
+        ]
+    )
+    config.ASSIGNMENT_BACKEND = "incremental"
+    start = time.perf_counter()
+    assigner.assign_tasks()
+    print(f"  initial solve from scratch: {(time.perf_counter() - start) * 1000:.1f} ms")
+    return assigner
+
+
+def total_cost(assigner, assignments):
+    rows = {tech: i for i, tech in enumerate(assigner.technicians)}
+    cols = {key: j for j, key in enumerate(assigner.engine.target_ids)}
+    return sum(
+        int(assigner.distances[rows[tech], cols[task.key]]) - assigner.priority_weight
+        for tech, task in assignments.items()
+    )
+
+
+def reference_cost(assigner):
+    """Cost of a from-scratch OR-Tools solve of the current state."""
+    graph = Graph(
+        technicians=assigner.technicians,
+        tasks=assigner.tasks,
+        distances=np.array(assigner.distances),
+        task_priorities=np.ones(len(assigner.tasks)),
+        priority_weight=assigner.priority_weight,
+    )
+    return total_cost(assigner, graph.solve_graph())
+
+
+def time_delta(assigner, apply_delta, repeats, backend):
+    config.ASSIGNMENT_BACKEND = backend
+    timings = []
+    for _ in range(repeats):
+        apply_delta()
+        start = time.perf_counter()
+        assignments = assigner.assign_tasks()
+        timings.append(time.perf_counter() - start)
+    return timings, total_cost(assigner, assignments)
+
+
+def run_benchmark(num_techs, num_tickets):
+    rng = np.random.default_rng(0)
+    print(f"{num_techs} technicians x {num_tickets} tickets")
+    assigner = build_assigner(rng, num_techs, num_tickets)
+    next_ticket = [num_tickets]
+
+    def move_technician():
+        tech = assigner.technicians[int(rng.integers(len(assigner.technicians)))]
+        assigner.add_technician(tech, random_location(rng))
+
+    def open_ticket():
+        key = f"OPS-{next_ticket[0]}"
+        next_ticket[0] += 1
+        assigner.upsert_task(JiraTicket(key=key, server_id=key), random_location(rng))
+
+    def close_ticket():
+        # Close an assigned ticket so the delta actually displaces a technician.
+        task = next(iter(assigner.assignments.values()))
+        assigner.remove_task(task.key)
+
+    for name, delta in [
+        ("technician moves", move_technician),
+        ("ticket opened", open_ticket),
+        ("ticket closed", close_ticket),
+    ]:
+        incremental, incremental_cost = time_delta(
+            assigner, delta, REPEATS, "incremental"
+        )
+        full_cost = reference_cost(assigner)
+        if incremental_cost != full_cost:
+            raise AssertionError(
+                f"Incremental cost {incremental_cost} != full cost {full_cost}"
+            )
+        full, _ = time_delta(assigner, delta, FULL_REPEATS, "min_cost_flow")
+        print(f"  {name}:")
+        print(f"    full re-solve (OR-Tools): {statistics.median(full) * 1000:9.1f} ms")
+        print(
+            f"    incremental:              "
+            f"{statistics.median(incremental) * 1000:9.1f} ms (median)"
+            f", {max(incremental) * 1000:.1f} ms (max)"
+        )
+    print(
+        f"  solver: {assigner.solvers['incremental'].incremental_solves} incremental, "
+        f"{assigner.solvers['incremental'].full_solves} full solves"
+    )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--technicians", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=5000)
+    args = parser.parse_args()
+    run_benchmark(args.technicians, args.tickets)
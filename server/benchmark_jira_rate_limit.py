@@ -0,0 +1,106 @@
+"""
+Jira Throttling Benchmark
+
+Runs a full-project ticket fetch (the background sync) against the local Jira
+stand-in (jira_standin.py) with a token-bucket rate limit and injected 503s,
+while technicians post comments at a steady rate. Reports whether the sync
+completed, how many comments failed, the comments' latency, and the
+transport's concurrency/retry counters.
+
+Usage:
+    python benchmark_jira_rate_limit.py [--issues 5000] [--comments 40] [--rate-limit 40] [--error-rate 0.02]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+import numpy as np
+
+from jira_standin import StandinServer, create_standin_app
+
+
+async def post_comments(client, count, interval):
+    async def post(i):
+        await asyncio.sleep(i * interval)
+        start = time.perf_counter()
+        try:
+            await client.add_comment(f"OPS-{i + 1}", f"Replaced drive ({i})")
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(post(i) for i in range(count)))
+
+
+async def fetch_all(client):
+    start = time.perf_counter()
+    try:
+        tickets = await client._fetch_tickets("project = OPS ORDER BY created DESC")
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+    return tickets, time.perf_counter() - start, None
+
+
+async def run_benchmark(num_issues, num_comments, rate_limit, error_rate, latency):
+    app = create_standin_app(
+        num_issues, latency=latency, error_rate=error_rate, rate_limit=rate_limit
+    )
+    with StandinServer(app) as server:
+        os.environ.update(
+            JIRA_URL=server.url,
+            JIRA_USERNAME="bench",
+            JIRA_API_TOKEN="bench",
+        )
+        from jira import JiraClient
+
+        client = JiraClient()
+        # Spread the comments over roughly the time the sync takes
+        interval = num_issues / 100 / rate_limit / max(num_comments, 1)
+        (tickets, fetch_time, error), latencies = await asyncio.gather(
+            fetch_all(client), post_comments(client, num_comments, interval)
+        )
+        stats = client.transport.stats() if hasattr(client.transport, "stats") else {}
+        await client.transport.aclose()
+
+    posted = [latency for latency in latencies if latency is not None]
+    print(f"{num_issues} issues, {num_comments} comments, {rate_limit:g} req/s limit, "
+          f"{error_rate:.0%} errors, {latency * 1000:.0f} ms latency")
+    if error is None:
+        print(f"  full fetch:         {len(tickets)} tickets in {fetch_time:.2f} s")
+    else:
+        print(f"  full fetch:         FAILED after {fetch_time:.2f} s ({error})")
+    print(f"  comments posted:    {len(posted)}/{num_comments}")
+    if posted:
+        ms = np.array(posted) * 1000
+        print(f"  comment latency:    p50 {np.percentile(ms, 50):7.1f} ms, "
+              f"p99 {np.percentile(ms, 99):7.1f} ms")
+    if stats:
+        print(f"  transport:          {stats['requests']} requests, {stats['retries']} retries, "
+              f"{stats['throttled']} throttled, {stats['retry_budget_exhausted']} out of budget, "
+              f"final limit {stats['concurrency_limit']}")
+    print()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=40)
+    parser.add_argument(
+        "--rate-limit", type=float, default=40, help="Stand-in requests per second"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.02, help="Fraction of requests failed with 503"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds of latency per request"
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        run_benchmark(
+            args.issues, args.comments, args.rate_limit, args.error_rate, args.latency
+        )
+    )
@@ -0,0 +1,108 @@
+"""
+Task Assigner Rebuild Memory Benchmark
+
+Measures Python-side allocation (tracemalloc) per TaskAssigner rebuild:
+refresh_tasks with every ticket followed by assign_tasks, plus the cost of a
+snapshot taken between writes. For reference it also measures what deep
+copies of the same tickets and distance matrix cost, which is what each
+rebuild used to allocate on top.
+
+Usage:
+    python benchmark_snapshots.py [--technicians 50] [--tickets 10000] [--backend min_cost_flow]
+"""
+
+import argparse
+import copy
+import logging
+import tracemalloc
+
+import numpy as np
+
+import config
+from models import JiraTicket, Location
+from task_assignment import TaskAssigner
+
+MB = 1024 * 1024
+
+
+def make_tickets(num_tickets, rng):
+    tickets = [
+        JiraTicket(
+            key=f"OPS-{i}",
+            id=str(10000 + i),
+            summary=f"[01-{i % 20:02d}-{i % 7:02d}-{i % 11:02d}-U{i % 10}] Disk failure",
+            description="Replace the failed drive and re-run diagnostics. " * 4,
+            status="To Do",
+            priority="High",
+            created="2025-01-01T10:00:00.000+0000",
+            updated="2025-01-02T10:00:00.000+0000",
+            project="OPS",
+            issue_type="Task",
+            labels=["hardware"],
+            server_id=f"01-{i % 20:02d}-{i % 7:02d}-{i % 11:02d}-U{i % 10}",
+        )
+        for i in range(num_tickets)
+    ]
+    locations = rng.uniform(0, 200, size=(num_tickets, 3))
+    locations[:, 2] = rng.integers(0, 3, size=num_tickets)
+    return tickets, locations
+
+
+def measure(action):
+    """Run action under tracemalloc, returning (peak MB, retained MB, result)."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    result = action()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (peak - before) / MB, (current - before) / MB, result
+
+
+def run_benchmark(num_techs, num_tickets, backend):
+    config.ASSIGNMENT_BACKEND = backend
+    rng = np.random.default_rng(0)
+    tickets, locations = make_tickets(num_tickets, rng)
+
+    assigner = TaskAssigner()
+    for t in range(num_techs):
+        x, y = rng.uniform(0, 200, size=2)
+        assigner.add_technician(f"tech-{t}", Location(x=x, y=y, z=float(t % 3)))
+
+    def rebuild():
+        assigner.refresh_tasks(tickets, locations)
+        return assigner.assign_tasks()
+
+    rebuild()  # warm up the engine's arrays and solver state
+    peak, retained, assignments = measure(rebuild)
+
+    snapshot_peak, _, snapshot = measure(assigner.snapshot)
+    move_peak, _, _ = measure(
+        lambda: assigner.update_technician_location(
+            "tech-0", Location(x=1.0, y=2.0, z=0.0)
+        )
+    )
+    if snapshot.distances.flags.writeable:
+        raise AssertionError("Snapshot distances must be read-only")
+
+    deepcopy_tasks, _, _ = measure(lambda: copy.deepcopy(tickets))
+    deepcopy_matrix, _, _ = measure(lambda: copy.deepcopy(assigner.distances))
+
+    print(f"{num_techs} technicians x {num_tickets} tickets ({backend})")
+    print(f"  rebuild (refresh + solve):      {peak:8.2f} MB peak, {retained:6.2f} MB retained")
+    print(f"  snapshot:                       {snapshot_peak:8.3f} MB peak")
+    print(f"  first move after a snapshot:    {move_peak:8.2f} MB peak (one matrix copy)")
+    print(f"  for reference, deep copies of:")
+    print(f"    the tickets                   {deepcopy_tasks:8.2f} MB")
+    print(f"    the distance matrix           {deepcopy_matrix:8.2f} MB")
+    print(f"  {len(assignments)} assignments\n")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--technicians", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--backend", default="min_cost_flow")
+    args = parser.parse_args()
+    run_benchmark(args.technicians, args.tickets, args.backend)
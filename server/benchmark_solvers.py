@@ -0,0 +1,95 @@
+"""
+Assignment Solver Backend Benchmark
+
+Solves random technician-to-task problems from scratch with every solver
+backend in task_assignment and reports the solve time per backend and matrix
+size, along with the backend "auto" would pick. All backends must agree on
+the optimal total cost.
+
+Usage:
+    python benchmark_solvers.py [--all] [--backend NAME ...]
+
+The OR-Tools min-cost-flow backend is skipped above MAX_FLOW_CELLS
+technician-task pairs unless --all is given.
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from task_assignment import create_solvers, select_solver
+
+SIZES = [
+    (50, 500),
+    (200, 2_000),
+    (500, 5_000),
+    (1_000, 1_000),
+    (2_000, 2_000),
+    (1_000, 10_000),
+    (5_000, 500),
+]
+MAX_FLOW_CELLS = 5_000_000
+TASK_COST = 2.0
+
+
+def total_cost(distances, task_costs, technician_ids, task_ids, assignments):
+    rows = {tech: i for i, tech in enumerate(technician_ids)}
+    cols = {task: j for j, task in enumerate(task_ids)}
+    return sum(
+        np.trunc(distances[rows[tech], cols[task]] - task_costs[cols[task]])
+        for tech, task in assignments.items()
+    )
+
+
+def run_size(num_techs, num_tasks, backends, include_all):
+    rng = np.random.default_rng(num_techs * num_tasks)
+    distances = rng.uniform(0, 300, size=(num_techs, num_tasks)).astype(np.int32)
+    task_costs = np.full(num_tasks, TASK_COST)
+    technician_ids = [f"tech-{i}" for i in range(num_techs)]
+    task_ids = [f"OPS-{j}" for j in range(num_tasks)]
+
+    print(
+        f"{num_techs} technicians x {num_tasks} tasks "
+        f"(auto: {select_solver(num_techs, num_tasks)})"
+    )
+    costs = {}
+    for name, solver in backends.items():
+        if name == "min_cost_flow" and not include_all:
+            if num_techs * num_tasks > MAX_FLOW_CELLS:
+                print(f"  {name:24s}   skipped")
+                continue
+        start = time.perf_counter()
+        assignments = solver.solve(
+            technician_ids, task_ids, distances, task_costs, full=True
+        )
+        elapsed = time.perf_counter() - start
+        costs[name] = total_cost(
+            distances, task_costs, technician_ids, task_ids, assignments
+        )
+        print(f"  {name:24s} {elapsed * 1000:9.1f} ms")
+
+    if len(set(costs.values())) > 1:
+        raise AssertionError(f"Backends disagree on the optimal cost: {costs}")
+    print()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    solvers = create_solvers()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--all", action="store_true", help="Run min_cost_flow on every size"
+    )
+    parser.add_argument(
+        "--backend", action="append", choices=sorted(solvers), help="Backends to run"
+    )
+    args = parser.parse_args()
+    selected = {
+        name: solver
+        for name, solver in solvers.items()
+        if not args.backend or name in args.backend
+    }
+    for num_techs, num_tasks in SIZES:
+        run_size(num_techs, num_tasks, selected, args.all)
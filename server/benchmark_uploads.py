@@ -0,0 +1,116 @@
+"""
+Attachment Upload Memory Benchmark
+
+Starts the API server (uvicorn main:app) in a subprocess pointed at the
+local Jira stand-in (jira_standin.py), sends concurrent attachment uploads
+to POST /items/{ticket_key}/attachments and reports the server's resident
+memory before and at peak (VmHWM), plus wall time.
+
+Usage:
+    python benchmark_uploads.py [--uploads 50] [--size-mb 20] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from jira_standin import StandinServer, create_standin_app
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_mb(pid, field):
+    """Read a memory field (VmRSS, VmHWM) of a process from /proc, in MB."""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise KeyError(field)
+
+
+def start_api(jira_url, port):
+    env = dict(
+        os.environ,
+        JIRA_URL=jira_url,
+        JIRA_USERNAME="bench",
+        JIRA_API_TOKEN="bench",
+        JIRA_PROJECT_KEY="OPS",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        try:
+            if httpx.get(f"{url}/technicians").status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("API server did not start")
+
+
+async def upload_all(url, path, uploads):
+    async def upload(client, i):
+        with open(path, "rb") as f:
+            response = await client.post(
+                f"{url}/items/OPS-{i + 1}/attachments",
+                files={"file": (f"photo-{i}.jpg", f, "image/jpeg")},
+            )
+        return response.status_code
+
+    async with httpx.AsyncClient(timeout=600) as client:
+        return await asyncio.gather(*(upload(client, i) for i in range(uploads)))
+
+
+def run_benchmark(uploads, size_mb, latency):
+    with StandinServer(create_standin_app(max(uploads, 100), latency=latency)) as jira, \
+            tempfile.NamedTemporaryFile(suffix=".jpg") as photo:
+        photo.write(os.urandom(size_mb * 1024 * 1024))
+        photo.flush()
+
+        process, url = start_api(jira.url, free_port())
+        try:
+            baseline = memory_mb(process.pid, "VmRSS")
+            start = time.perf_counter()
+            statuses = asyncio.run(upload_all(url, photo.name, uploads))
+            elapsed = time.perf_counter() - start
+            peak = memory_mb(process.pid, "VmHWM")
+        finally:
+            process.terminate()
+            process.wait()
+
+    ok = sum(status == 200 for status in statuses)
+    print(f"{uploads} concurrent uploads of {size_mb} MB ({latency * 1000:.0f} ms Jira latency)")
+    print(f"  succeeded:        {ok}/{uploads}")
+    print(f"  wall time:        {elapsed:8.2f} s")
+    print(f"  server RSS idle:  {baseline:8.1f} MB")
+    print(f"  server RSS peak:  {peak:8.1f} MB")
+    print(f"  peak growth:      {peak - baseline:8.1f} MB "
+          f"({uploads * size_mb} MB uploaded)\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--size-mb", type=int, default=20)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds of latency per Jira request"
+    )
+    args = parser.parse_args()
+    run_benchmark(args.uploads, args.size_mb, args.latency)
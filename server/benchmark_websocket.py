@@ -0,0 +1,210 @@
+"""
+Technician Websocket Load Benchmark
+
+Starts the API server (uvicorn main:app) in a subprocess pointed at the
+local Jira stand-in (jira_standin.py), registers the servers its tickets are
+filed against at random locations, then brings many technicians online at
+once over /ws/technician while probing an unrelated endpoint
+(GET /items/{ticket_key}). Reports the probe's latency before and during the
+burst, and how long technicians waited for their assignment. With everyone
+still connected it then moves technicians over HTTP and times how long each
+waits for the new assignment the server pushes.
+
+Usage:
+    python benchmark_websocket.py [--technicians 200] [--tickets 5000] [--servers 500]
+                                  [--latency 0.05] [--moves 20]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+import numpy as np
+import websockets
+
+from benchmark_uploads import free_port, start_api
+from jira_standin import StandinServer, create_standin_app
+
+
+async def probe(client, url, stop, latencies):
+    """Time GET requests against an endpoint that has nothing to do with technicians."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(f"{url}/items/OPS-1")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+def random_location():
+    return {
+        "x": random.uniform(0, 200),
+        "y": random.uniform(0, 200),
+        "z": float(random.randint(0, 2)),
+    }
+
+
+async def next_assignment(ws, timeout):
+    """Wait for the next assignment message, returning its ticket key."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return None
+        try:
+            message = json.loads(await asyncio.wait_for(ws.recv(), remaining))
+        except asyncio.TimeoutError:
+            return None
+        if message.get("event_type") == "assignment":
+            return message["payload"]["key"]
+
+
+async def latest_assignment(ws, key):
+    """Drain already-delivered messages, returning the newest assignment's key."""
+    while True:
+        pushed = await next_assignment(ws, 0.05)
+        if pushed is None:
+            return key
+        key = pushed
+
+
+async def come_online(ws_url, tech_id, timeout):
+    """Connect, announce the technician and wait for its assignment."""
+    ws = await websockets.connect(ws_url, max_size=None)
+    start = time.perf_counter()
+    await ws.send(json.dumps(
+        {"event_type": "online", "payload": {"id": tech_id, "location": random_location()}}
+    ))
+    key = await next_assignment(ws, timeout)
+    return ws, key, None if key is None else time.perf_counter() - start
+
+
+async def move(client, url, tech_id, ws, current_key, timeout):
+    """
+    Move a technician over HTTP and time until its new assignment is pushed.
+    Returns None if the move didn't change its assignment.
+    """
+    start = time.perf_counter()
+    response = await client.put(
+        f"{url}/technicians/{tech_id}/location", json=random_location()
+    )
+    response.raise_for_status()
+    key = await next_assignment(ws, timeout)
+    if key is None or key == current_key:
+        return None
+    return time.perf_counter() - start
+
+
+async def add_servers(client, url, server_ids):
+    for server_id in server_ids:
+        response = await client.post(
+            f"{url}/servers",
+            json={"id": server_id, "name": server_id, "location": random_location()},
+        )
+        response.raise_for_status()
+
+
+async def run_load(url, server_ids, technicians, baseline_seconds, timeout, moves):
+    ws_url = url.replace("http://", "ws://") + "/ws/technician"
+    stop = asyncio.Event()
+    async with httpx.AsyncClient(timeout=60) as client:
+        await add_servers(client, url, server_ids)
+
+        baseline = []
+        prober = asyncio.create_task(probe(client, url, stop, baseline))
+        await asyncio.sleep(baseline_seconds)
+        stop.set()
+        await prober
+
+        stop = asyncio.Event()
+        during = []
+        prober = asyncio.create_task(probe(client, url, stop, during))
+        start = time.perf_counter()
+        sessions = await asyncio.gather(
+            *(come_online(ws_url, f"tech-{i}", timeout) for i in range(technicians))
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+        # Later arrivals change earlier technicians' assignments; catch up
+        # on those pushes before timing new ones
+        await asyncio.sleep(1.0)
+        keys = await asyncio.gather(*(latest_assignment(ws, key) for ws, key, _ in sessions))
+
+        # Moves are sequential so each push is timed against a quiet server
+        pushes = []
+        for i in random.sample(range(technicians), min(moves, technicians)):
+            ws = sessions[i][0]
+            push = await move(client, url, f"tech-{i}", ws, keys[i], min(timeout, 2.0))
+            if push is not None:
+                pushes.append(push)
+        for ws, _, _ in sessions:
+            await ws.close()
+    waits = [wait for _, _, wait in sessions]
+    return baseline, during, waits, elapsed, pushes
+
+
+def percentiles(samples):
+    ms = np.array(samples) * 1000
+    return f"p50 {np.percentile(ms, 50):7.1f} ms, p99 {np.percentile(ms, 99):7.1f} ms, max {ms.max():7.1f} ms"
+
+
+def run_benchmark(technicians, tickets, servers, latency, baseline_seconds, timeout, moves):
+    random.seed(0)
+    server_ids = [f"01-01-{i // 20 + 1:02d}-{i % 20 + 1:02d}-U1" for i in range(servers)]
+    app = create_standin_app(tickets, latency=latency, server_ids=server_ids)
+    with StandinServer(app) as jira:
+        process, url = start_api(jira.url, free_port())
+        try:
+            baseline, during, waits, elapsed, pushes = asyncio.run(
+                run_load(url, server_ids, technicians, baseline_seconds, timeout, moves)
+            )
+        finally:
+            process.terminate()
+            process.wait()
+
+    assigned = [wait for wait in waits if wait is not None]
+    print(f"{technicians} technicians online at once, {tickets} tickets on {servers} "
+          f"servers ({latency * 1000:.0f} ms Jira latency)")
+    print(f"  GET /items/OPS-1 idle:         {percentiles(baseline)} ({len(baseline)} requests)")
+    print(f"  GET /items/OPS-1 during burst: {percentiles(during)} ({len(during)} requests)")
+    print(f"  assigned:                      {len(assigned)}/{technicians} in {elapsed:.2f} s")
+    if assigned:
+        print(f"  time to assignment:            {percentiles(assigned)}")
+    if pushes:
+        print(f"  move -> pushed assignment:     {percentiles(pushes)} "
+              f"({len(pushes)}/{moves} moves changed the assignment)")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--technicians", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--servers", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds of latency per Jira request"
+    )
+    parser.add_argument(
+        "--baseline-seconds", type=float, default=2.0, help="Probe duration before the burst"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Seconds to wait for each assignment"
+    )
+    parser.add_argument(
+        "--moves", type=int, default=20, help="Technicians to move after the burst"
+    )
+    args = parser.parse_args()
+    run_benchmark(
+        args.technicians,
+        args.tickets,
+        args.servers,
+        args.latency,
+        args.baseline_seconds,
+        args.timeout,
+        args.moves,
+    )
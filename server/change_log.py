@@ -0,0 +1,112 @@
+"""
+Bounded change log for delta sync.
+
+Each collection (tickets, servers, technicians) records which keys were
+upserted or removed at every version, so a client that remembers the version
+of its last response can ask for just the changes since then. When the log
+has rolled past that version the client is told to resync from the full list.
+"""
+from collections import deque
+from typing import Deque, Iterable, List, NamedTuple, Optional, Tuple
+import threading
+import time
+
+import config
+
+
+class Changes(NamedTuple):
+    upserted: List[str]
+    removed: List[str]
+
+
+def initial_version() -> int:
+    """
+    Starting version for a new log: the current time in microseconds, so
+    versions handed out by a previous run of the server are older than
+    anything this run can answer and get a resync instead of a wrong delta.
+    """
+    return time.time_ns() // 1000
+
+
+class ChangeLog:
+    def __init__(self, max_entries: int = config.CHANGE_LOG_MAX_ENTRIES):
+        """
+        Create an empty log.
+
+        Args:
+            max_entries: Number of key changes to keep before the oldest
+                roll off
+        """
+        self.max_entries = max_entries
+        self.version = initial_version()
+        # Every change after this version is still in the log
+        self._floor = self.version
+        self._entries: Deque[Tuple[int, str, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def record(self, upserted: Iterable[str] = (), removed: Iterable[str] = ()) -> int:
+        """
+        Record one change set under a new version.
+
+        Args:
+            upserted: Keys that were added or changed
+            removed: Keys that were removed
+
+        Returns:
+            The new version
+        """
+        changes = [(key, False) for key in upserted] + [(key, True) for key in removed]
+        with self._lock:
+            self.version += 1
+            if len(changes) > self.max_entries:
+                # Too large to be worth a delta; everyone resyncs
+                self._entries.clear()
+                self._floor = self.version
+                return self.version
+            for key, deleted in changes:
+                self._entries.append((self.version, key, deleted))
+            while len(self._entries) > self.max_entries:
+                self._floor = self._entries.popleft()[0]
+            return self.version
+
+    def reset(self) -> int:
+        """
+        Drop the log, e.g. after the whole collection was replaced.
+
+        Returns:
+            The new version; any earlier version needs a resync
+        """
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._floor = self.version
+            return self.version
+
+    def changes_since(self, since: int, upto: Optional[int] = None) -> Optional[Changes]:
+        """
+        Collect the keys that changed after a version.
+
+        Args:
+            since: Version the client already has
+            upto: Newest version to include (defaults to the current one);
+                pass the version of the data being served so changes recorded
+                after it are left for the next call
+
+        Returns:
+            Keys whose latest change was an upsert and keys whose latest change
+            was a removal, or None if the client must resync
+        """
+        with self._lock:
+            upto = self.version if upto is None else upto
+            if since < self._floor or since > upto:
+                return None
+            latest = {}
+            for version, key, deleted in reversed(self._entries):
+                if version <= since:
+                    break
+                if version <= upto and key not in latest:
+                    latest[key] = deleted
+        return Changes(
+            [key for key, deleted in latest.items() if not deleted],
+            [key for key, deleted in latest.items() if deleted],
+        )
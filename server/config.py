@@ -5,3 +5,117 @@ TASK_PRIORITY_WEIGHT = 2
 # Weighting factor for floor distance calculations.
 # Increases the impact floor differences have on distance metrics.
 FLOOR_WEIGHT = 1.2
+
+# Distance used when a technician's or a ticket's server location is unknown.
+# Large enough that any located task is always preferred.
+UNKNOWN_LOCATION_DISTANCE = 1_000_000
+
+# Assignment solver backend: "auto", "incremental", "linear_sum_assignment",
+# "min_cost_flow" or "sparse_min_cost_flow". "auto" picks by problem shape
+# (task_assignment.select_solver).
+ASSIGNMENT_BACKEND = "auto"
+
+# Let "auto" use the warm-started incremental solver (incremental_assignment.py)
+# for problems where max(techs, tasks) / min(techs, tasks) is at least this.
+INCREMENTAL_ASSIGNMENT = True
+INCREMENTAL_MIN_ASPECT_RATIO = 2
+
+# Incremental repairs that free more than this many technicians/tasks, or
+# more than this fraction of them, fall back to a full re-solve.
+INCREMENTAL_MIN_REPAIR_ROWS = 16
+INCREMENTAL_MAX_REPAIR_FRACTION = 0.1
+
+# "sparse_min_cost_flow" gives each technician/task arcs to only its k nearest
+# counterparts; k doubles until every assignment can be routed.
+SPARSE_ASSIGNMENT_K = 16
+
+# Assignments are solved on a background thread; requests that need
+# assignments covering every change so far wait at most this long for it.
+ASSIGNMENT_WAIT_TIMEOUT_SECONDS = 10
+
+# Side of the square (x, y) grid cells used by the per-floor server spatial
+# index (spatial_index.py), in floor coordinate units.
+SPATIAL_INDEX_CELL_SIZE = 8.0
+
+# Jira search page size (Jira Cloud caps pages of full issues at 100).
+JIRA_SEARCH_PAGE_SIZE = 100
+
+# Full ticket fetches enumerate matching issue IDs (up to 5000 per page),
+# then bulk-fetch full issues (up to 100 per request) concurrently.
+JIRA_ID_PAGE_SIZE = 5000
+JIRA_BULK_FETCH_SIZE = 100
+
+# Jira HTTP transport (jira_transport.py): pooled keep-alive connections,
+# requests in flight at once, per-request timeout in seconds, and whether to
+# use HTTP/2 when the optional h2 package is installed.
+JIRA_MAX_CONNECTIONS = 20
+JIRA_MAX_CONCURRENCY = 8
+JIRA_TIMEOUT_SECONDS = 30
+JIRA_HTTP2 = True
+
+# Jira throttling (jira_rate_limit.py): the requests-in-flight limit starts at
+# JIRA_MAX_CONCURRENCY, halves (down to JIRA_MIN_CONCURRENCY) when Jira
+# throttles and creeps back up as requests succeed. Throttled or failed
+# requests are retried up to JIRA_MAX_RETRIES times with jittered exponential
+# backoff, while the retry budget (JIRA_RETRY_BUDGET_RATIO retries earned per
+# request, at most JIRA_RETRY_BUDGET_RESERVE saved up) lasts.
+JIRA_MIN_CONCURRENCY = 1
+JIRA_MAX_RETRIES = 3
+JIRA_RETRY_BASE_BACKOFF_SECONDS = 0.5
+JIRA_RETRY_MAX_BACKOFF_SECONDS = 30
+JIRA_RETRY_BUDGET_RATIO = 0.2
+JIRA_RETRY_BUDGET_RESERVE = 10
+
+# Ticket delta sync: fetch only issues updated since the newest cached
+# `updated` timestamp minus this overlap, and do a full refetch to drop
+# deleted/moved tickets at least this often.
+JIRA_SYNC_OVERLAP_MINUTES = 2
+JIRA_RECONCILE_INTERVAL_MINUTES = 60
+
+# Jira webhooks (POST /webhooks/jira): remember this many delivery IDs to drop
+# retried deliveries. While deliveries keep arriving, the ticket poll (every
+# JIRA_POLL_INTERVAL_MINUTES) only runs every JIRA_WEBHOOK_POLL_INTERVAL_MINUTES
+# as a reconciliation. Set JIRA_WEBHOOK_SECRET in the environment; without it
+# deliveries are refused unless JIRA_WEBHOOK_ALLOW_UNSIGNED=true. Updates for
+# the last JIRA_DELETED_KEYS_SIZE deleted tickets are ignored, so a late
+# delivery cannot bring one back.
+JIRA_WEBHOOK_DEDUP_SIZE = 10_000
+JIRA_DELETED_KEYS_SIZE = 10_000
+JIRA_POLL_INTERVAL_MINUTES = 15
+JIRA_WEBHOOK_POLL_INTERVAL_MINUTES = 60
+
+# Ticket refresh requests (scheduler, POST /items/refresh-now) wait this long
+# for others to join them, so a burst becomes a single refresh
+# (refresh_coordinator.py).
+JIRA_REFRESH_DEBOUNCE_SECONDS = 2
+
+# Attachment uploads (POST /items/{ticket_key}/attachments) are streamed to
+# Jira from the spooled upload; larger files are rejected with 413, and at
+# most JIRA_MAX_CONCURRENT_UPLOADS are sent to Jira at once. The size is
+# enforced while the request is read: bodies larger than the cap plus
+# ATTACHMENT_FORM_OVERHEAD_BYTES (multipart headers/boundaries) are cut off.
+ATTACHMENT_MAX_BYTES = 50 * 1024 * 1024
+ATTACHMENT_FORM_OVERHEAD_BYTES = 64 * 1024
+JIRA_MAX_CONCURRENT_UPLOADS = 4
+
+# Versioned list responses (response_cache.py): keep pre-serialized bodies for
+# this many endpoint/query combinations, gzip-compressing bodies of at least
+# RESPONSE_GZIP_MIN_BYTES.
+RESPONSE_CACHE_MAX_ENTRIES = 64
+RESPONSE_GZIP_MIN_BYTES = 1024
+
+# Delta sync for clients (GET /items, /servers, /technicians with ?since=):
+# key changes remembered per collection before older versions need a resync.
+CHANGE_LOG_MAX_ENTRIES = 10_000
+
+# Technician websocket sessions (connection_manager.py). Outbound messages are
+# queued per connection, a newer message replacing a queued one of the same
+# kind, so at most one message per kind is ever pending; a connection whose
+# send takes longer than WS_SEND_TIMEOUT_SECONDS is closed as a slow consumer.
+# Every WS_PING_INTERVAL_SECONDS the server sends a "ping". Connections that
+# have answered one with a "pong" are closed once nothing has been heard from
+# them in WS_PING_TIMEOUT_SECONDS; clients that never pong (they only send
+# "online") are left to uvicorn's protocol-level websocket pings.
+WS_SEND_TIMEOUT_SECONDS = 10
+WS_PING_INTERVAL_SECONDS = 15
+WS_PING_TIMEOUT_SECONDS = 45
@@ -0,0 +1,347 @@
+"""
+Websocket sessions of online technicians.
+
+Every /ws/technician connection gets a TechnicianSession: an outbound queue
+drained by its own sender task, and a heartbeat that pings the client. Only
+clients that have answered a ping with a "pong" are closed by the heartbeat
+once they go quiet; older clients never send anything after "online", so
+dead connections of theirs are left to the protocol-level pings of the
+server (uvicorn's --ws-ping-interval / --ws-ping-timeout). Queued messages are keyed by
+kind and a newer message replaces a queued one of the same kind, so the queue
+never holds more than one message per kind and a slow client only ever gets
+the latest assignment rather than a backlog. A client whose send still times
+out is disconnected instead of stalling anyone else.
+
+The ConnectionManager maps technicians to sessions and remembers the
+assignment last queued for each. Whenever the task assigner publishes a new
+result it queues only the assignments that changed.
+"""
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import logging
+import time
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+import config
+from models import JiraTicket, TechnicianResponse
+from task_assignment import AssignmentResult
+
+logger = logging.getLogger(__name__)
+
+# Queue kinds; each holds at most one pending message
+ASSIGNMENT = "assignment"
+PING = "ping"
+
+# Marks a session that has not been sent any assignment yet
+_UNSENT = object()
+
+PING_MESSAGE = TechnicianResponse(event_type="ping").model_dump_json()
+
+
+class TechnicianSession:
+    def __init__(self, websocket: WebSocket, manager: "ConnectionManager"):
+        """
+        Wrap an accepted websocket. Call serve() to run it.
+
+        Args:
+            websocket: The accepted connection
+            manager: Owning manager (for metrics)
+        """
+        self.websocket = websocket
+        self.manager = manager
+        self.technician_id: Optional[str] = None
+        # Assignment last queued for this client, and the generation of the
+        # result it came from; older results are never queued after it
+        self.assignment = _UNSENT
+        self.generation = -1
+        self.last_seen = time.monotonic()
+        # Set by the first "pong"; only then is silence taken as a dead client
+        self.answers_pings = False
+        self._outbox: "OrderedDict[str, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._closed = asyncio.Event()
+        self.close_reason: Optional[str] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._outbox)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def enqueue(self, kind: str, message: str) -> bool:
+        """
+        Queue a message for the client, replacing a pending one of this kind.
+
+        Returns:
+            False if the session is closed
+        """
+        counters = self.manager.counters
+        if self.closed:
+            counters["messages_dropped"] += 1
+            return False
+        if kind in self._outbox:
+            # Latest wins; the message keeps its place in the queue
+            counters["messages_coalesced"] += 1
+        self._outbox[kind] = message
+        counters["messages_queued"] += 1
+        self._ready.set()
+        return True
+
+    def close(self, reason: str) -> None:
+        """Stop the session; serve() returns and closes the websocket."""
+        if not self.closed:
+            self.close_reason = reason
+            counters = self.manager.counters
+            counters["messages_dropped"] += len(self._outbox)
+            self._outbox.clear()
+            self._closed.set()
+
+    async def serve(self, on_message: Callable[["TechnicianSession", str], Awaitable[None]]) -> None:
+        """
+        Run the session until the client disconnects or it is closed.
+
+        Args:
+            on_message: Handles each text message from the client; messages
+                are handled one at a time, in order
+        """
+        tasks = [
+            asyncio.create_task(self._receive(on_message)),
+            asyncio.create_task(self._send()),
+            asyncio.create_task(self._heartbeat()),
+            asyncio.create_task(self._closed.wait()),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.close("session ended")
+            if self.close_reason != "disconnected":
+                try:
+                    # A peer that stopped reading may never answer the close
+                    await asyncio.wait_for(
+                        self.websocket.close(), config.WS_SEND_TIMEOUT_SECONDS
+                    )
+                except Exception:
+                    pass
+            logger.info(
+                f"Technician session {self.technician_id} closed: {self.close_reason}"
+            )
+
+    async def _receive(self, on_message) -> None:
+        try:
+            while True:
+                message = await self.websocket.receive_text()
+                self.last_seen = time.monotonic()
+                await on_message(self, message)
+        except WebSocketDisconnect:
+            self.close("disconnected")
+        except Exception as e:
+            self.close(f"receive failed: {e}")
+
+    async def _send(self) -> None:
+        counters = self.manager.counters
+        while True:
+            await self._ready.wait()
+            while self._outbox:
+                _, message = self._outbox.popitem(last=False)
+                try:
+                    await asyncio.wait_for(
+                        self.websocket.send_text(message), config.WS_SEND_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    counters["slow_consumer_closes"] += 1
+                    self.close("send timed out")
+                    return
+                except Exception as e:
+                    counters["send_errors"] += 1
+                    self.close(f"send failed: {e}")
+                    return
+                counters["messages_sent"] += 1
+            self._ready.clear()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(config.WS_PING_INTERVAL_SECONDS)
+            if (
+                self.answers_pings
+                and time.monotonic() - self.last_seen > config.WS_PING_TIMEOUT_SECONDS
+            ):
+                self.manager.counters["heartbeat_timeouts"] += 1
+                self.close("heartbeat timed out")
+                return
+            self.enqueue(PING, PING_MESSAGE)
+
+
+class ConnectionManager:
+    def __init__(self):
+        """Track technician sessions and push assignment changes to them."""
+        self._sessions: Set[TechnicianSession] = set()
+        self._by_technician: Dict[str, TechnicianSession] = {}
+        self.counters: Counter = Counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Newest result not yet broadcast; older ones are skipped
+        self._pending: Optional[AssignmentResult] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._broadcaster: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start broadcasting on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._broadcaster = self._loop.create_task(self._broadcast_forever())
+
+    async def stop(self) -> None:
+        """Stop broadcasting and close every session."""
+        if self._broadcaster is not None:
+            self._broadcaster.cancel()
+            try:
+                await self._broadcaster
+            except asyncio.CancelledError:
+                pass
+            self._broadcaster = None
+        self._loop = None
+        for session in list(self._sessions):
+            session.close("server shutting down")
+
+    def open(self, websocket: WebSocket) -> TechnicianSession:
+        """Start a session for an accepted websocket."""
+        session = TechnicianSession(websocket, self)
+        self._sessions.add(session)
+        self.counters["sessions_opened"] += 1
+        return session
+
+    def remove(self, session: TechnicianSession) -> None:
+        """Forget a session that has finished serving."""
+        self._sessions.discard(session)
+        if (
+            session.technician_id is not None
+            and self._by_technician.get(session.technician_id) is session
+        ):
+            del self._by_technician[session.technician_id]
+
+    def bind(self, session: TechnicianSession, technician_id: str) -> None:
+        """
+        Attach a technician to a session. A previous session of the same
+        technician (e.g. from before a Wi-Fi drop) is closed.
+        """
+        if session.technician_id == technician_id:
+            return
+        if (
+            session.technician_id is not None
+            and self._by_technician.get(session.technician_id) is session
+        ):
+            del self._by_technician[session.technician_id]
+        previous = self._by_technician.get(technician_id)
+        if previous is not None and previous is not session:
+            previous.close("replaced by a new connection")
+        session.technician_id = technician_id
+        session.assignment = _UNSENT
+        session.generation = -1
+        self._by_technician[technician_id] = session
+
+    def send_assignment(self, technician_id: str, result: AssignmentResult) -> bool:
+        """
+        Queue a technician's assignment from a result unless it already has
+        it, or has been sent one from a newer result.
+
+        Args:
+            technician_id: ID of a connected technician
+            result: Published assignment result
+
+        Returns:
+            True if a message was queued
+        """
+        session = self._by_technician.get(technician_id)
+        if session is None or result.generation < session.generation:
+            return False
+        session.generation = result.generation
+        ticket = result.assignments.get(technician_id)
+        if session.assignment == ticket:
+            return False
+        if session.assignment is _UNSENT and ticket is None:
+            # Nothing was sent yet, so there is nothing to withdraw
+            return False
+        session.assignment = ticket
+        if ticket is None:
+            response = TechnicianResponse(event_type="unassigned")
+        else:
+            response = TechnicianResponse(event_type="assignment", payload=ticket)
+        return session.enqueue(ASSIGNMENT, response.model_dump_json())
+
+    def publish(self, result: AssignmentResult) -> None:
+        """
+        Queue a newly published result for broadcast.
+
+        Safe to call from any thread (the task assigner calls it from its
+        solver thread); only hands the result to the event loop.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._set_pending, result)
+        except RuntimeError:
+            # The loop is shutting down
+            pass
+
+    def _set_pending(self, result: AssignmentResult) -> None:
+        if self._pending is None or result.generation > self._pending.generation:
+            self._pending = result
+        self._wakeup.set()
+
+    async def _broadcast_forever(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            result, self._pending = self._pending, None
+            if result is not None:
+                self.broadcast(result)
+
+    def broadcast(self, result: AssignmentResult) -> int:
+        """
+        Queue new assignments for every connected technician whose changed.
+
+        Returns:
+            Number of messages queued
+        """
+        queued = sum(
+            self.send_assignment(technician_id, result)
+            for technician_id in list(self._by_technician)
+        )
+        if queued:
+            logger.info(
+                f"Queued {queued} assignment change(s) for generation {result.generation}"
+            )
+        return queued
+
+    def metrics(self) -> dict:
+        """Session counts, current queue depths and message counters."""
+        depths = [session.queue_depth for session in self._sessions]
+        return {
+            "sessions": len(self._sessions),
+            "technicians": len(self._by_technician),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            **{
+                name: self.counters[name]
+                for name in (
+                    "sessions_opened",
+                    "messages_queued",
+                    "messages_sent",
+                    "messages_coalesced",
+                    "messages_dropped",
+                    "slow_consumer_closes",
+                    "heartbeat_timeouts",
+                    "send_errors",
+                )
+            },
+        }
+
+
+connection_manager = ConnectionManager()
@@ -0,0 +1,352 @@
+"""
+Vectorized distance computation between technicians and server racks.
+
+Distances use the same metric the task assigner has always used: planar
+Euclidean distance on (x, y) plus the absolute floor difference on z scaled by
+config.FLOOR_WEIGHT, truncated to an integer.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+import logging
+
+import numpy as np
+
+import config
+from models import Location
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the number of matrix cells computed per broadcast block.
+# Keeps the float temporaries of a 1000x50k floor well under 100 MB.
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def location_to_tuple(location: Optional[Location]) -> tuple:
+    """Return (x, y, z) for a location, or NaNs when it is unknown."""
+    if location is None:
+        return (np.nan, np.nan, np.nan)
+    return (location.x, location.y, location.z)
+
+
+def locations_to_array(
+    locations: Union[Iterable[Optional[Location]], np.ndarray]
+) -> np.ndarray:
+    """
+    Convert locations into an (N, 3) float array of x, y, z coordinates.
+
+    Args:
+        locations: Iterable of Location objects. None marks an unknown location
+            and becomes a row of NaNs. An (N, 3) array is used as is.
+
+    Returns:
+        Array with one row per location
+    """
+    if isinstance(locations, np.ndarray):
+        return np.array(locations, dtype=np.float64).reshape(-1, 3)
+    coords = np.array(
+        [location_to_tuple(loc) for loc in locations], dtype=np.float64
+    )
+    return coords.reshape(-1, 3)
+
+
+def compute_distance_matrix(
+    technician_coords: np.ndarray,
+    target_coords: np.ndarray,
+    floor_weight: float = config.FLOOR_WEIGHT,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Compute the technician-to-target distance matrix with NumPy broadcasting.
+
+    Pairs where either side has an unknown (NaN) location get
+    config.UNKNOWN_LOCATION_DISTANCE.
+
+    Args:
+        technician_coords: (T, 3) array of technician coordinates
+        target_coords: (S, 3) array of server/rack coordinates
+        floor_weight: Multiplier applied to the vertical (z) difference
+        out: Optional (T, S) int32 array to write the result into
+
+    Returns:
+        (T, S) int32 array of distances
+    """
+    num_techs = technician_coords.shape[0]
+    num_targets = target_coords.shape[0]
+    distances = out if out is not None else np.empty(
+        (num_techs, num_targets), dtype=np.int32
+    )
+    if num_techs == 0 or num_targets == 0:
+        return distances
+    has_unknown = bool(
+        np.isnan(technician_coords).any() or np.isnan(target_coords).any()
+    )
+
+    target_x = target_coords[:, 0]
+    target_y = target_coords[:, 1]
+    target_z = target_coords[:, 2]
+
+    block_rows = max(1, min(num_techs, MAX_BLOCK_CELLS // num_targets))
+    planar = np.empty((block_rows, num_targets), dtype=np.float64)
+    delta = np.empty_like(planar)
+    for start in range(0, num_techs, block_rows):
+        block = technician_coords[start : start + block_rows]
+        rows = block.shape[0]
+        acc, tmp = planar[:rows], delta[:rows]
+        # Same operation order as the scalar formula so truncation matches.
+        np.subtract(block[:, 0, None], target_x, out=acc)
+        np.multiply(acc, acc, out=acc)
+        np.subtract(block[:, 1, None], target_y, out=tmp)
+        np.multiply(tmp, tmp, out=tmp)
+        np.add(acc, tmp, out=acc)
+        np.sqrt(acc, out=acc)
+        np.subtract(block[:, 2, None], target_z, out=tmp)
+        np.abs(tmp, out=tmp)
+        np.multiply(tmp, floor_weight, out=tmp)
+        np.add(acc, tmp, out=acc)
+        if has_unknown:
+            acc[np.isnan(acc)] = config.UNKNOWN_LOCATION_DISTANCE
+        distances[start : start + rows] = acc
+
+    return distances
+
+
+class DistanceSnapshot(NamedTuple):
+    """Immutable view of the engine at one point in time."""
+    technician_ids: Tuple[str, ...]
+    target_ids: Tuple[str, ...]
+    # Read-only (T, S) int32 matrix
+    distances: np.ndarray
+
+
+class DistanceEngine:
+    """
+    Holds technician and target coordinates as NumPy arrays together with the
+    technician-by-target distance matrix between them.
+
+    The full matrix is computed in one vectorized pass when rows or columns are
+    replaced wholesale. Single technicians and targets can then be added, moved
+    or removed in O(targets) / O(technicians): storage grows by doubling and
+    removals swap the last row/column into the freed slot, so row and column
+    order is not stable across removals.
+    """
+
+    def __init__(self, floor_weight: float = config.FLOOR_WEIGHT):
+        self.floor_weight = floor_weight
+        self.technician_ids: List[str] = []
+        self.target_ids: List[str] = []
+        self._technician_index: Dict[str, int] = {}
+        self._target_index: Dict[str, int] = {}
+        self._technician_coords = np.empty((0, 3), dtype=np.float64)
+        self._target_coords = np.empty((0, 3), dtype=np.float64)
+        self._matrix = np.empty((0, 0), dtype=np.int32)
+        # True while a snapshot still references self._matrix; the next
+        # in-place write copies it first (copy-on-write)
+        self._shared = False
+
+    @property
+    def technician_coords(self) -> np.ndarray:
+        return self._technician_coords[: len(self.technician_ids)]
+
+    @property
+    def target_coords(self) -> np.ndarray:
+        return self._target_coords[: len(self.target_ids)]
+
+    @property
+    def distances(self) -> np.ndarray:
+        """View of the current (T, S) distance matrix."""
+        return self._matrix[: len(self.technician_ids), : len(self.target_ids)]
+
+    def snapshot(self) -> "DistanceSnapshot":
+        """
+        Freeze the current IDs and distances without copying the matrix.
+
+        The returned matrix is a read-only view; the engine copies its
+        backing array before the next in-place update, so the snapshot never
+        changes underneath its holder.
+        """
+        distances = self.distances.view()
+        distances.flags.writeable = False
+        self._shared = True
+        return DistanceSnapshot(
+            tuple(self.technician_ids), tuple(self.target_ids), distances
+        )
+
+    def _own_matrix(self) -> None:
+        if self._shared:
+            self._matrix = self._matrix.copy()
+            self._shared = False
+
+    def has_technician(self, technician_id: str) -> bool:
+        return technician_id in self._technician_index
+
+    def has_target(self, target_id: str) -> bool:
+        return target_id in self._target_index
+
+    def set_technicians(
+        self, technician_ids: List[str], locations: List[Optional[Location]]
+    ) -> None:
+        """
+        Replace the technician rows of the matrix and recompute it.
+
+        Args:
+            technician_ids: Technician IDs in row order
+            locations: Technician locations, aligned with technician_ids
+        """
+        if len(technician_ids) != len(locations):
+            raise ValueError("technician_ids and locations must have the same length")
+        self.technician_ids = list(technician_ids)
+        self._technician_index = {t: i for i, t in enumerate(self.technician_ids)}
+        self._technician_coords = locations_to_array(locations)
+        self.compute()
+
+    def set_targets(
+        self,
+        target_ids: List[str],
+        locations: Union[List[Optional[Location]], np.ndarray],
+    ) -> None:
+        """
+        Replace the target (server/rack) columns of the matrix and recompute it.
+
+        Args:
+            target_ids: Target IDs in column order
+            locations: Target locations, or an (S, 3) coordinate array,
+                aligned with target_ids
+        """
+        if len(target_ids) != len(locations):
+            raise ValueError("target_ids and locations must have the same length")
+        self.target_ids = list(target_ids)
+        self._target_index = {t: i for i, t in enumerate(self.target_ids)}
+        self._target_coords = locations_to_array(locations)
+        self.compute()
+
+    def compute(self) -> np.ndarray:
+        """
+        Recompute the full technician-by-target distance matrix.
+
+        Returns:
+            (T, S) int32 view of the distances
+        """
+        num_techs, num_targets = len(self.technician_ids), len(self.target_ids)
+        self._matrix = np.empty((num_techs, num_targets), dtype=np.int32)
+        self._shared = False
+        compute_distance_matrix(
+            self.technician_coords,
+            self.target_coords,
+            self.floor_weight,
+            out=self._matrix,
+        )
+        logger.debug(f"Computed {num_techs}x{num_targets} distance matrix")
+        return self.distances
+
+    def upsert_technician(
+        self, technician_id: str, location: Optional[Location]
+    ) -> None:
+        """
+        Add a technician row or move an existing one, recomputing only that row.
+
+        Args:
+            technician_id: ID of the technician
+            location: Current location of the technician
+        """
+        row = self._technician_index.get(technician_id)
+        if row is None:
+            row = len(self.technician_ids)
+            self._reserve(row + 1, len(self.target_ids))
+            self.technician_ids.append(technician_id)
+            self._technician_index[technician_id] = row
+        self._own_matrix()
+        self._technician_coords[row] = location_to_tuple(location)
+        compute_distance_matrix(
+            self._technician_coords[row : row + 1],
+            self.target_coords,
+            self.floor_weight,
+            out=self._matrix[row : row + 1, : len(self.target_ids)],
+        )
+
+    def remove_technician(self, technician_id: str) -> bool:
+        """
+        Remove a technician row.
+
+        Returns:
+            True if the technician was removed, False if not found
+        """
+        row = self._technician_index.pop(technician_id, None)
+        if row is None:
+            return False
+        last = len(self.technician_ids) - 1
+        if row != last:
+            moved_id = self.technician_ids[last]
+            self.technician_ids[row] = moved_id
+            self._technician_index[moved_id] = row
+            self._technician_coords[row] = self._technician_coords[last]
+            self._own_matrix()
+            self._matrix[row] = self._matrix[last]
+        self.technician_ids.pop()
+        return True
+
+    def upsert_target(self, target_id: str, location: Optional[Location]) -> None:
+        """
+        Add a target column or move an existing one, recomputing only that column.
+
+        Args:
+            target_id: ID of the target
+            location: Location of the target, or None if unknown
+        """
+        col = self._target_index.get(target_id)
+        if col is None:
+            col = len(self.target_ids)
+            self._reserve(len(self.technician_ids), col + 1)
+            self.target_ids.append(target_id)
+            self._target_index[target_id] = col
+        self._own_matrix()
+        self._target_coords[col] = location_to_tuple(location)
+        compute_distance_matrix(
+            self.technician_coords,
+            self._target_coords[col : col + 1],
+            self.floor_weight,
+            out=self._matrix[: len(self.technician_ids), col : col + 1],
+        )
+
+    def remove_target(self, target_id: str) -> bool:
+        """
+        Remove a target column.
+
+        Returns:
+            True if the target was removed, False if not found
+        """
+        col = self._target_index.pop(target_id, None)
+        if col is None:
+            return False
+        last = len(self.target_ids) - 1
+        if col != last:
+            moved_id = self.target_ids[last]
+            self.target_ids[col] = moved_id
+            self._target_index[moved_id] = col
+            self._target_coords[col] = self._target_coords[last]
+            self._own_matrix()
+            self._matrix[:, col] = self._matrix[:, last]
+        self.target_ids.pop()
+        return True
+
+    def _reserve(self, num_techs: int, num_targets: int) -> None:
+        """Grow the backing arrays (by doubling) to hold the given shape."""
+        row_cap, col_cap = self._matrix.shape
+        if num_techs <= row_cap and num_targets <= col_cap:
+            return
+        new_rows = max(num_techs, 2 * row_cap) if num_techs > row_cap else row_cap
+        new_cols = (
+            max(num_targets, 2 * col_cap) if num_targets > col_cap else col_cap
+        )
+
+        matrix = np.empty((new_rows, new_cols), dtype=np.int32)
+        matrix[:row_cap, :col_cap] = self._matrix
+        self._matrix = matrix
+        self._shared = False
+
+        if new_rows > self._technician_coords.shape[0]:
+            coords = np.empty((new_rows, 3), dtype=np.float64)
+            coords[: self._technician_coords.shape[0]] = self._technician_coords
+            self._technician_coords = coords
+        if new_cols > self._target_coords.shape[0]:
+            coords = np.empty((new_cols, 3), dtype=np.float64)
+            coords[: self._target_coords.shape[0]] = self._target_coords
+            self._target_coords = coords
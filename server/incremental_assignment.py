@@ -0,0 +1,296 @@
+"""
+Warm-started incremental solver for the technician-to-task assignment.
+
+The assignment network built by task_assignment.Graph (source -> technicians
+-> tasks -> sink, unit capacities) is a rectangular linear assignment problem,
+so it is solved here with successive shortest augmenting paths using dual
+potentials (Jonker-Volgenant / Crouse). The solver keeps the optimal assignment
+and its potentials between calls. When a few technicians move or a few tickets
+appear or close, only the affected rows are freed, the potentials are repaired
+and the freed rows are re-augmented. Large deltas fall back to a full solve.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+import logging
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-9
+
+
+class _CostView:
+    """
+    Row and column access to the assignment cost matrix.
+
+    Costs are ``trunc(distance - task_cost)`` exactly as Graph computes them.
+    When there are more technicians than tasks the matrix is transposed so the
+    solver always works with rows <= columns.
+    """
+
+    def __init__(self, distances: np.ndarray, task_costs: np.ndarray, transposed: bool):
+        self.transposed = transposed
+        self.matrix = distances.T if transposed else distances
+        self.task_costs = task_costs
+
+    def row(self, i: int) -> np.ndarray:
+        if self.transposed:
+            return np.trunc(self.matrix[i] - self.task_costs[i])
+        return np.trunc(self.matrix[i] - self.task_costs)
+
+    def column(self, j: int) -> np.ndarray:
+        if self.transposed:
+            return np.trunc(self.matrix[:, j] - self.task_costs)
+        return np.trunc(self.matrix[:, j] - self.task_costs[j])
+
+
+class IncrementalAssignmentSolver:
+    """
+    Min-cost technician-to-task assignment that repairs its previous optimum.
+
+    Invariants kept between solves (rows are the smaller side):
+      - reduced costs ``c[i, j] - u[i] - v[j]`` are >= 0 for every matched row,
+      - matched pairs have zero reduced cost,
+      - unmatched columns have ``v[j] == 0``.
+    Together these certify optimality, and they let a single augmenting path
+    per freed row restore an optimal assignment after a small change.
+
+    Implements the task_assignment.AssignmentSolver interface.
+    """
+
+    name = "incremental"
+
+    def __init__(
+        self,
+        min_repair_rows: int = config.INCREMENTAL_MIN_REPAIR_ROWS,
+        max_repair_fraction: float = config.INCREMENTAL_MAX_REPAIR_FRACTION,
+    ):
+        self.min_repair_rows = min_repair_rows
+        self.max_repair_fraction = max_repair_fraction
+        self.full_solves = 0
+        self.incremental_solves = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the previous solution so the next solve starts from scratch."""
+        self._transposed: bool | None = None
+        self._row_ids: list[str] = []
+        self._col_ids: list[str] = []
+        self._u = np.empty(0)
+        self._v = np.empty(0)
+        self._col4row = np.empty(0, dtype=np.intp)
+
+    def solve(
+        self,
+        technician_ids: list[str],
+        task_ids: list[str],
+        distances: np.ndarray,
+        task_costs: np.ndarray,
+        dirty_technicians: Iterable[str] = (),
+        dirty_tasks: Iterable[str] = (),
+        full: bool = False,
+    ) -> dict[str, str]:
+        """
+        Solve the assignment, warm-starting from the previous solution.
+
+        Args:
+            technician_ids: Technician IDs in distance-matrix row order
+            task_ids: Task IDs in distance-matrix column order
+            distances: (T, S) technician-to-task distances
+            task_costs: (S,) per-task cost subtracted from distances
+                (priority_weight * priority)
+            dirty_technicians: Technicians whose row changed since the last solve
+            dirty_tasks: Tasks whose column changed since the last solve
+            full: Force a solve from scratch
+
+        Returns:
+            Mapping of technician ID to assigned task ID
+        """
+        if not technician_ids or not task_ids:
+            self.reset()
+            return {}
+
+        transposed = len(technician_ids) > len(task_ids)
+        row_ids, col_ids = (
+            (task_ids, technician_ids) if transposed else (technician_ids, task_ids)
+        )
+        dirty_rows, dirty_cols = (
+            (set(dirty_tasks), set(dirty_technicians))
+            if transposed
+            else (set(dirty_technicians), set(dirty_tasks))
+        )
+        costs = _CostView(distances, np.asarray(task_costs, dtype=np.float64), transposed)
+
+        state = None
+        if not full and transposed == self._transposed:
+            state = self._repair(costs, row_ids, col_ids, dirty_rows, dirty_cols)
+
+        if state is None:
+            state = self._solve_full(costs, len(row_ids), len(col_ids))
+            self.full_solves += 1
+        else:
+            self.incremental_solves += 1
+
+        u, v, col4row = state
+        self._transposed = transposed
+        self._row_ids = list(row_ids)
+        self._col_ids = list(col_ids)
+        self._u, self._v, self._col4row = u, v, col4row
+
+        if transposed:
+            return {col_ids[j]: row_ids[i] for i, j in enumerate(col4row)}
+        return {row_ids[i]: col_ids[j] for i, j in enumerate(col4row)}
+
+    def _solve_full(self, costs: _CostView, num_rows: int, num_cols: int):
+        u = np.zeros(num_rows)
+        v = np.zeros(num_cols)
+        col4row = np.full(num_rows, -1, dtype=np.intp)
+        row4col = np.full(num_cols, -1, dtype=np.intp)
+        for i in range(num_rows):
+            _augment(costs, i, u, v, col4row, row4col)
+        return u, v, col4row
+
+    def _repair(
+        self,
+        costs: _CostView,
+        row_ids: list[str],
+        col_ids: list[str],
+        dirty_rows: set[str],
+        dirty_cols: set[str],
+    ):
+        """
+        Carry the previous solution over to the new rows/columns, free what the
+        delta invalidated, restore the invariants and re-augment.
+
+        Returns:
+            (u, v, col4row), or None if the delta is too large to repair
+        """
+        num_rows, num_cols = len(row_ids), len(col_ids)
+        limit = max(self.min_repair_rows, int(self.max_repair_fraction * num_rows))
+
+        old_rows = {rid: i for i, rid in enumerate(self._row_ids)}
+        old_cols = {cid: j for j, cid in enumerate(self._col_ids)}
+        col_pos = {cid: j for j, cid in enumerate(col_ids)}
+
+        u = np.zeros(num_rows)
+        v = np.zeros(num_cols)
+        col4row = np.full(num_rows, -1, dtype=np.intp)
+        row4col = np.full(num_cols, -1, dtype=np.intp)
+        # Columns whose v must be reset to 0 and checked for violations.
+        reset_cols = []
+
+        for j, cid in enumerate(col_ids):
+            old_j = old_cols.get(cid)
+            if old_j is None or cid in dirty_cols:
+                reset_cols.append(j)
+            else:
+                v[j] = self._v[old_j]
+
+        free_rows = []
+        for i, rid in enumerate(row_ids):
+            old_i = old_rows.get(rid)
+            if old_i is None or rid in dirty_rows:
+                free_rows.append(i)
+                continue
+            u[i] = self._u[old_i]
+            cid = self._col_ids[self._col4row[old_i]]
+            j = col_pos.get(cid)
+            if j is None or cid in dirty_cols:
+                free_rows.append(i)
+                continue
+            col4row[i] = j
+            row4col[j] = i
+
+        if len(free_rows) > limit:
+            return None
+
+        # Columns left free by removed or freed rows must get v == 0 back.
+        reset_cols.extend(np.flatnonzero((row4col < 0) & (v != 0)).tolist())
+
+        while reset_cols:
+            j = reset_cols.pop()
+            v[j] = 0.0
+            # Matched rows that now prefer column j lose their tightness.
+            violating = np.flatnonzero(costs.column(j) - u < -EPSILON)
+            for k in violating:
+                m = col4row[k]
+                if m < 0:
+                    continue
+                col4row[k] = -1
+                row4col[m] = -1
+                free_rows.append(k)
+                reset_cols.append(m)
+            if len(free_rows) > limit:
+                return None
+
+        for i in free_rows:
+            _augment(costs, i, u, v, col4row, row4col)
+        return u, v, col4row
+
+
+def _augment(
+    costs: _CostView,
+    cur_row: int,
+    u: np.ndarray,
+    v: np.ndarray,
+    col4row: np.ndarray,
+    row4col: np.ndarray,
+) -> None:
+    """
+    Find the shortest augmenting path from a free row (Dijkstra over reduced
+    costs), update the potentials and flip the path. Arrays are updated in place.
+    """
+    num_cols = v.shape[0]
+    shortest = np.full(num_cols, np.inf)
+    path = np.full(num_cols, -1, dtype=np.intp)
+    remaining = np.ones(num_cols, dtype=bool)
+    better = np.empty(num_cols, dtype=bool)
+    free_cols = row4col < 0
+    visited_rows = []
+    visited_cols = []
+
+    min_val = 0.0
+    i = cur_row
+    while True:
+        reduced = costs.row(i)
+        reduced -= u[i] - min_val
+        reduced -= v
+        np.less(reduced, shortest, out=better)
+        better &= remaining
+        path[better] = i
+        np.copyto(shortest, reduced, where=better)
+
+        candidates = np.where(remaining, shortest, np.inf)
+        lowest = candidates.min()
+        if not np.isfinite(lowest):
+            raise ValueError("The solver did not find a feasible assignment.")
+        ties = np.flatnonzero(candidates == lowest)
+        free_ties = ties[free_cols[ties]]
+        j = free_ties[0] if free_ties.size else ties[0]
+
+        min_val = lowest
+        remaining[j] = False
+        visited_cols.append(j)
+        if row4col[j] < 0:
+            sink = j
+            break
+        i = row4col[j]
+        visited_rows.append(i)
+
+    u[cur_row] += min_val
+    for r in visited_rows:
+        u[r] += min_val - shortest[col4row[r]]
+    cols = np.array(visited_cols, dtype=np.intp)
+    v[cols] -= min_val - shortest[cols]
+
+    j = sink
+    while True:
+        i = path[j]
+        row4col[j] = i
+        col4row[i], j = j, col4row[i]
+        if i == cur_row:
+            break
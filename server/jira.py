@@ -1,11 +1,20 @@
+import asyncio
+import bisect
 import os
 import logging
+import math
 import re
-from typing import Optional, List, Dict, Any
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, NamedTuple, Callable, Awaitable
 from dotenv import load_dotenv
-from atlassian import Jira
-import requests
-import base64
+
+import config
+from change_log import ChangeLog
+from jira_transport import JiraTransport, multipart_file_body
+from jira_rate_limit import INTERACTIVE
+from server_ids import PrefixIndex, prefix_from_levels
 
 load_dotenv()
 
@@ -13,6 +22,130 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Jira Cloud REST API v2 returns descriptions and comments as plain text
+# (v3 uses Atlassian Document Format)
+API = 'rest/api/2'
+
+
+class TicketIndex:
+    """
+    Immutable lookup structures over one list of parsed tickets.
+
+    Built once per refresh and swapped in with a single assignment; the
+    version names the snapshot (see JiraClient.changes).
+    """
+
+    def __init__(self, tickets: List[Dict[str, Any]], version: int = 0):
+        self.version = version
+        self.tickets = tickets
+        self.positions: Dict[str, int] = {}
+        self.by_key: Dict[str, Dict[str, Any]] = {}
+        self.by_server: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_status: Dict[str, List[Dict[str, Any]]] = {}
+        # Ticket keys by the Hall-Pod-Aisle-Rack-U# path of their server
+        self.by_location = PrefixIndex()
+        for position, ticket in enumerate(tickets):
+            key = ticket['key']
+            self.positions[key] = position
+            self.by_key[key] = ticket
+            if ticket.get('server_id'):
+                self.by_server.setdefault(ticket['server_id'], []).append(ticket)
+                self.by_location.add(ticket['server_id'], key)
+            if ticket.get('status'):
+                self.by_status.setdefault(ticket['status'].lower(), []).append(ticket)
+
+    def resolve(self, keys) -> List[Dict[str, Any]]:
+        """Resolve ticket keys to tickets, keeping the order of self.tickets."""
+        return [self.tickets[i] for i in sorted(self.positions[key] for key in keys)]
+
+    def with_ticket(self, ticket: Dict[str, Any], version: int = 0) -> Optional['TicketIndex']:
+        """
+        Build a copy of this index with one existing ticket replaced.
+
+        Only the lookups the ticket belongs to are rebuilt; everything else
+        is shared with this index, so a patch costs far less than a rebuild.
+
+        Args:
+            ticket: Parsed ticket whose key is already indexed
+            version: Version of the patched index
+
+        Returns:
+            The patched index, or None if the ticket is new or moved to a
+            different server (callers should rebuild instead)
+        """
+        key = ticket['key']
+        position = self.positions.get(key)
+        if position is None:
+            return None
+        old = self.tickets[position]
+        if old.get('server_id') != ticket.get('server_id'):
+            return None
+
+        def replaced(group):
+            return [ticket if t['key'] == key else t for t in group]
+
+        def order(t):
+            return self.positions[t['key']]
+
+        index = TicketIndex.__new__(TicketIndex)
+        index.version = version
+        index.tickets = list(self.tickets)
+        index.tickets[position] = ticket
+        index.positions = self.positions
+        index.by_key = dict(self.by_key)
+        index.by_key[key] = ticket
+        index.by_location = self.by_location
+        index.by_server = dict(self.by_server)
+        if ticket.get('server_id'):
+            index.by_server[ticket['server_id']] = replaced(
+                self.by_server[ticket['server_id']])
+
+        index.by_status = dict(self.by_status)
+        old_status = (old.get('status') or '').lower()
+        new_status = (ticket.get('status') or '').lower()
+        if old_status == new_status:
+            if new_status:
+                index.by_status[new_status] = replaced(self.by_status[new_status])
+        else:
+            if old_status:
+                remaining = [t for t in self.by_status[old_status] if t['key'] != key]
+                if remaining:
+                    index.by_status[old_status] = remaining
+                else:
+                    del index.by_status[old_status]
+            if new_status:
+                group = list(self.by_status.get(new_status, ()))
+                bisect.insort(group, ticket, key=order)
+                index.by_status[new_status] = group
+        return index
+
+
+class TicketSync(NamedTuple):
+    """Result of JiraClient.sync_tickets."""
+    # True when the whole cache was replaced rather than patched
+    full: bool
+    # Tickets that were added or changed (every ticket after a full sync)
+    updated: List[Dict[str, Any]]
+    # Keys of tickets dropped from the cache
+    removed: List[str]
+
+
+class TicketChanges(NamedTuple):
+    """Tickets changed since a client's version of the cache."""
+    version: int
+    tickets: List[Dict[str, Any]]
+    removed: List[str]
+
+
+def parse_jira_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Jira timestamp such as '2024-05-01T10:15:30.000-0500'."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return None
+
 
 class JiraClient:
     def __init__(self):
@@ -27,70 +160,197 @@ class JiraClient:
                 "Missing required environment variables. Please set JIRA_URL, JIRA_USERNAME, and JIRA_API_TOKEN"
             )
 
-        # Initialize Jira client
+        # Initialize the pooled HTTP transport every Jira call goes through
         try:
-            self.jira = Jira(
-                url=self.jira_url,
-                username=self.username,
-                password=self.api_token,
-                cloud=True
-            )
+            self.transport = JiraTransport(
+                self.jira_url, self.username, self.api_token)
             logger.info(f"Successfully connected to Jira at {self.jira_url}")
         except Exception as e:
             logger.error(f"Failed to connect to Jira: {e}")
             raise
 
-        # Store tickets in memory
+        # Store tickets in memory, logging which keys change at each version
+        # so clients can fetch just the changes since their last poll
+        self.changes = ChangeLog()
         self.tickets: List[Dict[str, Any]] = []
+        self._index = TicketIndex([], self.changes.version)
+
+        # Uploads get their own cap so a burst of photos cannot take every
+        # transport slot from ticket reads
+        self._upload_semaphore = asyncio.Semaphore(config.JIRA_MAX_CONCURRENT_UPLOADS)
+
+        # Delta sync state: newest `updated` timestamp in the cache and when
+        # the cache was last fully reconciled against Jira
+        self._sync_lock = asyncio.Lock()
+        self._watermark: Optional[datetime] = None
+        self._last_reconcile: Optional[float] = None
+        # Keys of recently deleted tickets, so a late or replayed update
+        # cannot bring one back into the cache
+        self._deleted: "OrderedDict[str, None]" = OrderedDict()
+
+    @property
+    def version(self) -> int:
+        """Version of the cached tickets; changes whenever they do."""
+        return self._index.version
+
+    async def _project_jql(self, project_key: Optional[str] = None) -> Optional[str]:
+        """
+        Build the JQL clause selecting the tracked project(s).
+
+        Args:
+            project_key: Optional project key. Uses default if not provided.
 
-    def get_all_tickets(self, project_key: Optional[str] = None, max_results: int = 1000) -> List[Dict[str, Any]]:
+        Returns:
+            JQL clause, or None if there are no projects to fetch from
+        """
+        # Use provided project key or default
+        proj_key = project_key or self.project_key
+
+        # Project key is required for Jira Cloud
+        if proj_key:
+            return f'project = {proj_key}'
+
+        try:
+            projects = await self.transport.get(f'{API}/project')
+            if not projects:
+                logger.warning(
+                    "No projects found. Cannot fetch tickets.")
+                return None
+
+            project_keys = [p['key'] for p in projects]
+            logger.info(
+                f"No project key specified, fetching from all accessible projects: {project_keys}")
+            return f'project in ({",".join(project_keys)})'
+        except Exception as e:
+            logger.error(f"Failed to get projects list: {e}")
+            logger.info(
+                "Please set JIRA_PROJECT_KEY in your .env file")
+            return None
+
+    async def _search(self, jql: str, max_results: Optional[int] = None, fields: str = "*all",
+                page_size: int = config.JIRA_SEARCH_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Run a JQL search, following nextPageToken until every page is read.
+
+        Args:
+            jql: JQL query
+            max_results: Stop after this many issues (None for no limit)
+            fields: Fields to return for each issue
+            page_size: Issues requested per page
+
+        Returns:
+            Raw issues from the Jira API
+        """
+        issues: List[Dict[str, Any]] = []
+        next_page_token = None
+        while max_results is None or len(issues) < max_results:
+            limit = page_size
+            if max_results is not None:
+                limit = min(limit, max_results - len(issues))
+            params = {'jql': jql, 'fields': fields, 'maxResults': limit}
+            if next_page_token:
+                params['nextPageToken'] = next_page_token
+            page = await self.transport.get(f'{API}/search/jql', params=params)
+            issues.extend(page.get('issues', []))
+            next_page_token = page.get('nextPageToken')
+            if page.get('isLast', True) or not next_page_token:
+                break
+        return issues
+
+    async def _bulk_fetch(self, issue_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch full issues by ID in one request (at most 100 IDs).
+
+        Args:
+            issue_ids: Issue IDs or keys
+
+        Returns:
+            Raw issues from the Jira API, in no particular order
+        """
+        # A read, so safe to retry despite being a POST
+        response = await self.transport.post(
+            f'{API}/issue/bulkfetch',
+            json={'issueIdsOrKeys': issue_ids, 'fields': ['*all']},
+            idempotent=True)
+        return response.get('issues', [])
+
+    async def _fetch_tickets(self, jql: str, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch and parse every issue matching a JQL query.
+
+        Jira Cloud search pages are chained by nextPageToken and carry no
+        total, so full issues cannot be paged in parallel directly. Instead
+        the matching issue IDs are enumerated first (cheap, up to
+        JIRA_ID_PAGE_SIZE per page), then fetched concurrently in batches of
+        JIRA_BULK_FETCH_SIZE (bounded by the transport's concurrency limit)
+        and parsed as each batch arrives.
+
+        Args:
+            jql: JQL query, including its ORDER BY
+            max_results: Stop after this many issues (None for no limit)
+
+        Returns:
+            Parsed tickets in the order of the query
+        """
+        issue_ids = [
+            issue['id'] for issue in await self._search(
+                jql, max_results=max_results, fields='id',
+                page_size=config.JIRA_ID_PAGE_SIZE)
+        ]
+        batch_size = config.JIRA_BULK_FETCH_SIZE
+        batches = [
+            issue_ids[start:start + batch_size]
+            for start in range(0, len(issue_ids), batch_size)
+        ]
+        tickets_by_id: Dict[str, Dict[str, Any]] = {}
+
+        async def fetch_batch(batch: List[str]) -> None:
+            for issue in await self._bulk_fetch(batch):
+                tickets_by_id[issue['id']] = self._parse_ticket(issue)
+
+        tasks = [asyncio.ensure_future(fetch_batch(batch)) for batch in batches]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other batches running against Jira after a
+            # failure (or cancellation); the caller sees the first error
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        # Issues deleted between enumeration and fetch are simply skipped
+        return [tickets_by_id[i] for i in issue_ids if i in tickets_by_id]
+
+    async def get_all_tickets(self, project_key: Optional[str] = None, max_results: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Pull all tickets from Jira regardless of completion status.
 
         Args:
             project_key: Optional project key to filter tickets. Uses default if not provided.
-            max_results: Maximum number of results to return (default: 1000)
+            max_results: Maximum number of results to return (default: no limit)
 
         Returns:
             List of ticket dictionaries with key information
         """
-        try:
-            # Use provided project key or default
-            proj_key = project_key or self.project_key
+        async with self._sync_lock:
+            return await self._get_all_tickets_unlocked(project_key, max_results)
 
-            # Build JQL query - project key is required for Jira Cloud
-            if proj_key:
-                jql = f'project = {proj_key} ORDER BY created DESC'
-            else:
-                try:
-                    projects = self.jira.projects(included_archived=None)
-                    if not projects:
-                        logger.warning(
-                            "No projects found. Cannot fetch tickets.")
-                        self.tickets = []
-                        return self.tickets
-
-                    project_keys = [p['key'] for p in projects]
-                    jql = f'project in ({",".join(project_keys)}) ORDER BY created DESC'
-                    logger.info(
-                        f"No project key specified, fetching from all accessible projects: {project_keys}")
-                except Exception as e:
-                    logger.error(f"Failed to get projects list: {e}")
-                    logger.info(
-                        "Please set JIRA_PROJECT_KEY in your .env file")
-                    self.tickets = []
-                    return self.tickets
+    async def _get_all_tickets_unlocked(self, project_key: Optional[str], max_results: Optional[int]) -> List[Dict[str, Any]]:
+        try:
+            project_jql = await self._project_jql(project_key)
+            if project_jql is None:
+                self._index_tickets([])
+                return self.tickets
 
+            jql = f'{project_jql} ORDER BY created DESC'
             logger.info(f"Fetching tickets with JQL: {jql}")
 
-            # Fetch issues using JQL
-            issues = self.jira.jql(jql, limit=max_results)
-
-            # Parse and store tickets
-            self.tickets = []
-            for issue in issues.get('issues', []):
-                ticket = self._parse_ticket(issue)
-                self.tickets.append(ticket)
+            # Fetch and parse issues using JQL
+            tickets = await self._fetch_tickets(jql, max_results=max_results)
+            self._index_tickets(tickets)
+            self._watermark = self._newest_update(tickets)
+            self._last_reconcile = time.monotonic()
 
             logger.info(f"Successfully fetched {len(self.tickets)} tickets")
             return self.tickets
@@ -99,6 +359,244 @@ class JiraClient:
             logger.error(f"Failed to fetch tickets: {e}")
             raise
 
+    async def sync_tickets(
+        self,
+        project_key: Optional[str] = None,
+        on_synced: Optional[Callable[[TicketSync], Awaitable[None]]] = None,
+    ) -> TicketSync:
+        """
+        Bring the ticket cache up to date, fetching only what changed.
+
+        The first call, and any call once JIRA_RECONCILE_INTERVAL_MINUTES have
+        passed since the last reconciliation, does a full get_all_tickets so
+        deleted or moved tickets drop out of the cache. Other calls only fetch
+        issues updated since the newest cached `updated` timestamp (minus
+        JIRA_SYNC_OVERLAP_MINUTES for clock skew) and merge them in.
+
+        Args:
+            project_key: Optional project key to filter tickets. Uses default if not provided.
+            on_synced: Awaited with the result before the next change to the
+                cache, so state derived from the cache is updated in order
+
+        Returns:
+            The tickets that changed and the keys that were removed
+        """
+        async with self._sync_lock:
+            sync = await self._sync_tickets_unlocked(project_key)
+            if on_synced is not None:
+                await on_synced(sync)
+            return sync
+
+    async def _sync_tickets_unlocked(self, project_key: Optional[str]) -> TicketSync:
+        previous_keys = set(self._index.by_key)
+        reconcile_due = (
+            self._watermark is None
+            or self._last_reconcile is None
+            or time.monotonic() - self._last_reconcile
+            >= config.JIRA_RECONCILE_INTERVAL_MINUTES * 60
+        )
+        if reconcile_due:
+            tickets = await self._get_all_tickets_unlocked(project_key, None)
+            current_keys = {ticket['key'] for ticket in tickets}
+            return TicketSync(True, tickets, sorted(previous_keys - current_keys))
+
+        project_jql = await self._project_jql(project_key)
+        if project_jql is None:
+            return TicketSync(False, [], [])
+
+        elapsed = (datetime.now(timezone.utc) - self._watermark).total_seconds()
+        minutes = max(0, math.ceil(elapsed / 60)) + config.JIRA_SYNC_OVERLAP_MINUTES
+        # A relative date avoids depending on the Jira user's time zone
+        jql = f'{project_jql} AND updated >= "-{minutes}m" ORDER BY updated ASC'
+        logger.info(f"Fetching changed tickets with JQL: {jql}")
+
+        updated = [self._parse_ticket(issue) for issue in await self._search(jql)]
+        changed = [
+            ticket for ticket in updated
+            if self._index.by_key.get(ticket['key']) != ticket
+            and ticket['key'] not in self._deleted
+        ]
+        if changed:
+            self._merge_tickets(changed)
+        newest = self._newest_update(updated)
+        if newest is not None and newest > self._watermark:
+            self._watermark = newest
+        logger.info(
+            f"Delta sync fetched {len(updated)} tickets, {len(changed)} changed")
+        return TicketSync(False, changed, [])
+
+    async def apply_ticket(
+        self,
+        ticket: Dict[str, Any],
+        on_applied: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Write a freshly fetched ticket into the cache without a sync, e.g.
+        after this client changed it or a webhook delivered it.
+
+        Args:
+            ticket: Parsed ticket (as returned by get_ticket_by_key)
+            on_applied: Awaited if the cache changed, before any later change
+                to it, so state derived from the cache is updated in order
+
+        Returns:
+            True if the cache changed, False if the cached copy is identical,
+            was updated more recently (an out-of-order delivery) or the
+            ticket was recently deleted
+        """
+        async with self._sync_lock:
+            if ticket['key'] in self._deleted:
+                return False
+            cached = self._index.by_key.get(ticket['key'])
+            if cached == ticket:
+                return False
+            if cached is not None:
+                cached_updated = parse_jira_timestamp(cached.get('updated'))
+                updated = parse_jira_timestamp(ticket.get('updated'))
+                if cached_updated and updated and updated < cached_updated:
+                    return False
+            index = self._index.with_ticket(ticket)
+            if index is None:
+                self._merge_tickets([ticket])
+            else:
+                # Log the change before publishing the index that carries it
+                index.version = self.changes.record([ticket['key']])
+                self._index = index
+                self.tickets = index.tickets
+            if on_applied is not None:
+                await on_applied()
+            return True
+
+    async def remove_ticket(
+        self,
+        ticket_key: str,
+        on_removed: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Drop a ticket from the cache after it was deleted in Jira. The key is
+        remembered (the last JIRA_DELETED_KEYS_SIZE of them) so apply_ticket
+        and delta syncs ignore it from now on.
+
+        Args:
+            ticket_key: The ticket key (e.g., 'PROJ-123')
+            on_removed: Awaited if the ticket was cached, before any later
+                change to the cache
+
+        Returns:
+            True if the ticket was cached
+        """
+        async with self._sync_lock:
+            self._deleted[ticket_key] = None
+            self._deleted.move_to_end(ticket_key)
+            if len(self._deleted) > config.JIRA_DELETED_KEYS_SIZE:
+                self._deleted.popitem(last=False)
+            if ticket_key not in self._index.by_key:
+                return False
+            self._index_tickets(
+                [t for t in self.tickets if t['key'] != ticket_key],
+                upserted=[], removed=[ticket_key])
+            if on_removed is not None:
+                await on_removed()
+            return True
+
+    def parse_issue(self, issue: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Parse a raw issue pushed to us (e.g. in a webhook payload).
+
+        Args:
+            issue: Raw issue data in REST v2 format
+
+        Returns:
+            Parsed ticket, or None if the issue is outside the tracked project
+        """
+        ticket = self._parse_ticket(issue)
+        if self.project_key and ticket['project'] != self.project_key:
+            return None
+        return ticket
+
+    def _merge_tickets(self, changed: List[Dict[str, Any]]) -> None:
+        """
+        Replace or add tickets in the cache, keeping it ordered newest
+        created first.
+
+        Args:
+            changed: Parsed tickets to merge in
+        """
+        merged = dict(self._index.by_key)
+        for ticket in changed:
+            merged[ticket['key']] = ticket
+        tickets = list(merged.values())
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        tickets.sort(
+            key=lambda t: parse_jira_timestamp(t.get('created')) or epoch,
+            reverse=True)
+        self._index_tickets(
+            tickets, upserted=[ticket['key'] for ticket in changed], removed=[])
+
+    @staticmethod
+    def _newest_update(tickets: List[Dict[str, Any]]) -> Optional[datetime]:
+        timestamps = [parse_jira_timestamp(t.get('updated')) for t in tickets]
+        timestamps = [ts for ts in timestamps if ts is not None]
+        return max(timestamps) if timestamps else None
+
+    def _index_tickets(
+        self,
+        tickets: List[Dict[str, Any]],
+        upserted: Optional[List[str]] = None,
+        removed: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Replace the stored tickets, swapping in a freshly built index so
+        readers never see a half-built one.
+
+        Args:
+            tickets: Parsed tickets, in the order they should be returned
+            upserted: Keys of tickets that were added or changed
+            removed: Keys of tickets that were dropped (both are worked out
+                by comparing with the current cache when not given)
+        """
+        index = TicketIndex(tickets)
+        if upserted is None or removed is None:
+            previous = self._index.by_key
+            upserted = [
+                key for key, ticket in index.by_key.items()
+                if previous.get(key) != ticket
+            ]
+            removed = [key for key in previous if key not in index.by_key]
+        # Log the change before publishing the index that carries it
+        index.version = self.changes.record(upserted, removed)
+        self._index = index
+        self.tickets = tickets
+
+    def get_changes_since(self, since: int, status: Optional[str] = None) -> Optional['TicketChanges']:
+        """
+        Get the tickets that changed after a version of the cache.
+
+        Args:
+            since: Version from the client's previous response
+            status: Only return tickets with this status (case-insensitive);
+                changed tickets that no longer have it are reported removed
+
+        Returns:
+            The current version, the changed tickets (in cache order) and the
+            removed keys, or None if the change log no longer covers `since`
+        """
+        index = self._index
+        changes = self.changes.changes_since(since, index.version)
+        if changes is None:
+            return None
+        present = [key for key in changes.upserted if key in index.by_key]
+        removed = changes.removed + [
+            key for key in changes.upserted if key not in index.by_key]
+        tickets = index.resolve(present)
+        if status:
+            status = status.lower()
+            removed += [
+                t['key'] for t in tickets if (t.get('status') or '').lower() != status]
+            tickets = [
+                t for t in tickets if (t.get('status') or '').lower() == status]
+        return TicketChanges(index.version, tickets, removed)
+
     def _extract_server_id(self, text: Optional[str]) -> Optional[str]:
         """
         Extract server ID from text within brackets.
@@ -158,7 +656,7 @@ class JiraClient:
             'server_id': server_id,
         }
 
-    def update_ticket_status(self, ticket_key: str, status_name: str) -> Dict[str, Any]:
+    async def update_ticket_status(self, ticket_key: str, status_name: str) -> Dict[str, Any]:
         """
         Update the status of a Jira ticket.
 
@@ -171,38 +669,39 @@ class JiraClient:
         """
         try:
             # Get available transitions for this issue
-            transitions = self.jira.get_issue_transitions(ticket_key)
+            transitions = await self.get_available_transitions(ticket_key)
 
             # Find the transition ID that matches the desired status
             transition_id = None
             for transition in transitions:
                 if transition['name'].lower() == status_name.lower() or \
-                   transition['to'].lower() == status_name.lower():
+                   transition['to']['name'].lower() == status_name.lower():
                     transition_id = transition['id']
                     break
 
             if not transition_id:
-                print("Transitions: ", transitions)
-                available_statuses = [t['to'] for t in transitions]
+                available_statuses = [t['to']['name'] for t in transitions]
                 raise ValueError(
                     f"Status '{status_name}' not found. Available transitions: {available_statuses}"
                 )
 
             # Execute the transition
-            self.jira.set_issue_status(ticket_key, status_name)
+            await self.transport.post(
+                f'{API}/issue/{ticket_key}/transitions',
+                json={'transition': {'id': transition_id}},
+                priority=INTERACTIVE)
 
             logger.info(
                 f"Successfully updated {ticket_key} to status '{status_name}'")
 
             # Fetch and return updated ticket
-            issue = self.jira.issue(ticket_key)
-            return self._parse_ticket(issue)
+            return await self.get_ticket_by_key(ticket_key, use_cache=False)
 
         except Exception as e:
             logger.error(f"Failed to update ticket status: {e}")
             raise
 
-    def add_comment(self, ticket_key: str, comment_text: str) -> Dict[str, Any]:
+    async def add_comment(self, ticket_key: str, comment_text: str) -> Dict[str, Any]:
         """
         Add a comment to a Jira ticket.
 
@@ -214,7 +713,9 @@ class JiraClient:
             The created comment data
         """
         try:
-            result = self.jira.issue_add_comment(ticket_key, comment_text)
+            result = await self.transport.post(
+                f'{API}/issue/{ticket_key}/comment', json={'body': comment_text},
+                priority=INTERACTIVE)
             logger.info(f"Successfully added comment to {ticket_key}")
             return result
 
@@ -222,7 +723,7 @@ class JiraClient:
             logger.error(f"Failed to add comment: {e}")
             raise
 
-    def add_attachment(self, ticket_key: str, file_path: str) -> Dict[str, Any]:
+    async def add_attachment(self, ticket_key: str, file_path: str) -> Dict[str, Any]:
         """
         Add an attachment (image or file) to a Jira ticket.
 
@@ -234,19 +735,22 @@ class JiraClient:
             The attachment information
         """
         try:
-            # Read the file
-            with open(file_path, 'rb') as f:
-                result = self.jira.add_attachment(
-                    ticket_key, f, file_path.split('/')[-1])
-
-            logger.info(f"Successfully added attachment to {ticket_key}")
-            return result
+            # Stream the file from disk, reading it off the event loop
+            f = await asyncio.to_thread(open, file_path, 'rb')
+            try:
+                return await self.add_attachment_stream(
+                    ticket_key,
+                    lambda n: asyncio.to_thread(f.read, n),
+                    os.path.basename(file_path),
+                    size=os.fstat(f.fileno()).st_size)
+            finally:
+                f.close()
 
         except Exception as e:
             logger.error(f"Failed to add attachment: {e}")
             raise
 
-    def add_attachment_from_bytes(self, ticket_key: str, file_data: bytes, filename: str) -> Dict[str, Any]:
+    async def add_attachment_from_bytes(self, ticket_key: str, file_data: bytes, filename: str) -> Dict[str, Any]:
         """
         Add an attachment from bytes data (useful for uploaded files).
 
@@ -259,33 +763,62 @@ class JiraClient:
             The attachment information
         """
         try:
-            # Construct the API endpoint
-            url = f"{self.jira_url}/rest/api/3/issue/{ticket_key}/attachments"
-
-            # Prepare headers
-            auth = base64.b64encode(
-                f"{self.username}:{self.api_token}".encode()).decode()
-            headers = {
-                "Authorization": f"Basic {auth}",
-                "X-Atlassian-Token": "no-check"
-            }
+            result = await self.transport.post(
+                f'rest/api/3/issue/{ticket_key}/attachments',
+                files={'file': (filename, file_data)},
+                headers={'X-Atlassian-Token': 'no-check'},
+                priority=INTERACTIVE)
+
+            logger.info(
+                f"Successfully added attachment '{filename}' to {ticket_key}")
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to add attachment from bytes: {e}")
+            raise
 
-            # Prepare files
-            files = {'file': (filename, file_data)}
+    async def add_attachment_stream(
+        self,
+        ticket_key: str,
+        read: Callable[[int], Awaitable[bytes]],
+        filename: str,
+        size: Optional[int] = None,
+        content_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add an attachment by streaming it to Jira chunk by chunk (useful for
+        large uploaded files, e.g. UploadFile.read).
 
-            # Make the request
-            response = requests.post(url, headers=headers, files=files)
-            response.raise_for_status()
+        Args:
+            ticket_key: The ticket key (e.g., 'PROJ-123')
+            read: Async callable returning up to n bytes, b'' at the end
+            filename: Name for the attachment
+            size: File size in bytes, if known
+            content_type: MIME type of the file, if known
+
+        Returns:
+            The attachment information
+        """
+        try:
+            headers, body = multipart_file_body(
+                'file', filename, read, size=size, content_type=content_type)
+            headers['X-Atlassian-Token'] = 'no-check'
+            async with self._upload_semaphore:
+                result = await self.transport.post(
+                    f'rest/api/3/issue/{ticket_key}/attachments',
+                    content=body,
+                    headers=headers,
+                    priority=INTERACTIVE)
 
             logger.info(
                 f"Successfully added attachment '{filename}' to {ticket_key}")
-            return response.json()
+            return result
 
         except Exception as e:
-            logger.error(f"Failed to add attachment from bytes: {e}")
+            logger.error(f"Failed to add attachment stream: {e}")
             raise
 
-    def register_webhook(self, webhook_url: str, events: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def register_webhook(self, webhook_url: str, events: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Register a webhook to listen for Jira events.
 
@@ -320,21 +853,8 @@ class JiraClient:
 
             # Jira Cloud uses different webhook registration
             # For Jira Cloud, webhooks are managed through the app settings
-            # This uses the REST API v3
-            url = f"{self.jira_url}/rest/webhooks/1.0/webhook"
-
-            auth = base64.b64encode(
-                f"{self.username}:{self.api_token}".encode()).decode()
-            headers = {
-                "Authorization": f"Basic {auth}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-
-            response = requests.post(url, json=webhook_data, headers=headers)
-            response.raise_for_status()
-
-            result = response.json()
+            result = await self.transport.post(
+                'rest/webhooks/1.0/webhook', json=webhook_data)
             logger.info(f"Successfully registered webhook at {webhook_url}")
             return result
 
@@ -346,7 +866,7 @@ class JiraClient:
             )
             raise
 
-    def list_webhooks(self) -> List[Dict[str, Any]]:
+    async def list_webhooks(self) -> List[Dict[str, Any]]:
         """
         List all registered webhooks.
 
@@ -354,19 +874,7 @@ class JiraClient:
             List of webhook configurations
         """
         try:
-            url = f"{self.jira_url}/rest/webhooks/1.0/webhook"
-
-            auth = base64.b64encode(
-                f"{self.username}:{self.api_token}".encode()).decode()
-            headers = {
-                "Authorization": f"Basic {auth}",
-                "Accept": "application/json"
-            }
-
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-
-            webhooks = response.json()
+            webhooks = await self.transport.get('rest/webhooks/1.0/webhook')
             logger.info(f"Found {len(webhooks)} registered webhooks")
             return webhooks
 
@@ -374,7 +882,7 @@ class JiraClient:
             logger.error(f"Failed to list webhooks: {e}")
             raise
 
-    def delete_webhook(self, webhook_id: str) -> bool:
+    async def delete_webhook(self, webhook_id: str) -> bool:
         """
         Delete a registered webhook.
 
@@ -385,17 +893,7 @@ class JiraClient:
             True if successful
         """
         try:
-            url = f"{self.jira_url}/rest/webhooks/1.0/webhook/{webhook_id}"
-
-            auth = base64.b64encode(
-                f"{self.username}:{self.api_token}".encode()).decode()
-            headers = {
-                "Authorization": f"Basic {auth}",
-            }
-
-            response = requests.delete(url, headers=headers)
-            response.raise_for_status()
-
+            await self.transport.delete(f'rest/webhooks/1.0/webhook/{webhook_id}')
             logger.info(f"Successfully deleted webhook {webhook_id}")
             return True
 
@@ -403,18 +901,25 @@ class JiraClient:
             logger.error(f"Failed to delete webhook: {e}")
             raise
 
-    def get_ticket_by_key(self, ticket_key: str) -> Dict[str, Any]:
+    async def get_ticket_by_key(self, ticket_key: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get a specific ticket by its key.
 
         Args:
             ticket_key: The ticket key (e.g., 'PROJ-123')
+            use_cache: Serve the ticket from the refreshed cache when present
+                instead of fetching it from Jira
 
         Returns:
             Ticket information
         """
+        if use_cache:
+            ticket = self._index.by_key.get(ticket_key)
+            if ticket is not None:
+                return ticket
+
         try:
-            issue = self.jira.issue(ticket_key)
+            issue = await self.transport.get(f'{API}/issue/{ticket_key}', priority=INTERACTIVE)
             return self._parse_ticket(issue)
 
         except Exception as e:
@@ -432,10 +937,7 @@ class JiraClient:
             List of tickets for the specified server
         """
         try:
-            filtered_tickets = [
-                ticket for ticket in self.tickets
-                if ticket.get('server_id') == server_id
-            ]
+            filtered_tickets = list(self._index.by_server.get(server_id, ()))
             logger.info(
                 f"Found {len(filtered_tickets)} tickets for server {server_id}")
             return filtered_tickets
@@ -444,7 +946,47 @@ class JiraClient:
             logger.error(f"Failed to get tickets for server {server_id}: {e}")
             raise
 
-    def get_available_transitions(self, ticket_key: str) -> List[Dict[str, Any]]:
+    def get_tickets_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """
+        Get all cached tickets with a given status.
+
+        Args:
+            status: Status name (case-insensitive, e.g. 'In Progress')
+
+        Returns:
+            List of tickets with that status
+        """
+        return list(self._index.by_status.get(status.lower(), ()))
+
+    def get_tickets_by_location(
+        self,
+        hall: Optional[str] = None,
+        pod: Optional[str] = None,
+        aisle: Optional[str] = None,
+        rack: Optional[str] = None,
+        unit: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all tickets whose server is in a hall, pod, aisle or rack.
+
+        Args:
+            hall: Hall component of the server ID
+            pod: Pod component of the server ID
+            aisle: Aisle component of the server ID
+            rack: Rack component of the server ID
+            unit: Unit component of the server ID (e.g. 'U3')
+
+        Returns:
+            List of matching tickets. Unset levels match anything.
+        """
+        prefix = prefix_from_levels(hall, pod, aisle, rack, unit)
+        index = self._index
+        filtered_tickets = index.resolve(index.by_location.find(prefix))
+        logger.info(
+            f"Found {len(filtered_tickets)} tickets for location {prefix}")
+        return filtered_tickets
+
+    async def get_available_transitions(self, ticket_key: str) -> List[Dict[str, Any]]:
         """
         Get available status transitions for a ticket.
 
@@ -452,11 +994,12 @@ class JiraClient:
             ticket_key: The ticket key (e.g., 'PROJ-123')
 
         Returns:
-            List of available transitions
+            List of available transitions ({'id', 'name', 'to': {'name', ...}})
         """
         try:
-            transitions = self.jira.get_issue_transitions(ticket_key)
-            return transitions.get('transitions', [])
+            response = await self.transport.get(
+                f'{API}/issue/{ticket_key}/transitions', priority=INTERACTIVE)
+            return response.get('transitions', [])
 
         except Exception as e:
             logger.error(f"Failed to get transitions for {ticket_key}: {e}")
@@ -487,6 +1030,12 @@ def initialize_jira_client() -> JiraClient:
         raise
 
 
+async def close_jira_client() -> None:
+    """Close the global Jira client's connection pool, if it was initialized."""
+    if jira_client is not None:
+        await jira_client.transport.aclose()
+
+
 def get_jira_client() -> JiraClient:
     """
     Get the global Jira client instance.
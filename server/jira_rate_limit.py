@@ -0,0 +1,210 @@
+"""
+Rate-limit handling for the Jira transport.
+
+Jira Cloud throttles per account and answers with 429 and a Retry-After
+header (plus X-RateLimit-* headers on throttled and nearly throttled
+responses). Rather than a fixed number of requests in flight, the transport
+uses an AdaptiveLimiter: its limit grows by one request per round of
+successful requests and halves on throttling (AIMD), and while Jira has asked
+us to back off no new request is sent at all. Waiting requests are dispatched
+by priority, so a technician's comment or status change overtakes queued
+background sync pages.
+
+Retries are paid for from a RetryBudget that only refills as requests
+succeed, so a Jira outage cannot multiply our own traffic.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+
+import httpx
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Request priorities; lower is dispatched first
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Status codes that mean Jira is shedding load
+THROTTLE_STATUSES = {429, 503}
+
+
+def retry_after_seconds(headers: httpx.Headers, now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds Jira asked us to wait, from Retry-After (seconds or an HTTP
+    date) or, failing that, X-RateLimit-Reset (an ISO 8601 timestamp).
+
+    Returns:
+        Seconds to wait, or None if the response did not say
+    """
+    now = time.time() if now is None else now
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    reset = headers.get("x-ratelimit-reset")
+    if reset:
+        try:
+            reset_at = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return max(0.0, reset_at.timestamp() - now)
+    return None
+
+
+def backoff_seconds(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before retry number `attempt` (1-based): full jitter over an
+    exponentially growing window, and never less than Retry-After.
+    """
+    window = min(
+        config.JIRA_RETRY_MAX_BACKOFF_SECONDS,
+        config.JIRA_RETRY_BASE_BACKOFF_SECONDS * 2 ** (attempt - 1),
+    )
+    delay = random.uniform(0, window)
+    if retry_after is not None:
+        # Spread the retries of everyone who got the same Retry-After
+        delay = retry_after + random.uniform(0, config.JIRA_RETRY_BASE_BACKOFF_SECONDS)
+    return delay
+
+
+class RetryBudget:
+    def __init__(
+        self,
+        ratio: float = config.JIRA_RETRY_BUDGET_RATIO,
+        reserve: float = config.JIRA_RETRY_BUDGET_RESERVE,
+    ):
+        """
+        Allow retries worth `ratio` of recent requests.
+
+        Args:
+            ratio: Retries earned per request sent (0.2 = one retry per five)
+            reserve: Retries available up front, and the most that can be saved
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry if the budget allows it."""
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        max_limit: int = config.JIRA_MAX_CONCURRENCY,
+        min_limit: int = config.JIRA_MIN_CONCURRENCY,
+    ):
+        """
+        Bound requests in flight with an AIMD-adjusted limit.
+
+        Args:
+            max_limit: Ceiling (and starting value) of the limit
+            min_limit: Floor of the limit
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        # No request starts before this time.monotonic() while Jira asks us to wait
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    def queued(self) -> Dict[str, int]:
+        counts = Counter(
+            PRIORITY_NAMES.get(priority, str(priority))
+            for priority, _, future in self._waiters
+            if not future.done()
+        )
+        return dict(counts)
+
+    async def acquire(self, priority: int = BACKGROUND) -> float:
+        """
+        Wait for a slot, highest priority first.
+
+        Returns:
+            Start time to pass back to release()
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; hand the slot on
+                self.in_flight -= 1
+                self._dispatch()
+            raise
+        return time.monotonic()
+
+    def release(self, started: float, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Free a slot and adapt the limit.
+
+        Args:
+            started: Value returned by acquire()
+            throttled: Jira shed this request (429/503) or said it is near its limit
+            retry_after: Seconds Jira asked us to wait before the next request
+        """
+        self.in_flight -= 1
+        now = time.monotonic()
+        if retry_after is not None:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        if throttled:
+            # Requests sent before the last decrease saw the old limit;
+            # one congestion event halves the limit once
+            if started >= self._last_decrease:
+                self.limit = max(self.min_limit, self.limit / 2)
+                self._last_decrease = now
+                logger.info(f"Jira throttled requests, concurrency limit now {int(self.limit)}")
+        else:
+            # About +1 per limit's worth of successes
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        if now < self.paused_until:
+            if self._wakeup is None:
+                loop = asyncio.get_running_loop()
+                self._wakeup = loop.call_later(self.paused_until - now, self._resume)
+            return
+        while self._waiters and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _resume(self) -> None:
+        self._wakeup = None
+        self._dispatch()
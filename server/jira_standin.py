@@ -0,0 +1,511 @@
+"""
+Local Jira Cloud Stand-in
+
+A Jira-compatible FastAPI app serving the REST endpoints JiraClient uses, so
+ticket refresh, status updates, comments, attachments and webhooks can be
+load-tested offline:
+
+  - GET  rest/api/2/project
+  - GET  rest/api/2/search/jql            (project / updated JQL, nextPageToken)
+  - POST rest/api/2/issue/bulkfetch
+  - GET  rest/api/2/issue/{key}
+  - GET  rest/api/2/issue/{key}/transitions
+  - POST rest/api/2/issue/{key}/transitions
+  - POST rest/api/2/issue/{key}/comment
+  - POST rest/api/3/issue/{key}/attachments
+  - GET/POST rest/webhooks/1.0/webhook, DELETE rest/webhooks/1.0/webhook/{id}
+
+Every REST call can be slowed down (fixed latency plus jitter), failed at a
+given rate (503) and rate limited with a token bucket (429 with Retry-After).
+Issues are synthetic; changes made through the API (or by --churn) are
+delivered to registered webhooks like Jira Cloud does.
+
+Usage:
+    python jira_standin.py [--issues 50000] [--latency 0.05] [--error-rate 0.01]
+                           [--rate-limit 100] [--churn 5] [--port 8081]
+
+Then point the server at it:
+    JIRA_URL=http://127.0.0.1:8081 JIRA_USERNAME=x JIRA_API_TOKEN=x JIRA_PROJECT_KEY=OPS
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import JSONResponse
+
+MAX_FULL_PAGE = 100
+MAX_ID_PAGE = 5000
+MAX_BULK_FETCH = 100
+
+STATUSES = {"To Do": "1", "In Progress": "3", "Done": "10001"}
+TRANSITIONS = {"11": "To Do", "21": "In Progress", "31": "Done"}
+PRIORITIES = ["Highest", "High", "Medium", "Low", "Lowest"]
+PROBLEMS = ["Disk failure", "PSU fault", "Overheating", "NIC down", "Memory errors"]
+
+
+def jira_timestamp(moment: datetime) -> str:
+    """Format a datetime the way Jira does (2025-01-01T10:00:00.000+0000)."""
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}+0000"
+
+
+class StandinState:
+    def __init__(
+        self,
+        num_issues: int = 1000,
+        project_key: str = "OPS",
+        server_ids: Optional[List[str]] = None,
+        webhook_secret: Optional[str] = None,
+        seed: int = 0,
+    ):
+        """
+        Create the synthetic project.
+
+        Args:
+            num_issues: Number of issues to generate
+            project_key: Key of the single project
+            server_ids: Server IDs to file tickets against (synthetic
+                Hall-Pod-Aisle-Rack-U# IDs if not provided)
+            webhook_secret: Secret used to sign webhook deliveries
+            seed: Random seed for the synthetic data
+        """
+        self.project_key = project_key
+        self.server_ids = server_ids
+        self.webhook_secret = webhook_secret
+        self.random = random.Random(seed)
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.webhooks: Dict[str, Dict[str, Any]] = {}
+        self.comments = 0
+        self.attachments = 0
+        self.attachment_bytes = 0
+        self._next_id = 10000
+        self._next_webhook = 1
+        # Bumped on every change so cached search results can be reused
+        self.version = 0
+        self._searches: Dict[str, Any] = {}
+        start = datetime.now(timezone.utc) - timedelta(days=30)
+        for i in range(num_issues):
+            created = start + timedelta(seconds=i * 30 * 86400 / max(num_issues, 1))
+            self.create_issue(created)
+
+    def create_issue(self, created: Optional[datetime] = None) -> Dict[str, Any]:
+        """Add a synthetic issue and return it."""
+        created = created or datetime.now(timezone.utc)
+        number = self._next_id - 10000 + 1
+        if self.server_ids:
+            server_id = self.random.choice(self.server_ids)
+        else:
+            server_id = (
+                f"{self.random.randint(1, 4):02d}-{self.random.randint(1, 20):02d}-"
+                f"{self.random.randint(1, 10):02d}-{self.random.randint(1, 20):02d}-"
+                f"U{self.random.randint(1, 42)}"
+            )
+        status = self.random.choice(list(STATUSES))
+        issue = {
+            "id": str(self._next_id),
+            "key": f"{self.project_key}-{number}",
+            "fields": {
+                "summary": f"[{server_id}] {self.random.choice(PROBLEMS)}",
+                "description": "Replace the failed part and re-run diagnostics.",
+                "status": {"name": status, "id": STATUSES[status]},
+                "priority": {"name": self.random.choice(PRIORITIES)},
+                "assignee": None,
+                "reporter": {"displayName": "Monitoring"},
+                "created": jira_timestamp(created),
+                "updated": jira_timestamp(created),
+                "project": {"key": self.project_key},
+                "issuetype": {"name": "Task"},
+                "labels": ["hardware"],
+            },
+        }
+        self._next_id += 1
+        self.issues[issue["key"]] = issue
+        self.issues[issue["id"]] = issue
+        self.version += 1
+        return issue
+
+    def unique_issues(self) -> List[Dict[str, Any]]:
+        return [issue for key, issue in self.issues.items() if key == issue["key"]]
+
+    def get(self, key_or_id: str) -> Dict[str, Any]:
+        issue = self.issues.get(key_or_id)
+        if issue is None:
+            raise HTTPException(
+                status_code=404,
+                detail={"errorMessages": ["Issue does not exist or you do not have permission to see it."]},
+            )
+        return issue
+
+    def touch(self, issue: Dict[str, Any]) -> None:
+        issue["fields"]["updated"] = jira_timestamp(datetime.now(timezone.utc))
+        self.version += 1
+
+    def search(self, jql: str) -> List[Dict[str, Any]]:
+        """
+        Evaluate the subset of JQL JiraClient sends: project = X,
+        project in (X, Y), updated >= "-Nm" and a single ORDER BY.
+        """
+        cached = self._searches.get(jql)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        issues = self.unique_issues()
+        order_by = re.search(r"\s+ORDER BY\s+(.*)$", jql, re.I)
+        clause = jql[: order_by.start()] if order_by else jql
+        order = order_by.group(1) if order_by else ""
+
+        projects = re.search(r"project\s*(?:=\s*(\w+)|in\s*\(([^)]*)\))", clause, re.I)
+        if projects:
+            keys = {projects.group(1)} if projects.group(1) else {
+                key.strip() for key in projects.group(2).split(",")}
+            issues = [issue for issue in issues if issue["fields"]["project"]["key"] in keys]
+
+        updated = re.search(r'updated\s*>=\s*"-(\d+)m"', clause, re.I)
+        if updated:
+            since = jira_timestamp(
+                datetime.now(timezone.utc) - timedelta(minutes=int(updated.group(1))))
+            issues = [issue for issue in issues if issue["fields"]["updated"] >= since]
+
+        field, _, direction = (order or "created DESC").strip().partition(" ")
+        field = field.lower() if field.lower() in ("created", "updated") else "created"
+        issues.sort(
+            key=lambda issue: (issue["fields"][field], int(issue["id"])),
+            reverse=direction.strip().upper() != "ASC",
+        )
+        # Paging re-runs the same query; reuse the result until an issue changes
+        self._searches[jql] = (self.version, issues)
+        return issues
+
+    def delivery(self, event: str, issue: Dict[str, Any], **extra) -> Dict[str, Any]:
+        return {
+            "timestamp": int(time.time() * 1000),
+            "webhookEvent": event,
+            "issue": issue,
+            **extra,
+        }
+
+
+async def deliver_webhooks(state: StandinState, payload: Dict[str, Any]) -> None:
+    """POST an event to every webhook subscribed to it, signed if a secret is set."""
+    targets = [
+        hook for hook in state.webhooks.values() if payload["webhookEvent"] in hook["events"]
+    ]
+    if not targets:
+        return
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    if state.webhook_secret:
+        digest = hmac.new(state.webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+        headers["X-Hub-Signature"] = f"sha256={digest}"
+    async with httpx.AsyncClient(timeout=10) as client:
+        for hook in targets:
+            delivery_headers = dict(headers)
+            delivery_headers["X-Atlassian-Webhook-Identifier"] = f"{hook['id']}-{payload['timestamp']}-{random.random()}"
+            try:
+                await client.post(hook["url"], content=body, headers=delivery_headers)
+                hook["delivered"] += 1
+            except httpx.HTTPError:
+                hook["failed"] += 1
+
+
+def create_standin_app(
+    num_issues: int = 1000,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit: Optional[float] = None,
+    burst: Optional[int] = None,
+    churn: float = 0.0,
+    project_key: str = "OPS",
+    server_ids: Optional[List[str]] = None,
+    webhook_secret: Optional[str] = None,
+    seed: int = 0,
+) -> FastAPI:
+    """
+    Build the stand-in app.
+
+    Args:
+        num_issues: Number of synthetic issues in the project
+        latency: Seconds added to every REST call
+        jitter: Up to this many extra seconds added at random
+        error_rate: Fraction of REST calls answered with 503
+        rate_limit: Requests per second allowed (None for unlimited); calls
+            over the limit get 429 with a Retry-After header
+        burst: Token bucket size (defaults to one second of rate_limit)
+        churn: Issues created or updated per second in the background
+        project_key: Key of the single project
+        server_ids: Server IDs to file tickets against
+        webhook_secret: Secret used to sign webhook deliveries
+        seed: Random seed for the synthetic data and faults
+
+    Returns:
+        The FastAPI app; its state is available as app.state.jira
+    """
+    state = StandinState(num_issues, project_key, server_ids, webhook_secret, seed)
+    faults = random.Random(seed)
+    capacity = burst or max(1, int(rate_limit or 1))
+    bucket = {"tokens": float(capacity), "at": time.monotonic()}
+    stats = {"requests": 0, "errors": 0, "throttled": 0}
+
+    async def churn_loop():
+        while True:
+            await asyncio.sleep(1 / churn)
+            if faults.random() < 0.2:
+                issue, event = state.create_issue(), "jira:issue_created"
+            else:
+                issue, event = state.random.choice(state.unique_issues()), "jira:issue_updated"
+                status = state.random.choice(list(STATUSES))
+                issue["fields"]["status"] = {"name": status, "id": STATUSES[status]}
+                state.touch(issue)
+            await deliver_webhooks(state, state.delivery(event, issue))
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        task = asyncio.create_task(churn_loop()) if churn > 0 else None
+        yield
+        if task:
+            task.cancel()
+
+    # Issue payloads are returned as JSONResponse to skip FastAPI's response
+    # encoding, which would otherwise dominate the stand-in's own latency
+    app = FastAPI(lifespan=lifespan)
+    app.state.jira = state
+    app.state.stats = stats
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if not request.url.path.startswith("/rest/"):
+            return await call_next(request)
+        stats["requests"] += 1
+        if rate_limit:
+            now = time.monotonic()
+            bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["at"]) * rate_limit)
+            bucket["at"] = now
+            if bucket["tokens"] < 1:
+                stats["throttled"] += 1
+                retry_after = (1 - bucket["tokens"]) / rate_limit
+                return JSONResponse(
+                    {"errorMessages": ["Rate limit exceeded"]},
+                    status_code=429,
+                    headers={"Retry-After": str(max(1, round(retry_after)))},
+                )
+            bucket["tokens"] -= 1
+        delay = latency + (faults.random() * jitter if jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if error_rate and faults.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"errorMessages": ["Service unavailable"]}, status_code=503)
+        return await call_next(request)
+
+    @app.get("/rest/api/2/project")
+    def list_projects():
+        return [{"id": "10000", "key": state.project_key, "name": "Operations"}]
+
+    @app.get("/rest/api/2/search/jql")
+    def search(jql: str = "", fields: str = "*all", maxResults: int = 50, nextPageToken: Optional[str] = None):
+        cap = MAX_ID_PAGE if fields == "id" else MAX_FULL_PAGE
+        limit = max(0, min(maxResults, cap))
+        start = int(nextPageToken or 0)
+        matches = state.search(jql)
+        page = matches[start : start + limit]
+        if fields == "id":
+            page = [{"id": issue["id"]} for issue in page]
+        end = start + len(page)
+        payload: Dict[str, Any] = {"issues": page, "isLast": end >= len(matches)}
+        if end < len(matches):
+            payload["nextPageToken"] = str(end)
+        return JSONResponse(payload)
+
+    @app.post("/rest/api/2/issue/bulkfetch")
+    async def bulk_fetch(request: Request):
+        body = await request.json()
+        ids = body.get("issueIdsOrKeys", [])
+        if len(ids) > MAX_BULK_FETCH:
+            raise HTTPException(status_code=400, detail="Too many issues requested")
+        issues = [state.issues[i] for i in ids if i in state.issues]
+        errors = [i for i in ids if i not in state.issues]
+        return JSONResponse({"issues": issues, "issueErrors": errors})
+
+    @app.get("/rest/api/2/issue/{key}")
+    def get_issue(key: str):
+        return JSONResponse(state.get(key))
+
+    @app.get("/rest/api/2/issue/{key}/transitions")
+    def get_transitions(key: str):
+        current = state.get(key)["fields"]["status"]["name"]
+        return {
+            "transitions": [
+                {"id": tid, "name": name, "to": {"name": name, "id": STATUSES[name]}}
+                for tid, name in TRANSITIONS.items()
+                if name != current
+            ]
+        }
+
+    @app.post("/rest/api/2/issue/{key}/transitions", status_code=204)
+    async def do_transition(key: str, request: Request):
+        issue = state.get(key)
+        body = await request.json()
+        name = TRANSITIONS.get(str(body.get("transition", {}).get("id")))
+        if name is None:
+            raise HTTPException(status_code=400, detail="Transition is not valid")
+        issue["fields"]["status"] = {"name": name, "id": STATUSES[name]}
+        state.touch(issue)
+        asyncio.create_task(deliver_webhooks(state, state.delivery("jira:issue_updated", issue)))
+
+    @app.post("/rest/api/2/issue/{key}/comment", status_code=201)
+    async def add_comment(key: str, request: Request):
+        issue = state.get(key)
+        body = await request.json()
+        state.comments += 1
+        state.touch(issue)
+        comment = {
+            "id": str(state.comments),
+            "body": body.get("body"),
+            "author": {"displayName": "Stand-in"},
+            "created": issue["fields"]["updated"],
+        }
+        asyncio.create_task(
+            deliver_webhooks(state, state.delivery("comment_created", issue, comment=comment)))
+        return comment
+
+    @app.post("/rest/api/3/issue/{key}/attachments")
+    async def add_attachment(key: str, request: Request, file: UploadFile = File(...)):
+        if request.headers.get("X-Atlassian-Token") != "no-check":
+            raise HTTPException(status_code=403, detail="XSRF check failed")
+        issue = state.get(key)
+        size = 0
+        while chunk := await file.read(1 << 20):
+            size += len(chunk)
+        state.attachments += 1
+        state.attachment_bytes += size
+        state.touch(issue)
+        return [{"id": str(state.attachments), "filename": file.filename, "size": size}]
+
+    @app.get("/rest/webhooks/1.0/webhook")
+    def list_webhooks():
+        return list(state.webhooks.values())
+
+    @app.post("/rest/webhooks/1.0/webhook", status_code=201)
+    async def register_webhook(request: Request):
+        body = await request.json()
+        webhook_id = str(state._next_webhook)
+        state._next_webhook += 1
+        state.webhooks[webhook_id] = {
+            "id": webhook_id,
+            "self": f"/rest/webhooks/1.0/webhook/{webhook_id}",
+            "name": body.get("name"),
+            "url": body["url"],
+            "events": body.get("events", []),
+            "delivered": 0,
+            "failed": 0,
+        }
+        return state.webhooks[webhook_id]
+
+    @app.delete("/rest/webhooks/1.0/webhook/{webhook_id}", status_code=204)
+    def delete_webhook(webhook_id: str):
+        if state.webhooks.pop(webhook_id, None) is None:
+            raise HTTPException(status_code=404, detail="Webhook not found")
+
+    @app.get("/standin/stats")
+    def get_stats():
+        return {
+            **stats,
+            "issues": len(state.unique_issues()),
+            "comments": state.comments,
+            "attachments": state.attachments,
+            "attachment_bytes": state.attachment_bytes,
+            "webhooks": list(state.webhooks.values()),
+        }
+
+    return app
+
+
+class StandinServer:
+    def __init__(self, app: FastAPI, host: str = "127.0.0.1", port: int = 0):
+        """
+        Run a stand-in app with uvicorn on a background thread, e.g. from a
+        benchmark.
+
+        Args:
+            app: App from create_standin_app
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        self.app = app
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Jira Cloud stand-in")
+    parser.add_argument("--issues", type=int, default=1000, help="Synthetic issues in the project")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of latency per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failed with 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before 429s")
+    parser.add_argument("--burst", type=int, default=None, help="Requests allowed in a burst")
+    parser.add_argument("--churn", type=float, default=0.0, help="Issues created/updated per second")
+    parser.add_argument("--project", default="OPS", help="Project key")
+    parser.add_argument("--servers", default=None, help="JSON file of servers to file tickets against")
+    parser.add_argument("--webhook-secret", default=None, help="Secret to sign webhook deliveries with")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    server_ids = None
+    if args.servers:
+        with open(args.servers) as f:
+            server_ids = [server["id"] for server in json.load(f)] or None
+
+    uvicorn.run(
+        create_standin_app(
+            num_issues=args.issues,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            rate_limit=args.rate_limit,
+            burst=args.burst,
+            churn=args.churn,
+            project_key=args.project,
+            server_ids=server_ids,
+            webhook_secret=args.webhook_secret,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
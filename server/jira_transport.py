@@ -0,0 +1,308 @@
+"""
+Async HTTP transport shared by every Jira REST call.
+
+One httpx.AsyncClient holds a keep-alive connection pool (HTTP/2 when the
+optional `h2` package is installed) and the Basic auth header is built once.
+An adaptive limiter (jira_rate_limit.py) bounds how many requests are in
+flight, backs off when Jira throttles and lets interactive requests jump the
+queue; throttled and failed requests are retried within a retry budget.
+"""
+from collections import Counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import mimetypes
+import secrets
+import time
+
+import httpx
+
+import config
+from jira_rate_limit import (
+    AdaptiveLimiter,
+    BACKGROUND,
+    RetryBudget,
+    THROTTLE_STATUSES,
+    backoff_seconds,
+    retry_after_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def multipart_file_body(
+    field: str,
+    filename: str,
+    read: Callable[[int], Awaitable[bytes]],
+    size: Optional[int] = None,
+    content_type: Optional[str] = None,
+    chunk_size: int = 1 << 20,
+) -> Tuple[Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Build a multipart/form-data body holding one file, read chunk by chunk.
+
+    Unlike httpx's `files=`, which reads file objects synchronously on the
+    event loop, the file is pulled through an async read callable (e.g.
+    UploadFile.read), so at most one chunk per upload is held in memory.
+
+    Args:
+        field: Form field name
+        filename: File name sent to the server
+        read: Async callable returning up to n bytes, b'' at the end
+        size: File size in bytes, if known, to send a Content-Length
+        content_type: MIME type (guessed from the file name if not given)
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        Request headers and the body stream
+    """
+    boundary = secrets.token_hex(16)
+    content_type = (
+        content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    quoted = filename.replace("\\", "\\\\").replace('"', '\\"')
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{quoted}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+    if size is not None:
+        headers["Content-Length"] = str(len(head) + size + len(tail))
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        while chunk := await read(chunk_size):
+            yield chunk
+        yield tail
+
+    return headers, body()
+
+
+# Safe to repeat: Jira applies them at most once
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Worth retrying (given a replayable body): throttled or a gateway hiccup
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Rate-limit headers reported by stats()
+RATE_LIMIT_HEADERS = ("x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-nearlimit")
+
+
+def _replayable(files: Optional[Dict[str, Any]], content: Any) -> bool:
+    """Whether the request body can be sent again (streams can't)."""
+    if content is not None and not isinstance(content, (bytes, bytearray, str)):
+        return False
+    for value in (files or {}).values():
+        data = value[1] if isinstance(value, tuple) else value
+        if not isinstance(data, (bytes, bytearray, str)):
+            return False
+    return True
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class JiraTransport:
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        api_token: str,
+        max_connections: int = config.JIRA_MAX_CONNECTIONS,
+        max_concurrency: int = config.JIRA_MAX_CONCURRENCY,
+        timeout: float = config.JIRA_TIMEOUT_SECONDS,
+        http2: bool = config.JIRA_HTTP2,
+    ):
+        """
+        Create the connection pool.
+
+        Args:
+            base_url: Jira site URL (e.g. https://example.atlassian.net)
+            username: Jira account email
+            api_token: Jira API token
+            max_connections: Upper bound on open connections in the pool
+            max_concurrency: Upper bound on requests in flight at once; the
+                actual limit adapts below it while Jira throttles
+            timeout: Per-request timeout in seconds
+            http2: Use HTTP/2 when the h2 package is installed
+        """
+        if http2 and not _http2_available():
+            logger.info("h2 is not installed, Jira transport will use HTTP/1.1")
+            http2 = False
+        self.max_concurrency = max_concurrency
+        self.limiter = AdaptiveLimiter(max_concurrency)
+        self.retry_budget = RetryBudget()
+        self.counters: Counter = Counter()
+        self._rate_limit: Dict[str, str] = {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            auth=httpx.BasicAuth(username, api_token),
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            http2=http2,
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        content: Any = None,
+        priority: int = BACKGROUND,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """
+        Send a request and decode the JSON response.
+
+        429s are retried for any request whose body can be replayed, and 5xx
+        gateway errors and connection failures only for idempotent ones, each
+        after a jittered backoff (never sooner than Retry-After) and only
+        while the retry budget allows.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the Jira site URL (e.g. 'rest/api/2/issue/X-1')
+            params: Query parameters
+            json: JSON request body
+            files: Multipart files
+            headers: Extra request headers
+            content: Raw request body (bytes or an async byte stream; streams
+                are never retried)
+            priority: INTERACTIVE for technician-facing calls, BACKGROUND
+                (default) for sync and admin calls
+            idempotent: Override whether the call is safe to repeat (e.g. a
+                POST that only reads); defaults by HTTP method
+
+        Returns:
+            Decoded JSON body, or None for empty responses
+
+        Raises:
+            httpx.HTTPStatusError: If Jira responds with an error status
+            httpx.TransportError: If Jira could not be reached
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        replayable = _replayable(files, content)
+        self.counters["requests"] += 1
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            started = await self.limiter.acquire(priority)
+            try:
+                response = await self._client.request(
+                    method,
+                    "/" + path.lstrip("/"),
+                    params=params,
+                    json=json,
+                    files=files,
+                    headers=headers,
+                    content=content,
+                )
+            except httpx.TransportError as e:
+                self.limiter.release(started)
+                self.counters["transport_errors"] += 1
+                if not (idempotent and replayable and self._may_retry(attempt)):
+                    raise
+                logger.info(f"Retrying {method} {path} after {type(e).__name__}")
+                await asyncio.sleep(backoff_seconds(attempt))
+                continue
+            except BaseException:
+                self.limiter.release(started)
+                raise
+
+            status = response.status_code
+            retry_after = (
+                retry_after_seconds(response.headers) if status in THROTTLE_STATUSES else None
+            )
+            near_limit = response.headers.get("x-ratelimit-nearlimit", "").lower() == "true"
+            self._record_rate_limit(response.headers)
+            self.limiter.release(
+                started, throttled=status in THROTTLE_STATUSES or near_limit, retry_after=retry_after
+            )
+            if status in THROTTLE_STATUSES:
+                self.counters["throttled"] += 1
+
+            if (
+                status in RETRY_STATUSES
+                and replayable
+                and (idempotent or status == 429)
+                and self._may_retry(attempt)
+            ):
+                logger.info(f"Retrying {method} {path} after HTTP {status}")
+                await asyncio.sleep(backoff_seconds(attempt, retry_after))
+                continue
+            break
+
+        response.raise_for_status()
+        if not response.content:
+            return None
+        return response.json()
+
+    def _may_retry(self, attempt: int) -> bool:
+        if attempt > config.JIRA_MAX_RETRIES:
+            return False
+        if not self.retry_budget.withdraw():
+            self.counters["retry_budget_exhausted"] += 1
+            return False
+        self.counters["retries"] += 1
+        return True
+
+    def _record_rate_limit(self, headers: httpx.Headers) -> None:
+        for name in RATE_LIMIT_HEADERS:
+            if name in headers:
+                self._rate_limit[name] = headers[name]
+
+    def stats(self) -> Dict[str, Any]:
+        """Current concurrency limit, queue, retry budget and request counters."""
+        return {
+            "concurrency_limit": int(self.limiter.limit),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.limiter.in_flight,
+            "queued": self.limiter.queued(),
+            "paused_seconds": round(max(0.0, self.limiter.paused_until - time.monotonic()), 3),
+            "retry_budget": round(self.retry_budget.balance, 2),
+            "rate_limit_headers": dict(self._rate_limit),
+            **{
+                name: self.counters[name]
+                for name in (
+                    "requests",
+                    "retries",
+                    "throttled",
+                    "transport_errors",
+                    "retry_budget_exhausted",
+                )
+            },
+        }
+
+    async def get(self, path: str, **kwargs) -> Any:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Any:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> Any:
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> Any:
+        return await self.request("DELETE", path, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self._client.aclose()
@@ -0,0 +1,166 @@
+"""
+Receiving Jira webhook deliveries.
+
+Jira Cloud retries deliveries that were not acknowledged and may send events
+out of order, so every delivery is checked against the shared secret,
+deduplicated by its X-Atlassian-Webhook-Identifier and reduced to the issue
+event the app applies to its ticket cache. Without a secret deliveries are
+refused, unless JIRA_WEBHOOK_ALLOW_UNSIGNED is set (e.g. for local testing).
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Set
+import hashlib
+import hmac
+import logging
+import os
+import time
+
+import config
+
+logger = logging.getLogger(__name__)
+
+ISSUE_CREATED = 'jira:issue_created'
+ISSUE_UPDATED = 'jira:issue_updated'
+ISSUE_DELETED = 'jira:issue_deleted'
+ISSUE_EVENTS = (ISSUE_CREATED, ISSUE_UPDATED, ISSUE_DELETED)
+
+SIGNATURE_HEADER = 'x-hub-signature'
+DELIVERY_ID_HEADER = 'x-atlassian-webhook-identifier'
+
+
+class WebhookEvent(NamedTuple):
+    name: str
+    delivery_id: str
+    issue_key: Optional[str]
+    issue: Optional[Dict[str, Any]]
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    Check a delivery's X-Hub-Signature ("sha256=<hex HMAC of the body>").
+
+    Args:
+        secret: Secret the webhook was registered with
+        body: Raw request body
+        signature: Value of the X-Hub-Signature header
+
+    Returns:
+        True if the signature matches
+    """
+    if not signature:
+        return False
+    method, _, digest = signature.partition('=')
+    if method != 'sha256':
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+def parse_event(payload: Any, headers: Mapping[str, str]) -> WebhookEvent:
+    """
+    Extract the event from a webhook payload.
+
+    Args:
+        payload: Decoded JSON body
+        headers: Request headers
+
+    Returns:
+        The event; issue fields are only set for issue events
+
+    Raises:
+        ValueError: If the payload is not a Jira webhook event
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get('webhookEvent'), str):
+        raise ValueError("Payload is not a Jira webhook event")
+    name = payload['webhookEvent']
+    issue = payload.get('issue')
+    if name in ISSUE_EVENTS and (not isinstance(issue, dict) or not issue.get('key')):
+        raise ValueError(f"'{name}' event has no issue")
+    if not isinstance(issue, dict):
+        issue = None
+
+    delivery_id = headers.get(DELIVERY_ID_HEADER)
+    if not delivery_id:
+        # Older Jira versions do not send a delivery ID; retries of the same
+        # event still share the event timestamp
+        delivery_id = f"{name}:{issue.get('id') if issue else ''}:{payload.get('timestamp')}"
+
+    if name not in ISSUE_EVENTS:
+        return WebhookEvent(name, delivery_id, issue.get('key') if issue else None, None)
+    return WebhookEvent(name, delivery_id, issue['key'], issue)
+
+
+class WebhookReceiver:
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        dedup_size: int = config.JIRA_WEBHOOK_DEDUP_SIZE,
+        allow_unsigned: Optional[bool] = None,
+    ):
+        """
+        Track webhook deliveries.
+
+        Args:
+            secret: Shared secret deliveries must be signed with. Defaults to
+                the JIRA_WEBHOOK_SECRET environment variable.
+            dedup_size: Number of recent delivery IDs to remember
+            allow_unsigned: Accept unsigned deliveries when no secret is set.
+                Defaults to whether the JIRA_WEBHOOK_ALLOW_UNSIGNED environment
+                variable is "true"; otherwise every delivery is refused.
+        """
+        self.secret = secret if secret is not None else os.getenv("JIRA_WEBHOOK_SECRET")
+        if allow_unsigned is None:
+            allow_unsigned = os.getenv("JIRA_WEBHOOK_ALLOW_UNSIGNED", "").lower() == "true"
+        self.allow_unsigned = allow_unsigned
+        if not self.secret:
+            if self.allow_unsigned:
+                logger.warning(
+                    "JIRA_WEBHOOK_SECRET is not set, webhook deliveries will not be verified")
+            else:
+                logger.warning(
+                    "JIRA_WEBHOOK_SECRET is not set, webhook deliveries will be refused")
+        self.dedup_size = dedup_size
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        # Deliveries being applied right now
+        self._in_flight: Set[str] = set()
+        self.last_delivery: Optional[float] = None
+
+    def authenticate(self, body: bytes, headers: Mapping[str, str]) -> bool:
+        """Whether the delivery carries a valid signature (or is allowed unsigned)."""
+        if not self.secret:
+            return self.allow_unsigned
+        return verify_signature(self.secret, body, headers.get(SIGNATURE_HEADER))
+
+    def claim(self, event: WebhookEvent) -> bool:
+        """
+        Start applying a delivery. Follow up with remember() once it was
+        applied, or release() if that failed, so Jira's retry applies it.
+
+        Returns:
+            False if a delivery with this event's ID was already applied or
+            is being applied (a retry that overtook the original)
+        """
+        self.last_delivery = time.monotonic()
+        if event.delivery_id in self._seen or event.delivery_id in self._in_flight:
+            return False
+        self._in_flight.add(event.delivery_id)
+        return True
+
+    def release(self, event: WebhookEvent) -> None:
+        """Give up a claimed delivery without recording it as applied."""
+        self._in_flight.discard(event.delivery_id)
+
+    def remember(self, event: WebhookEvent) -> None:
+        """Record a claimed delivery as applied."""
+        self._in_flight.discard(event.delivery_id)
+        self._seen[event.delivery_id] = None
+        self._seen.move_to_end(event.delivery_id)
+        if len(self._seen) > self.dedup_size:
+            self._seen.popitem(last=False)
+
+    def is_active(self, window_seconds: float) -> bool:
+        """Whether a delivery arrived within the last window_seconds."""
+        return (
+            self.last_delivery is not None
+            and time.monotonic() - self.last_delivery < window_seconds
+        )
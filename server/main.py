@@ -1,15 +1,29 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile, WebSocket
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    WebSocket,
+    Request,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-import logging
+import asyncio
 import json
+import logging
+import time
+from typing import List, Optional, Union
+
+import numpy as np
+from pydantic import ValidationError
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
 import config
 
-from task_assignment import task_assigner
+from task_assignment import task_assigner, AssignmentResult
 from models import (
     JiraTicketListResponse,
+    JiraTicketChangesResponse,
     JiraTicket,
     JiraStatusUpdate,
     JiraComment,
@@ -18,11 +32,14 @@ from models import (
     Server,
     TechnicianEvents,
     FloorUpdate,
-    TechnicianResponse,
 )
-from jira import initialize_jira_client, get_jira_client
+from jira import initialize_jira_client, get_jira_client, close_jira_client, TicketSync
+from jira_webhooks import WebhookReceiver, parse_event, ISSUE_DELETED, ISSUE_EVENTS
 from technician_store import initialize_technician_store, get_technician_store
 from server_store import initialize_server_store, get_server_store
+from response_cache import response_cache
+from connection_manager import connection_manager, TechnicianSession
+from refresh_coordinator import RefreshCoordinator
 from get_server_data import get_server_metrics, get_server_logs
 
 # Set up logging
@@ -30,61 +47,201 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize scheduler
-scheduler = BackgroundScheduler()
-
+scheduler = AsyncIOScheduler()
 
-def refresh_jira_tickets():
-    """Background task to refresh Jira tickets every 15 minutes."""
+# Jira webhook deliveries, and when the ticket poll last ran
+webhook_receiver = WebhookReceiver()
+last_poll: Optional[float] = None
+
+
+def ticket_locations(tickets: List[JiraTicket]) -> np.ndarray:
+    """Resolve each ticket's server coordinates, NaN if the server is unknown."""
+    return get_server_store().get_coordinates(ticket.server_id for ticket in tickets)
+
+
+def apply_ticket_sync(sync: TicketSync):
+    """Push a ticket sync result into the task assigner."""
+    jira_tickets = [JiraTicket(**ticket) for ticket in sync.updated]
+    if sync.full:
+        task_assigner.refresh_tasks(jira_tickets, ticket_locations(jira_tickets))
+        return
+    for key in sync.removed:
+        task_assigner.remove_task(key)
+    for ticket in jira_tickets:
+        upsert_ticket_task(ticket)
+
+
+def upsert_ticket_task(ticket: JiraTicket):
+    """Add or update a single ticket's task, located at its server."""
+    server = (
+        get_server_store().get_server(ticket.server_id) if ticket.server_id else None
+    )
+    task_assigner.upsert_task(ticket, server.location if server else None)
+
+
+class AttachmentTooLarge(Exception):
+    """An upload exceeded config.ATTACHMENT_MAX_BYTES while being read."""
+
+
+def limit_receive(receive, limit: int):
+    """Wrap an ASGI receive callable so it raises once the body exceeds limit bytes."""
+    received = 0
+
+    async def limited():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise AttachmentTooLarge()
+        return message
+
+    return limited
+
+
+def limit_read(read, limit: int):
+    """Wrap an async read(n) callable so it raises once more than limit bytes were read."""
+    total = 0
+
+    async def limited(n: int) -> bytes:
+        nonlocal total
+        chunk = await read(n)
+        total += len(chunk)
+        if total > limit:
+            raise AttachmentTooLarge()
+        return chunk
+
+    return limited
+
+
+def resync_response(version: int, since: int) -> dict:
+    """Delta sync answer for a `since` the change log no longer covers."""
+    return {
+        "version": version,
+        "since": since,
+        "resync": True,
+        "message": "Change log no longer covers this version, resync required",
+    }
+
+
+async def apply_ticket_update(ticket: dict) -> JiraTicket:
+    """
+    Write one freshly fetched ticket into the cache and the task assigner,
+    without syncing the rest of the project.
+
+    Returns:
+        The ticket as a JiraTicket
+    """
+    jira_ticket = JiraTicket(**ticket)
+    # The task follows the cache in the order the cache changed
+    await get_jira_client().apply_ticket(
+        ticket, lambda: asyncio.to_thread(upsert_ticket_task, jira_ticket)
+    )
+    return jira_ticket
+
+
+async def refresh_jira_tickets() -> TicketSync:
+    """
+    Sync Jira tickets and push the changes into the task assigner.
+
+    Only call this through ticket_refresh, which coalesces concurrent requests.
+    """
+    global last_poll
+    last_poll = time.monotonic()
+    logger.info("Running ticket refresh...")
+    client = get_jira_client()
+    # Updating the assignment matrix is CPU-bound; keep it off the event loop.
+    # It runs before any later change to the cache (e.g. from a webhook) is
+    # applied, so the task assigner sees changes in the cache's order
+    sync = await client.sync_tickets(
+        on_synced=lambda sync: asyncio.to_thread(apply_ticket_sync, sync)
+    )
+    logger.info(
+        f"Successfully refreshed tickets ({'full' if sync.full else 'delta'}): "
+        f"{len(sync.updated)} updated, {len(sync.removed)} removed"
+    )
+    return sync
+
+
+# Every ticket refresh goes through here: requests arriving together share one
+ticket_refresh = RefreshCoordinator(refresh_jira_tickets, name="Ticket refresh")
+
+
+async def scheduled_refresh():
+    """
+    Poll Jira every JIRA_POLL_INTERVAL_MINUTES. While webhooks are delivering
+    changes, only poll every JIRA_WEBHOOK_POLL_INTERVAL_MINUTES to reconcile.
+    """
+    reconcile_seconds = config.JIRA_WEBHOOK_POLL_INTERVAL_MINUTES * 60
+    if (
+        webhook_receiver.is_active(reconcile_seconds)
+        and last_poll is not None
+        and time.monotonic() - last_poll < reconcile_seconds
+    ):
+        logger.info("Webhooks are active, skipping scheduled ticket refresh")
+        return
     try:
-        logger.info("Running scheduled ticket refresh...")
-        client = get_jira_client()
-        tickets = client.get_all_tickets()
-        jira_tickets = [JiraTicket(**ticket) for ticket in tickets]
-        task_assigner.refresh_tasks(jira_tickets)
-        logger.info(f"Successfully refreshed {len(tickets)} tickets")
+        await ticket_refresh.request("schedule")
     except Exception as e:
         logger.error(f"Failed to refresh tickets in scheduled task: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Initialize Jira client, technician store, and fetch all tickets
+    # Startup: Initialize the stores first so tickets can be located
+    initialize_technician_store()
+    logger.info("Technician store initialized")
+
+    # Initialize server store with JSON data
+    try:
+        initialize_server_store("server_locations.json")
+        logger.info("Server store initialized with data from server_locations.json")
+    except Exception as e:
+        logger.error(f"Failed to initialize server store: {e}")
+        print(f"Warning: Failed to initialize server store: {e}")
+        initialize_server_store()
+
+    # Solve assignments in the background as tasks and technicians change,
+    # pushing each new result to connected technicians
+    connection_manager.start()
+    task_assigner.add_listener(connection_manager.publish)
+    task_assigner.start()
+
+    # Initialize Jira client and fetch all tickets
     try:
         initialize_jira_client()
-        refresh_jira_tickets()
+        await ticket_refresh.request("startup", debounce=False)
 
         # Start the scheduler
         scheduler.add_job(
-            refresh_jira_tickets,
-            trigger=IntervalTrigger(minutes=15),
+            scheduled_refresh,
+            trigger=IntervalTrigger(minutes=config.JIRA_POLL_INTERVAL_MINUTES),
             id="refresh_jira_tickets",
-            name="Refresh Jira tickets every 15 minutes",
+            name="Refresh Jira tickets",
             replace_existing=True,
         )
         scheduler.start()
-        logger.info("Scheduler started - tickets will refresh every 15 minutes")
+        logger.info(
+            f"Scheduler started - tickets will refresh every "
+            f"{config.JIRA_POLL_INTERVAL_MINUTES} minutes"
+        )
 
     except Exception as e:
         print(f"Warning: Failed to initialize Jira client: {e}")
         print("Server will start but Jira endpoints will not work.")
 
-    # Initialize technician store
-    initialize_technician_store()
-    logger.info("Technician store initialized")
-
-    # Initialize server store with JSON data
-    try:
-        initialize_server_store("server_locations.json")
-        logger.info("Server store initialized with data from server_locations.json")
-    except Exception as e:
-        logger.error(f"Failed to initialize server store: {e}")
-        print(f"Warning: Failed to initialize server store: {e}")
-
     yield
 
-    # Shutdown: stop the scheduler
-    scheduler.shutdown()
-    logger.info("Scheduler stopped")
+    # Shutdown: stop the scheduler, close pooled Jira connections and stop
+    # the solver worker
+    if scheduler.running:
+        scheduler.shutdown()
+        logger.info("Scheduler stopped")
+    await ticket_refresh.close()
+    await close_jira_client()
+    task_assigner.stop()
+    task_assigner.remove_listener(connection_manager.publish)
+    await connection_manager.stop()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -99,7 +256,7 @@ app.add_middleware(
 
 @app.post("/floor_updates")
 def post_distances(floor_update: FloorUpdate):
-    """Receive distances matrix and update task assigner."""
+    """Receive a floor layout and update the task assigner's distances matrix."""
     try:
         server_store = get_server_store()
         for rack_id, location in zip(
@@ -115,6 +272,7 @@ def post_distances(floor_update: FloorUpdate):
                         name=server_id,
                     )
                 )
+                task_assigner.update_server_location(server_id, location)
 
         technician_store = get_technician_store()
         for technician in floor_update.technicians:
@@ -126,36 +284,13 @@ def post_distances(floor_update: FloorUpdate):
                 )
             )
 
-        # Find distance between only taskable servers.
-        taskable_server_ids = set(
-            [t["server_id"] for t in get_jira_client().get_all_tickets()]
-        )
-        distances = []
-        for technician in get_technician_store().get_all_technicians():
-            tech_distances = []
-            for server in [
-                s
-                for s in get_server_store().get_all_servers()
-                if s.id in taskable_server_ids
-            ]:
-                # Euclidean distance + floor distance
-                distance = int(
-                    (
-                        (technician.location.x - server.location.x) ** 2
-                        + (technician.location.y - server.location.y) ** 2
-                    )
-                    ** 0.5
-                    + abs(technician.location.z - server.location.z)
-                    * config.FLOOR_WEIGHT
-                )
-                tech_distances.append(distance)
-            distances.append(tech_distances)
-
-        logger.info(f"Updating distances matrix: {json.dumps(distances)}")
-        logger.info(f"Technicians: {[tech.id for tech in floor_update.technicians]}")
-        task_assigner.update_floor(
-            [tech.id for tech in floor_update.technicians], distances
+        # Recompute every technician row against the assigner's tasks.
+        task_assigner.update_floor(technician_store.get_all_technicians())
+        distances = task_assigner.distances
+        logger.info(
+            f"Updated distances matrix: {distances.shape[0]}x{distances.shape[1]}"
         )
+        logger.info(f"Technicians: {task_assigner.technicians}")
 
         return {
             "message": "Successfully updated distances matrix",
@@ -165,82 +300,87 @@ def post_distances(floor_update: FloorUpdate):
 
 
 # Jira endpoints
-@app.get("/items", response_model=JiraTicketListResponse)
-def get_all_tickets():
-    """Get all Jira tickets that were loaded on startup."""
+@app.get(
+    "/items",
+    response_model=Union[JiraTicketListResponse, JiraTicketChangesResponse],
+)
+def get_all_tickets(
+    request: Request, status: Optional[str] = None, since: Optional[int] = None
+):
+    """
+    Get all Jira tickets that were loaded on startup, optionally by status.
+    With `since` (the `version` of a previous response), only the tickets
+    changed after that version are returned.
+    """
     try:
         client = get_jira_client()
-        tickets = [JiraTicket(**ticket) for ticket in client.tickets]
-        return JiraTicketListResponse(tickets=tickets, count=len(tickets))
-    except RuntimeError as e:
-        raise HTTPException(status_code=503, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get tickets: {str(e)}")
+        if since is not None:
+            changes = client.get_changes_since(since, status)
+            if changes is None:
+                return JiraTicketChangesResponse(
+                    **resync_response(client.version, since)
+                )
+            tickets = [JiraTicket(**ticket) for ticket in changes.tickets]
+            return JiraTicketChangesResponse(
+                version=changes.version,
+                since=since,
+                tickets=tickets,
+                removed=changes.removed,
+                count=len(tickets),
+            )
 
+        version = client.version
 
-@app.get("/items/{ticket_key}", response_model=JiraTicket)
-def get_ticket(ticket_key: str):
-    """Get a specific Jira ticket by its key."""
-    try:
-        client = get_jira_client()
-        ticket = client.get_ticket_by_key(ticket_key)
-        return JiraTicket(**ticket)
+        def render():
+            tickets_data = (
+                client.get_tickets_by_status(status) if status else client.tickets
+            )
+            tickets = [JiraTicket(**ticket) for ticket in tickets_data]
+            return JiraTicketListResponse(
+                tickets=tickets, count=len(tickets), version=version
+            )
+
+        return response_cache.respond(
+            request, f"items?status={(status or '').lower()}", version, render
+        )
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Ticket not found: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get tickets: {str(e)}")
 
 
-@app.get("/items/by-server/{server_id}")
-def get_tickets_by_server(server_id: str):
-    """Get all Jira tickets associated with a specific server ID."""
+@app.get("/items/by-location")
+def get_tickets_by_location(
+    hall: Optional[str] = None,
+    pod: Optional[str] = None,
+    aisle: Optional[str] = None,
+    rack: Optional[str] = None,
+):
+    """Get all Jira tickets on servers in a hall, pod, aisle or rack."""
     try:
         client = get_jira_client()
-        tickets_data = client.get_tickets_by_server_id(server_id)
+        tickets_data = client.get_tickets_by_location(hall, pod, aisle, rack)
         tickets = [JiraTicket(**ticket) for ticket in tickets_data]
         return {
             "tickets": tickets,
             "count": len(tickets),
-            "server_id": server_id,
-            "message": f"Successfully retrieved tickets for server {server_id}",
+            "message": "Successfully retrieved tickets for location",
         }
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Failed to get tickets for server: {str(e)}"
+            status_code=500, detail=f"Failed to get tickets by location: {str(e)}"
         )
 
 
-@app.get("/items/{ticket_key}/server")
-def get_server_from_ticket(ticket_key: str):
-    """Get the server associated with a specific ticket."""
+@app.get("/items/{ticket_key}", response_model=JiraTicket)
+async def get_ticket(ticket_key: str):
+    """Get a specific Jira ticket by its key."""
     try:
-        jira_client = get_jira_client()
-        ticket = jira_client.get_ticket_by_key(ticket_key)
-
-        server_id = ticket.get("server_id")
-        if not server_id:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Ticket {ticket_key} does not have an associated server ID",
-            )
-
-        server_store = get_server_store()
-        server = server_store.get_server(server_id)
-
-        if not server:
-            raise HTTPException(
-                status_code=404, detail=f"Server {server_id} not found in server store"
-            )
-
-        return {
-            "ticket_key": ticket_key,
-            "server": server,
-            "message": f"Successfully retrieved server for ticket {ticket_key}",
-        }
-    except HTTPException:
-        raise
+        client = get_jira_client()
+        ticket = await client.get_ticket_by_key(ticket_key)
+        return JiraTicket(**ticket)
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
@@ -269,11 +409,11 @@ def get_tickets_by_server(server_id: str):
 
 
 @app.get("/items/{ticket_key}/server")
-def get_server_from_ticket(ticket_key: str):
+async def get_server_from_ticket(ticket_key: str):
     """Get the server associated with a specific ticket."""
     try:
         jira_client = get_jira_client()
-        ticket = jira_client.get_ticket_by_key(ticket_key)
+        ticket = await jira_client.get_ticket_by_key(ticket_key)
 
         server_id = ticket.get("server_id")
         if not server_id:
@@ -300,24 +440,24 @@ def get_server_from_ticket(ticket_key: str):
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Failed to get server from ticket: {str(e)}"
-        )
+        raise HTTPException(status_code=404, detail=f"Ticket not found: {str(e)}")
 
 
 @app.put("/items/{ticket_key}/status")
-def update_ticket_status(ticket_key: str, status_update: JiraStatusUpdate):
+async def update_ticket_status(ticket_key: str, status_update: JiraStatusUpdate):
     """Update the status of a Jira ticket."""
     try:
         client = get_jira_client()
-        updated_ticket = client.update_ticket_status(ticket_key, status_update.status)
+        updated_ticket = await client.update_ticket_status(
+            ticket_key, status_update.status
+        )
 
-        # If successful, refresh the tickets
-        refresh_jira_tickets()
+        # Patch just this ticket into the cache instead of re-syncing the project
+        ticket = await apply_ticket_update(updated_ticket)
 
         return {
             "message": f"Successfully updated {ticket_key} to status '{status_update.status}'",
-            "ticket": JiraTicket(**updated_ticket),
+            "ticket": ticket,
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -330,13 +470,13 @@ def update_ticket_status(ticket_key: str, status_update: JiraStatusUpdate):
 
 
 @app.post("/items/{ticket_key}/comments")
-def add_comment(ticket_key: str, comment: JiraComment):
+async def add_comment(ticket_key: str, comment: JiraComment):
     """Add a comment to a Jira ticket."""
     try:
         client = get_jira_client()
-        result = client.add_comment(ticket_key, comment.comment)
-
-        refresh_jira_tickets()
+        # Comments are not cached, so there is nothing to refresh; the next
+        # delta sync picks up the ticket's new updated timestamp
+        result = await client.add_comment(ticket_key, comment.comment)
 
         return {
             "message": f"Successfully added comment to {ticket_key}",
@@ -349,39 +489,138 @@ def add_comment(ticket_key: str, comment: JiraComment):
 
 
 @app.post("/items/{ticket_key}/attachments")
-async def add_attachment(ticket_key: str, file: UploadFile = File(...)):
-    """Add an attachment (image or file) to a Jira ticket."""
-    try:
-        client = get_jira_client()
+async def add_attachment(ticket_key: str, request: Request):
+    """
+    Add an attachment (image or file) to a Jira ticket.
+
+    Expects a multipart/form-data body with the file in the "file" field. The
+    form is parsed here rather than by a File() parameter so the size cap is
+    enforced while the body arrives, not after all of it was spooled to disk.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Attachment exceeds {config.ATTACHMENT_MAX_BYTES} bytes",
+    )
+    body_limit = config.ATTACHMENT_MAX_BYTES + config.ATTACHMENT_FORM_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > body_limit:
+        raise too_large
 
-        # Read file data
-        file_data = await file.read()
+    try:
+        # Spooled to a temporary file (in memory only up to 1 MB), and cut
+        # off as soon as the body outgrows the cap (also for chunked uploads)
+        form = await Request(
+            request.scope, limit_receive(request.receive, body_limit)
+        ).form(max_files=1)
+    except AttachmentTooLarge:
+        raise too_large
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid upload: {str(e)}")
 
-        # Upload to Jira
-        result = client.add_attachment_from_bytes(ticket_key, file_data, file.filename)
+    try:
+        file = form.get("file")
+        if not isinstance(file, StarletteUploadFile):
+            raise HTTPException(status_code=422, detail="Missing file field 'file'")
+        if file.size is not None and file.size > config.ATTACHMENT_MAX_BYTES:
+            raise too_large
 
-        refresh_jira_tickets()
+        client = get_jira_client()
+        # Upload to Jira (attachments are not cached, so no refresh is needed),
+        # aborting if the file turns out larger than its declared size
+        result = await client.add_attachment_stream(
+            ticket_key,
+            limit_read(file.read, config.ATTACHMENT_MAX_BYTES),
+            file.filename,
+            size=file.size,
+            content_type=file.content_type,
+        )
 
         return {
             "message": f"Successfully added attachment '{file.filename}' to {ticket_key}",
             "attachment": result,
         }
+    except AttachmentTooLarge:
+        raise too_large
+    except HTTPException:
+        raise
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to add attachment: {str(e)}"
         )
+    finally:
+        await form.close()
+
+
+@app.post("/webhooks/jira")
+async def receive_jira_webhook(request: Request):
+    """Apply a Jira issue event (created/updated/deleted) to the ticket cache."""
+    body = await request.body()
+    if not webhook_receiver.authenticate(body, request.headers):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        event = parse_event(json.loads(body), request.headers)
+    except ValueError as e:
+        # json.JSONDecodeError is a ValueError too
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not webhook_receiver.claim(event):
+        return {"status": "duplicate", "event": event.name}
+    if event.name not in ISSUE_EVENTS:
+        # Comment events do not change any cached ticket fields
+        webhook_receiver.remember(event)
+        return {"status": "ignored", "event": event.name}
+
+    try:
+        client = get_jira_client()
+        # The task assigner is updated under the cache's lock, so it sees
+        # concurrent deliveries in the order the cache applied them
+        if event.name == ISSUE_DELETED:
+            applied = await client.remove_ticket(
+                event.issue_key,
+                lambda: asyncio.to_thread(task_assigner.remove_task, event.issue_key),
+            )
+        else:
+            ticket = client.parse_issue(event.issue)
+            # Validate before touching the cache so a bad payload changes nothing
+            jira_ticket = JiraTicket(**ticket) if ticket is not None else None
+            applied = ticket is not None and await client.apply_ticket(
+                ticket, lambda: asyncio.to_thread(upsert_ticket_task, jira_ticket)
+            )
+        webhook_receiver.remember(event)
+        logger.info(
+            f"Webhook {event.name} for {event.issue_key}: "
+            f"{'applied' if applied else 'no change'}"
+        )
+        return {
+            "status": "applied" if applied else "ignored",
+            "event": event.name,
+            "ticket_key": event.issue_key,
+        }
+    except RuntimeError as e:
+        webhook_receiver.release(event)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        webhook_receiver.release(event)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to apply webhook event: {str(e)}"
+        )
 
 
 @app.post("/items/refresh-now")
-def manual_refresh():
-    """Manually trigger a ticket refresh (in addition to the automatic 15-minute schedule)."""
+async def manual_refresh():
+    """
+    Manually trigger a ticket refresh (in addition to the automatic schedule).
+
+    Requests made within JIRA_REFRESH_DEBOUNCE_SECONDS of each other share one
+    refresh; each returns once a refresh that started after it was made has
+    finished.
+    """
     try:
         logger.info("Manual ticket refresh triggered")
-        client = get_jira_client()
-        tickets_data = client.get_all_tickets()
-        tickets = [JiraTicket(**ticket) for ticket in tickets_data]
+        await ticket_refresh.request("manual")
+        tickets = [JiraTicket(**ticket) for ticket in get_jira_client().tickets]
         return JiraTicketListResponse(
             tickets=tickets,
             count=len(tickets),
@@ -395,13 +634,30 @@ def manual_refresh():
         )
 
 
+@app.get("/items/refresh/stats")
+def get_refresh_stats():
+    """Ticket refresh requests vs. refreshes actually run."""
+    return ticket_refresh.stats()
+
+
+@app.get("/jira/stats")
+def get_jira_stats():
+    """Jira request concurrency limit, queue, retry budget and throttling counters."""
+    try:
+        return get_jira_client().transport.stats()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 # Technician endpoints
 @app.post("/technicians", response_model=Technician)
 def add_technician(technician: Technician):
     """Add or update a technician in the store."""
     try:
         store = get_technician_store()
-        return store.add_technician(technician)
+        technician = store.add_technician(technician)
+        task_assigner.add_technician(technician.id, technician.location)
+        return technician
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
@@ -411,16 +667,40 @@ def add_technician(technician: Technician):
 
 
 @app.get("/technicians")
-def get_all_technicians():
-    """Get all active technicians."""
+def get_all_technicians(request: Request, since: Optional[int] = None):
+    """
+    Get all active technicians. With `since` (the `version` of a previous
+    response), only the technicians changed after that version are returned.
+    """
     try:
         store = get_technician_store()
-        technicians = store.get_all_technicians()
-        return {
-            "technicians": technicians,
-            "count": len(technicians),
-            "message": "Successfully retrieved all technicians",
-        }
+        if since is not None:
+            changes = store.get_changes_since(since)
+            if changes is None:
+                return resync_response(store.version, since)
+            version, technicians, removed = changes
+            return {
+                "version": version,
+                "since": since,
+                "resync": False,
+                "technicians": technicians,
+                "removed": removed,
+                "count": len(technicians),
+                "message": "Successfully retrieved technician changes",
+            }
+
+        version = store.version
+
+        def render():
+            technicians = store.get_all_technicians()
+            return {
+                "technicians": technicians,
+                "count": len(technicians),
+                "message": "Successfully retrieved all technicians",
+                "version": version,
+            }
+
+        return response_cache.respond(request, "technicians", version, render)
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
@@ -460,6 +740,7 @@ def update_technician_location(technician_id: str, location: Location):
             raise HTTPException(
                 status_code=404, detail=f"Technician {technician_id} not found"
             )
+        task_assigner.update_technician_location(technician_id, location)
         return technician
     except HTTPException:
         raise
@@ -481,6 +762,7 @@ def remove_technician(technician_id: str):
             raise HTTPException(
                 status_code=404, detail=f"Technician {technician_id} not found"
             )
+        task_assigner.remove_technician(technician_id)
         return {
             "message": f"Successfully removed technician {technician_id}",
             "technician_id": technician_id,
@@ -501,7 +783,9 @@ def add_server(server: Server):
     """Add or update a server in the store."""
     try:
         store = get_server_store()
-        return store.add_server(server)
+        server = store.add_server(server)
+        task_assigner.update_server_location(server.id, server.location)
+        return server
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
@@ -509,20 +793,112 @@ def add_server(server: Server):
 
 
 @app.get("/servers")
-def get_all_servers():
-    """Get all servers."""
+def get_all_servers(
+    request: Request,
+    hall: Optional[str] = None,
+    pod: Optional[str] = None,
+    aisle: Optional[str] = None,
+    rack: Optional[str] = None,
+    since: Optional[int] = None,
+):
+    """
+    Get all servers, optionally only those in a hall, pod, aisle or rack.
+    With `since` (the `version` of a previous response), only the servers
+    changed after that version are returned.
+    """
+    try:
+        store = get_server_store()
+        filtered = any(level is not None for level in (hall, pod, aisle, rack))
+        if since is not None:
+            changes = store.get_changes_since(since)
+            if changes is None:
+                return resync_response(store.version, since)
+            version, servers, removed = changes
+            if filtered and servers:
+                in_prefix = {
+                    server.id
+                    for server in store.get_servers_by_prefix(hall, pod, aisle, rack)
+                }
+                servers = [server for server in servers if server.id in in_prefix]
+            return {
+                "version": version,
+                "since": since,
+                "resync": False,
+                "servers": servers,
+                "removed": removed,
+                "count": len(servers),
+                "message": "Successfully retrieved server changes",
+            }
+
+        version = store.version
+
+        def render():
+            if filtered:
+                servers = store.get_servers_by_prefix(hall, pod, aisle, rack)
+            else:
+                servers = store.get_all_servers()
+            return {
+                "servers": servers,
+                "count": len(servers),
+                "message": "Successfully retrieved all servers",
+                "version": version,
+            }
+
+        return response_cache.respond(
+            request, f"servers?{hall}-{pod}-{aisle}-{rack}", version, render
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get servers: {str(e)}")
+
+
+@app.get("/servers/near")
+def get_nearest_servers(x: float, y: float, z: float, k: int = 10):
+    """Get the k servers nearest to a location, nearest first."""
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k must be at least 1")
     try:
         store = get_server_store()
-        servers = store.get_all_servers()
+        nearest = store.get_nearest_servers(Location(x=x, y=y, z=z), k)
         return {
-            "servers": servers,
-            "count": len(servers),
-            "message": "Successfully retrieved all servers",
+            "servers": [
+                {"server": server, "distance": distance}
+                for server, distance in nearest
+            ],
+            "count": len(nearest),
+            "message": f"Successfully retrieved the {len(nearest)} nearest servers",
         }
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get servers: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get nearest servers: {str(e)}"
+        )
+
+
+@app.get("/servers/within")
+def get_servers_within(x: float, y: float, z: float, radius: float):
+    """Get every server within a distance of a location, nearest first."""
+    if radius < 0:
+        raise HTTPException(status_code=400, detail="radius must not be negative")
+    try:
+        store = get_server_store()
+        nearby = store.get_servers_within(Location(x=x, y=y, z=z), radius)
+        return {
+            "servers": [
+                {"server": server, "distance": distance}
+                for server, distance in nearby
+            ],
+            "count": len(nearby),
+            "message": f"Successfully retrieved {len(nearby)} servers within {radius}",
+        }
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get servers within radius: {str(e)}"
+        )
 
 
 @app.get("/servers/{server_id}")
@@ -559,6 +935,7 @@ def update_server_location(server_id: str, location: Location):
         server = store.update_location(server_id, location)
         if server is None:
             raise HTTPException(status_code=404, detail=f"Server {server_id} not found")
+        task_assigner.update_server_location(server_id, location)
         return server
     except HTTPException:
         raise
@@ -578,6 +955,7 @@ def remove_server(server_id: str):
         success = store.remove_server(server_id)
         if not success:
             raise HTTPException(status_code=404, detail=f"Server {server_id} not found")
+        task_assigner.update_server_location(server_id, None)
         return {
             "message": f"Successfully removed server {server_id}",
             "server_id": server_id,
@@ -592,61 +970,65 @@ def remove_server(server_id: str):
         )
 
 
-@app.websocket("/ws/technician")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    while True:
-        data = await websocket.receive_json()
-        try:
-            event = TechnicianEvents(**data)  # Process incoming data as needed
-            logger.info(event)
-            if event.event_type == "online":
-                store = get_technician_store()
-                tech_id = event.payload.id
-                store.add_technician(
-                    Technician(id=tech_id, location=event.payload.location)
-                )
-                task_assigner.add_technician(
-                    tech_id, [float("inf")] * len(task_assigner.tasks)
-                )
-                client = get_jira_client()
-                tickets_data = client.get_all_tickets()
-                tickets = [JiraTicket(**ticket) for ticket in tickets_data]
-                logger.info(tickets)
+def technician_online(technician: Technician) -> AssignmentResult:
+    """
+    Register a technician that came online (or moved) and get its assignment.
+
+    Blocks on the stores' locks and on the background solver, so websocket
+    handlers run it in a worker thread.
 
-                logger.info(task_assigner.technicians)
-                logger.info(task_assigner.tasks)
-                logger.info(task_assigner.distances)
-                logger.info(task_assigner.assign_tasks())
-        except Exception as e:
-            logger.info("Invalid JSON received, ignoring.", e)
-        continue
+    Args:
+        technician: The technician and its current location
+
+    Returns:
+        A result covering the technician's arrival
+    """
+    get_technician_store().add_technician(technician)
+    task_assigner.add_technician(technician.id, technician.location)
+    return task_assigner.current_result(timeout=config.ASSIGNMENT_WAIT_TIMEOUT_SECONDS)
+
+
+async def handle_technician_message(session: TechnicianSession, message: str):
+    """Handle one message from a technician's websocket session."""
+    try:
+        event = TechnicianEvents.model_validate_json(message)
+    except ValidationError as e:
+        logger.info(f"Invalid technician event, ignoring: {e}")
+        return
+    if event.event_type == "pong":
+        # Liveness was recorded on receipt; from now on the heartbeat
+        # expects this client to keep answering
+        session.answers_pings = True
+        return
+    if event.payload is None:
+        return
+
+    # From now on the connection manager pushes this technician's
+    # assignment whenever it changes
+    tech_id = event.payload.id
+    connection_manager.bind(session, tech_id)
+
+    # Only message handling stays on the event loop
+    try:
+        result = await asyncio.to_thread(technician_online, event.payload)
+    except Exception as e:
+        logger.error(f"Failed to assign technician {tech_id}: {e}")
+        return
+    # Skipped if a broadcast already queued this result or a newer one
+    connection_manager.send_assignment(tech_id, result)
 
 
 @app.websocket("/ws/technician")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    while True:
-        data = await websocket.receive_json()
-        logger.info(data)
-        try:
-            event = TechnicianEvents(**data)  # Process incoming data as needed
-            logger.info(event)
-            if event.event_type == "online":
-                store = get_technician_store()
-                tech_id = event.payload.id
-
-                if store.get_technician(tech_id) is None:
-                    return
-
-                assignments = task_assigner.assign_tasks()
-                logger.info(assignments)
-                if tech_id in assignments:
-                    response = TechnicianResponse(
-                        event_type="assignment", payload=assignments[tech_id]
-                    )
-                    await websocket.send_json(response.dict())
-                    logger.info("Sending back assignment: ", response)
-        except Exception as e:
-            logger.info("Invalid JSON received, ignoring.", data, e)
-        continue
+    session = connection_manager.open(websocket)
+    try:
+        await session.serve(handle_technician_message)
+    finally:
+        connection_manager.remove(session)
+
+
+@app.get("/ws/technician/metrics")
+def get_websocket_metrics():
+    """Technician websocket sessions, send queue depths and message counters."""
+    return connection_manager.metrics()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Literal
 
 
@@ -33,6 +33,10 @@ class Server(BaseModel):
 
 # Jira-related models
 class JiraTicket(BaseModel):
+    # Frozen so the task assigner and its snapshots can share ticket objects
+    # instead of copying them
+    model_config = ConfigDict(frozen=True)
+
     key: Optional[str] = None
     id: Optional[str] = None
     summary: Optional[str] = None
@@ -57,6 +61,23 @@ class JiraTicketListResponse(BaseModel):
     tickets: List[JiraTicket]
     count: int
     message: str = "Successfully retrieved Jira tickets"
+    version: Optional[int] = Field(
+        default=None,
+        description="Version of the ticket cache; pass as `since` to fetch only later changes",
+    )
+
+
+class JiraTicketChangesResponse(BaseModel):
+    version: int = Field(description="Current version of the ticket cache")
+    since: int = Field(description="Version the changes are relative to")
+    resync: bool = Field(
+        default=False,
+        description="True if `since` is too old; re-fetch the full list without `since`",
+    )
+    tickets: List[JiraTicket] = Field(default=[], description="Tickets added or changed")
+    removed: List[str] = Field(default=[], description="Keys of tickets removed")
+    count: int = 0
+    message: str = "Successfully retrieved ticket changes"
 
 
 class JiraStatusUpdate(BaseModel):
@@ -68,10 +89,14 @@ class JiraComment(BaseModel):
 
 
 class TechnicianEvents(BaseModel):
-    event_type: Literal["online"]
+    # "pong" answers the server's "ping"; it carries no payload. A client
+    # that has sent one is disconnected if it later stops answering
+    event_type: Literal["online", "pong"]
     payload: Optional[Technician] = None
 
 
 class TechnicianResponse(BaseModel):
-    event_type: Literal["assignment"]
-    payload: JiraTicket
+    # "unassigned" tells a technician its previous assignment was withdrawn;
+    # "ping" asks for a "pong" to show the connection is alive
+    event_type: Literal["assignment", "unassigned", "ping"]
+    payload: Optional[JiraTicket] = None
@@ -0,0 +1,128 @@
+"""
+Debounced, coalescing refreshes.
+
+Ticket refreshes are requested by the scheduler, by POST /items/refresh-now
+and at startup. A RefreshCoordinator turns any number of requests into at most
+one refresh in flight plus one waiting to start: requests that arrive while a
+refresh is waiting (for the debounce window, or for the one in flight to
+finish) join it, so callers that await a request always get a refresh that
+started after they asked.
+"""
+from collections import Counter
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import logging
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshCoordinator:
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[Any]],
+        window_seconds: float = config.JIRA_REFRESH_DEBOUNCE_SECONDS,
+        name: str = "refresh",
+    ):
+        """
+        Coordinate calls to a refresh coroutine.
+
+        Args:
+            refresh: Coroutine function doing one refresh
+            window_seconds: How long a requested refresh waits for more
+                requests to join it before starting
+            name: Used in log messages
+        """
+        self._refresh = refresh
+        self.window_seconds = window_seconds
+        self.name = name
+        # Result of the refresh that has not started yet, if any
+        self._pending: Optional[asyncio.Future] = None
+        self._tasks: set = set()
+        # Held while a refresh runs
+        self._running = asyncio.Lock()
+        self.counters: Counter = Counter()
+
+    def trigger(self, reason: str = "", debounce: bool = True) -> asyncio.Future:
+        """
+        Ask for a refresh that starts after this call.
+
+        Args:
+            reason: Recorded in the counters (e.g. "schedule", "manual")
+            debounce: Wait window_seconds for other requests before starting;
+                ignored when joining a refresh that is already waiting
+
+        Returns:
+            Future resolved with the refresh's result (or its exception)
+        """
+        self.counters["triggers"] += 1
+        if reason:
+            self.counters[f"triggers_{reason}"] += 1
+        if self._pending is not None:
+            self.counters["coalesced"] += 1
+            return self._pending
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Triggers nobody awaits must not log "exception was never retrieved"
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending = future
+        task = loop.create_task(self._run(future, debounce))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return future
+
+    async def request(self, reason: str = "", debounce: bool = True) -> Any:
+        """Trigger a refresh and wait for it; see trigger()."""
+        # Shielded so a caller giving up doesn't cancel everyone else's refresh
+        return await asyncio.shield(self.trigger(reason, debounce))
+
+    async def _run(self, future: asyncio.Future, debounce: bool) -> None:
+        try:
+            if debounce:
+                await asyncio.sleep(self.window_seconds)
+            async with self._running:
+                # Requests from here on need a refresh that starts later
+                self._pending = None
+                self.counters["refreshes"] += 1
+                try:
+                    result = await self._refresh()
+                except Exception as e:
+                    self.counters["failures"] += 1
+                    logger.error(f"{self.name} failed: {e}")
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        except asyncio.CancelledError:
+            if self._pending is future:
+                self._pending = None
+            future.cancel()
+            raise
+
+    async def close(self) -> None:
+        """Cancel waiting and running refreshes."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # A task cancelled before its first step never runs _run's cleanup
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    def stats(self) -> dict:
+        """Counts of refresh requests (overall and by reason) and of actual refreshes."""
+        return {
+            "window_seconds": self.window_seconds,
+            "pending": self._pending is not None,
+            "running": self._running.locked(),
+            "triggers": self.counters["triggers"],
+            "coalesced": self.counters["coalesced"],
+            "refreshes": self.counters["refreshes"],
+            "failures": self.counters["failures"],
+            "triggers_by_reason": {
+                name.removeprefix("triggers_"): count
+                for name, count in self.counters.items()
+                if name.startswith("triggers_")
+            },
+        }
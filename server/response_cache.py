@@ -0,0 +1,155 @@
+"""
+Pre-serialized, versioned JSON responses.
+
+The ticket cache and the server and technician stores carry a version number
+that changes on every write. List endpoints render each version once, keep
+the encoded (and gzip-compressed) body, and send it with an ETag derived from
+the version, so polling clients get a 304 while nothing has changed and a
+ready-made body otherwise.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+import gzip
+import json
+import secrets
+import threading
+import zlib
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+import config
+
+# Versions start at the boot time in microseconds (change_log.initial_version),
+# but a clock stepped back or several worker processes behind one address can
+# still hand out the same version for different data; the boot ID keeps an
+# ETag from another process from matching a different body
+BOOT_ID = secrets.token_hex(4)
+
+
+class RenderedBody(NamedTuple):
+    etag: str
+    body: bytes
+    gzip_body: Optional[bytes]
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same representation
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def render_json(content: Any) -> bytes:
+    """Encode content the way FastAPI's JSONResponse does."""
+    if isinstance(content, BaseModel):
+        # Pydantic's serializer gives the same bytes far faster than
+        # jsonable_encoder for large models
+        return content.model_dump_json().encode("utf-8")
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = config.RESPONSE_CACHE_MAX_ENTRIES,
+        gzip_min_bytes: int = config.RESPONSE_GZIP_MIN_BYTES,
+    ):
+        """
+        Cache rendered bodies, one per (key, version).
+
+        Args:
+            max_entries: Number of keys (endpoint + query) to keep bodies for
+            gzip_min_bytes: Only pre-compress bodies at least this large
+        """
+        self.max_entries = max_entries
+        self.gzip_min_bytes = gzip_min_bytes
+        self._entries: "OrderedDict[str, Tuple[int, RenderedBody]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._render_locks: Dict[str, threading.Lock] = {}
+
+    def _cached(self, key: str, version: int) -> Optional[RenderedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+            return None
+
+    def _rendered(self, key: str, version: int, etag: str, render: Callable[[], Any]) -> RenderedBody:
+        rendered = self._cached(key, version)
+        if rendered is not None:
+            return rendered
+
+        # One render per key at a time: clients polling right after a change
+        # wait for the first render instead of each repeating it
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+        with render_lock:
+            rendered = self._cached(key, version)
+            if rendered is not None:
+                return rendered
+            body = render_json(render())
+            gzip_body = (
+                gzip.compress(body, compresslevel=6, mtime=0)
+                if len(body) >= self.gzip_min_bytes
+                else None
+            )
+            rendered = RenderedBody(etag, body, gzip_body)
+            with self._lock:
+                self._entries[key] = (version, rendered)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._render_locks.pop(evicted, None)
+        return rendered
+
+    def respond(self, request: Request, key: str, version: int, render: Callable[[], Any]) -> Response:
+        """
+        Answer a GET from the cached body for this version.
+
+        Read the version before rendering: a body rendered from newer data
+        than its version only costs clients one extra download, while the
+        reverse would pin stale data to a version.
+
+        Args:
+            request: The incoming request (for If-None-Match/Accept-Encoding)
+            key: Identifies the endpoint and query (e.g. "items?status=done")
+            version: Version of the data the response is built from
+            render: Builds the response content; only called on a cache miss
+
+        Returns:
+            304 if the client's ETag is current, otherwise the JSON body,
+            gzip-encoded when the client accepts it
+        """
+        etag = f'W/"{BOOT_ID}-{zlib.crc32(key.encode()):08x}-{version}"'
+        headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        rendered = self._rendered(key, version, etag, render)
+        if rendered.gzip_body is not None and _accepts_gzip(request.headers.get("accept-encoding")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(rendered.gzip_body, media_type="application/json", headers=headers)
+        return Response(rendered.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
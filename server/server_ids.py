@@ -0,0 +1,165 @@
+"""
+Parsed server IDs and a prefix index over them.
+
+Server IDs follow the Hall-Pod-Aisle-Rack-U# format (for example
+"01-02-03-04-U5"); rack IDs are the same without the unit. IDs are split on
+"-" into interned components so that every server in a hall, pod, aisle or
+rack can be looked up in time proportional to the result.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import sys
+
+LEVELS = ("hall", "pod", "aisle", "rack", "unit")
+SEPARATOR = "-"
+
+ServerPath = Tuple[str, ...]
+
+
+def parse_server_id(server_id: str) -> ServerPath:
+    """
+    Split a server or rack ID into its interned components.
+
+    Args:
+        server_id: ID in Hall-Pod-Aisle-Rack-U# format (or any prefix of it)
+
+    Returns:
+        Tuple of (hall, pod, aisle, rack, unit) components, as many as the ID has
+    """
+    return tuple(sys.intern(part.strip()) for part in server_id.split(SEPARATOR))
+
+
+def prefix_from_levels(
+    hall: Optional[str] = None,
+    pod: Optional[str] = None,
+    aisle: Optional[str] = None,
+    rack: Optional[str] = None,
+    unit: Optional[str] = None,
+) -> Tuple[Optional[str], ...]:
+    """
+    Build a query prefix from named levels, trimming unset trailing levels.
+
+    Returns:
+        Tuple of components where None matches any value at that level
+    """
+    prefix = [hall, pod, aisle, rack, unit]
+    while prefix and prefix[-1] is None:
+        prefix.pop()
+    return tuple(prefix)
+
+
+class _Node:
+    __slots__ = ("children", "ids", "members")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # Values whose ID ends exactly at this node
+        self.ids: Set[str] = set()
+        # Values whose ID is at or below this node
+        self.members: Set[str] = set()
+
+
+class PrefixIndex:
+    """
+    Trie over parsed server IDs.
+
+    Each entry is a (server ID, value) pair, e.g. a server ID mapped to itself
+    or to the key of a ticket on that server. Every node keeps the set of
+    values in its subtree, so a hall/pod/aisle/rack lookup copies an
+    existing set instead of walking the subtree.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._paths: Dict[str, ServerPath] = {}
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def add(self, server_id: str, value: str) -> None:
+        """
+        Index a value under a server ID, replacing any previous entry for it.
+
+        Args:
+            server_id: Server or rack ID the value belongs to
+            value: Value to index (must be unique across the index)
+        """
+        self.discard(value)
+        path = parse_server_id(server_id)
+        self._paths[value] = path
+        node = self._root
+        node.members.add(value)
+        for part in path:
+            node = node.children.setdefault(part, _Node())
+            node.members.add(value)
+        node.ids.add(value)
+
+    def discard(self, value: str) -> bool:
+        """
+        Remove a value from the index.
+
+        Returns:
+            True if the value was indexed, False otherwise
+        """
+        path = self._paths.pop(value, None)
+        if path is None:
+            return False
+        nodes = [self._root]
+        for part in path:
+            nodes.append(nodes[-1].children[part])
+        nodes[-1].ids.discard(value)
+        for node in nodes:
+            node.members.discard(value)
+        # Prune branches that no longer hold anything
+        for parent, part, node in zip(reversed(nodes[:-1]), reversed(path), reversed(nodes[1:])):
+            if node.members:
+                break
+            del parent.children[part]
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._root = _Node()
+        self._paths.clear()
+
+    def exact(self, server_id: str) -> Set[str]:
+        """
+        Get the values indexed under exactly this server ID.
+
+        Returns:
+            Set of values (a copy, safe to use while the index changes)
+        """
+        node = self._find(parse_server_id(server_id))
+        return set(node.ids) if node is not None else set()
+
+    def find(self, prefix: Iterable[Optional[str]]) -> Set[str]:
+        """
+        Get every value whose server ID starts with the given components.
+
+        Args:
+            prefix: Components from the hall down; None matches any value at
+                that level (which fans out over that level's children)
+
+        Returns:
+            Set of values (a copy, safe to use while the index changes)
+        """
+        nodes: List[_Node] = [self._root]
+        for part in prefix:
+            if part is None:
+                nodes = [child for node in nodes for child in node.children.values()]
+            else:
+                nodes = [
+                    node.children[part] for node in nodes if part in node.children
+                ]
+            if not nodes:
+                return set()
+        if len(nodes) == 1:
+            return set(nodes[0].members)
+        return set().union(*(node.members for node in nodes))
+
+    def _find(self, path: ServerPath) -> Optional[_Node]:
+        node = self._root
+        for part in path:
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
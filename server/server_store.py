@@ -1,8 +1,15 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import json
 import logging
+import threading
 from pathlib import Path
+
+import numpy as np
+
+from change_log import ChangeLog
 from models import Server, Location
+from server_ids import PrefixIndex, prefix_from_levels
+from spatial_index import SpatialIndex
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +17,14 @@ logger = logging.getLogger(__name__)
 class ServerStore:
     def __init__(self, json_file_path: Optional[str] = None):
         self._servers: Dict[str, Server] = {}
+        self._index = SpatialIndex()
+        self._prefix_index = PrefixIndex()
+        # Guards the servers and their indexes, which sync endpoints read and
+        # write from FastAPI's threadpool
+        self.lock = threading.Lock()
+        # Server IDs changed at each version, for versioned responses and
+        # delta sync
+        self.changes = ChangeLog()
         if json_file_path:
             self._load_from_json(json_file_path)
 
@@ -38,6 +53,9 @@ class ServerStore:
                     location=location
                 )
                 self._servers[server.id] = server
+                self._index.insert(server.id, location)
+                self._prefix_index.add(server.id, server.id)
+            self.changes.reset()
 
             logger.info(
                 f"Loaded {len(self._servers)} servers from {json_file_path}")
@@ -55,10 +73,14 @@ class ServerStore:
         Returns:
             The added/updated server
         """
-        self._servers[server.id] = server
-        logger.info(
-            f"Server {server.id} ({server.name}) added/updated at location ({server.location.x}, {server.location.y}, {server.location.z})")
-        return server
+        with self.lock:
+            self._servers[server.id] = server
+            self._index.insert(server.id, server.location)
+            self._prefix_index.add(server.id, server.id)
+            self.changes.record([server.id])
+            logger.info(
+                f"Server {server.id} ({server.name}) added/updated at location ({server.location.x}, {server.location.y}, {server.location.z})")
+            return server
 
     def remove_server(self, server_id: str) -> bool:
         """
@@ -70,11 +92,15 @@ class ServerStore:
         Returns:
             True if server was removed, False if not found
         """
-        if server_id in self._servers:
-            del self._servers[server_id]
-            logger.info(f"Server {server_id} removed from store")
-            return True
-        return False
+        with self.lock:
+            if server_id in self._servers:
+                del self._servers[server_id]
+                self._index.remove(server_id)
+                self._prefix_index.discard(server_id)
+                self.changes.record(removed=[server_id])
+                logger.info(f"Server {server_id} removed from store")
+                return True
+            return False
 
     def get_server(self, server_id: str) -> Optional[Server]:
         """
@@ -86,7 +112,8 @@ class ServerStore:
         Returns:
             Server object if found, None otherwise
         """
-        return self._servers.get(server_id)
+        with self.lock:
+            return self._servers.get(server_id)
 
     def get_all_servers(self) -> List[Server]:
         """
@@ -95,7 +122,8 @@ class ServerStore:
         Returns:
             List of all servers
         """
-        return list(self._servers.values())
+        with self.lock:
+            return list(self._servers.values())
 
     def update_location(self, server_id: str, location: Location) -> Optional[Server]:
         """
@@ -108,12 +136,120 @@ class ServerStore:
         Returns:
             Updated server if found, None otherwise
         """
-        if server_id in self._servers:
-            self._servers[server_id].location = location
-            logger.info(
-                f"Server {server_id} location updated to ({location.x}, {location.y}, {location.z})")
-            return self._servers[server_id]
-        return None
+        with self.lock:
+            if server_id in self._servers:
+                self._servers[server_id].location = location
+                self._index.insert(server_id, location)
+                self.changes.record([server_id])
+                logger.info(
+                    f"Server {server_id} location updated to ({location.x}, {location.y}, {location.z})")
+                return self._servers[server_id]
+            return None
+
+    def get_servers_by_prefix(
+        self,
+        hall: Optional[str] = None,
+        pod: Optional[str] = None,
+        aisle: Optional[str] = None,
+        rack: Optional[str] = None,
+        unit: Optional[str] = None,
+    ) -> List[Server]:
+        """
+        Get every server in a hall, pod, aisle or rack.
+
+        Args:
+            hall: Hall component of the server ID
+            pod: Pod component of the server ID
+            aisle: Aisle component of the server ID
+            rack: Rack component of the server ID
+            unit: Unit component of the server ID (e.g. "U3")
+
+        Returns:
+            Matching servers ordered by ID. Unset levels match anything.
+        """
+        prefix = prefix_from_levels(hall, pod, aisle, rack, unit)
+        with self.lock:
+            return [
+                self._servers[server_id]
+                for server_id in sorted(self._prefix_index.find(prefix))
+            ]
+
+    def get_nearest_servers(
+        self, location: Location, k: int
+    ) -> List[Tuple[Server, int]]:
+        """
+        Get the k servers nearest to a location.
+
+        Args:
+            location: Location to search from
+            k: Maximum number of servers to return
+
+        Returns:
+            (server, distance) pairs, nearest first
+        """
+        with self.lock:
+            return [
+                (self._servers[server_id], distance)
+                for server_id, distance in self._index.nearest(location, k)
+            ]
+
+    def get_servers_within(
+        self, location: Location, radius: float
+    ) -> List[Tuple[Server, int]]:
+        """
+        Get every server within a distance of a location.
+
+        Args:
+            location: Location to search from
+            radius: Maximum distance (inclusive)
+
+        Returns:
+            (server, distance) pairs, nearest first
+        """
+        with self.lock:
+            return [
+                (self._servers[server_id], distance)
+                for server_id, distance in self._index.within_radius(location, radius)
+            ]
+
+    def get_coordinates(self, server_ids: Iterable[Optional[str]]) -> np.ndarray:
+        """
+        Get server coordinates as an array for the distance engine.
+
+        Args:
+            server_ids: Server IDs; unknown IDs and None become rows of NaNs
+
+        Returns:
+            (N, 3) float array of x, y, z aligned with server_ids
+        """
+        with self.lock:
+            return self._index.coordinates(server_ids)
+
+    @property
+    def version(self) -> int:
+        """Version of the stored servers; changes whenever they do."""
+        return self.changes.version
+
+    def get_changes_since(self, since: int) -> Optional[Tuple[int, List[Server], List[str]]]:
+        """
+        Get the servers that changed after a version of the store.
+
+        Args:
+            since: Version from the client's previous response
+
+        Returns:
+            The current version, the changed servers and the removed server
+            IDs, or None if the change log no longer covers `since`
+        """
+        with self.lock:
+            version = self.changes.version
+            changes = self.changes.changes_since(since, version)
+            if changes is None:
+                return None
+            servers = [self._servers.get(server_id) for server_id in changes.upserted]
+            removed = changes.removed + [
+                server_id for server_id, server in zip(changes.upserted, servers) if server is None]
+            return version, [server for server in servers if server is not None], removed
 
     def get_server_count(self) -> int:
         """
@@ -122,14 +258,19 @@ class ServerStore:
         Returns:
             Number of servers
         """
-        return len(self._servers)
+        with self.lock:
+            return len(self._servers)
 
     def clear_all(self) -> None:
         """
         Clear all servers from the store.
         """
-        self._servers.clear()
-        logger.info("All servers cleared from store")
+        with self.lock:
+            self._servers.clear()
+            self._index.clear()
+            self._prefix_index.clear()
+            self.changes.reset()
+            logger.info("All servers cleared from store")
 
 
 # Global server store instance
@@ -0,0 +1,251 @@
+"""
+Per-floor grid index over point locations.
+
+Points are bucketed by floor (Location.z) and then by square (x, y) grid cell,
+so nearest-k and within-radius queries only look at the cells around the query
+point instead of scanning every point. Distances use the same metric as
+distance_engine: planar Euclidean distance plus the floor difference scaled by
+config.FLOOR_WEIGHT, truncated to an integer.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+
+import numpy as np
+
+import config
+from distance_engine import compute_distance_matrix, location_to_tuple
+from models import Location
+
+Cell = Tuple[int, int]
+
+
+class _Floor:
+    """Grid buckets for the points on one floor."""
+
+    def __init__(self):
+        self.cells: Dict[Cell, Set[str]] = {}
+        # Bounding box of occupied cells; only grows, which keeps it a safe
+        # bound for ring searches after removals.
+        self.min_cell: Optional[Cell] = None
+        self.max_cell: Optional[Cell] = None
+
+    def add(self, cell: Cell, point_id: str) -> None:
+        self.cells.setdefault(cell, set()).add(point_id)
+        if self.min_cell is None:
+            self.min_cell = self.max_cell = cell
+            return
+        self.min_cell = (min(self.min_cell[0], cell[0]), min(self.min_cell[1], cell[1]))
+        self.max_cell = (max(self.max_cell[0], cell[0]), max(self.max_cell[1], cell[1]))
+
+    def discard(self, cell: Cell, point_id: str) -> None:
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            return
+        bucket.discard(point_id)
+        if not bucket:
+            del self.cells[cell]
+
+    def max_ring(self, center: Cell) -> int:
+        """Largest ring around center that can still contain occupied cells."""
+        if self.min_cell is None:
+            return -1
+        return max(
+            center[0] - self.min_cell[0],
+            self.max_cell[0] - center[0],
+            center[1] - self.min_cell[1],
+            self.max_cell[1] - center[1],
+        )
+
+    def ring(self, center: Cell, radius: int) -> Iterable[str]:
+        """IDs in the cells at Chebyshev distance exactly radius from center."""
+        cx, cy = center
+        if radius == 0:
+            yield from self.cells.get(center, ())
+            return
+        for dx in range(-radius, radius + 1):
+            for dy in (-radius, radius):
+                yield from self.cells.get((cx + dx, cy + dy), ())
+        for dy in range(-radius + 1, radius):
+            for dx in (-radius, radius):
+                yield from self.cells.get((cx + dx, cy + dy), ())
+
+
+class SpatialIndex:
+    """
+    Floor-bucketed grid index supporting nearest-k and within-radius queries.
+
+    Insert, move and remove are O(1). A query only visits the grid cells that
+    can hold a point closer than the current answer.
+    """
+
+    def __init__(
+        self,
+        cell_size: float = config.SPATIAL_INDEX_CELL_SIZE,
+        floor_weight: float = config.FLOOR_WEIGHT,
+    ):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.floor_weight = floor_weight
+        self._points: Dict[str, Tuple[float, float, float]] = {}
+        self._floors: Dict[float, _Floor] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, point_id: str) -> bool:
+        return point_id in self._points
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, point_id: str, location: Location) -> None:
+        """
+        Add a point or move an existing one.
+
+        Args:
+            point_id: ID of the point
+            location: Location of the point
+        """
+        self.remove(point_id)
+        point = location_to_tuple(location)
+        self._points[point_id] = point
+        floor = self._floors.setdefault(point[2], _Floor())
+        floor.add(self._cell(point[0], point[1]), point_id)
+
+    def remove(self, point_id: str) -> bool:
+        """
+        Remove a point.
+
+        Returns:
+            True if the point was removed, False if not found
+        """
+        point = self._points.pop(point_id, None)
+        if point is None:
+            return False
+        floor = self._floors[point[2]]
+        floor.discard(self._cell(point[0], point[1]), point_id)
+        if not floor.cells:
+            del self._floors[point[2]]
+        return True
+
+    def clear(self) -> None:
+        """Remove every point."""
+        self._points.clear()
+        self._floors.clear()
+
+    def coordinates(self, point_ids: Iterable[Optional[str]]) -> np.ndarray:
+        """
+        Look up the (x, y, z) coordinates of the given points.
+
+        Args:
+            point_ids: Point IDs; unknown IDs and None become rows of NaNs
+
+        Returns:
+            (N, 3) float array aligned with point_ids, ready for
+            distance_engine.compute_distance_matrix
+        """
+        unknown = (np.nan, np.nan, np.nan)
+        coords = np.array(
+            [self._points.get(pid, unknown) for pid in point_ids], dtype=np.float64
+        )
+        return coords.reshape(-1, 3)
+
+    def _distance(self, location: Location, point: Tuple[float, float, float]) -> int:
+        # Same operation order as compute_distance_matrix so truncation matches.
+        dx = location.x - point[0]
+        dy = location.y - point[1]
+        return int(
+            math.sqrt(dx * dx + dy * dy) + abs(location.z - point[2]) * self.floor_weight
+        )
+
+    def _distances(
+        self, location: Location, point_ids: List[str]
+    ) -> np.ndarray:
+        return compute_distance_matrix(
+            np.array([location_to_tuple(location)]),
+            self.coordinates(point_ids),
+            self.floor_weight,
+        )[0]
+
+    def within_radius(
+        self, location: Location, radius: float
+    ) -> List[Tuple[str, int]]:
+        """
+        Find every point within radius of a location.
+
+        Args:
+            location: Query location
+            radius: Maximum distance (inclusive)
+
+        Returns:
+            (point ID, distance) pairs, nearest first
+        """
+        # Distances are truncated, so anything closer than floor(radius) + 1
+        # still counts as within radius.
+        reach = math.floor(radius) + 1
+        candidates = []
+        for z, floor in self._floors.items():
+            planar = reach - abs(location.z - z) * self.floor_weight
+            if planar <= 0:
+                continue
+            low = self._cell(location.x - planar, location.y - planar)
+            high = self._cell(location.x + planar, location.y + planar)
+            for cx in range(max(low[0], floor.min_cell[0]), min(high[0], floor.max_cell[0]) + 1):
+                for cy in range(max(low[1], floor.min_cell[1]), min(high[1], floor.max_cell[1]) + 1):
+                    candidates.extend(floor.cells.get((cx, cy), ()))
+
+        if not candidates:
+            return []
+        distances = self._distances(location, candidates)
+        keep = np.flatnonzero(distances <= radius)
+        keep = keep[np.argsort(distances[keep], kind="stable")]
+        return [(candidates[i], int(distances[i])) for i in keep]
+
+    def nearest(self, location: Location, k: int) -> List[Tuple[str, int]]:
+        """
+        Find the k points nearest to a location.
+
+        Rings of grid cells are visited outward on every floor in order of
+        the smallest distance they could contain, and the search stops once
+        that bound exceeds the k-th best distance found.
+
+        Args:
+            location: Query location
+            k: Number of points to return
+
+        Returns:
+            Up to k (point ID, distance) pairs, nearest first
+        """
+        if k <= 0:
+            return []
+        center = self._cell(location.x, location.y)
+        # (lower bound on distance, floor z, ring)
+        frontier = [
+            (abs(location.z - z) * self.floor_weight, z, 0) for z in self._floors
+        ]
+        heapq.heapify(frontier)
+        # Max-heap of the best k as (-distance, id)
+        best: List[Tuple[int, str]] = []
+
+        while frontier:
+            bound, z, ring = heapq.heappop(frontier)
+            # Distances are truncated, so a bound of worst + 1 cannot improve.
+            if len(best) == k and bound >= -best[0][0] + 1:
+                break
+            floor = self._floors[z]
+            for point_id in floor.ring(center, ring):
+                distance = self._distance(location, self._points[point_id])
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, point_id))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, point_id))
+            if ring < floor.max_ring(center):
+                # Cells in ring r + 1 are at least r full cells away.
+                floor_penalty = abs(location.z - z) * self.floor_weight
+                heapq.heappush(
+                    frontier, (floor_penalty + ring * self.cell_size, z, ring + 1)
+                )
+
+        return sorted(((pid, -neg) for neg, pid in best), key=lambda item: item[1])
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from ortools.graph.python import min_cost_flow
+from scipy.optimize import linear_sum_assignment
 import numpy as np
 import threading
-import copy
 import logging
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import AbstractSet, Callable, Mapping, NamedTuple
 
 import config
 import models
+from distance_engine import DistanceEngine, MAX_BLOCK_CELLS
+from incremental_assignment import IncrementalAssignmentSolver
 
 # # Sample Data
 # technicians = ["T1", "T2", "T3"]
@@ -29,79 +34,431 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class AssignmentSnapshot(NamedTuple):
+    """
+    Immutable (technicians, tasks, distances) state of a TaskAssigner.
+
+    Nothing is copied to build one: the tickets are frozen models, the task
+    mapping and distance matrix are read-only views, and the assigner copies
+    its own dict/matrix before the next write after a snapshot was taken.
+    """
+
+    technician_ids: tuple[str, ...]
+    task_ids: tuple[str, ...]
+    # Task key -> ticket
+    tasks: Mapping[str, models.JiraTicket]
+    # Read-only (T, S) distances, rows/columns in the order of the IDs above
+    distances: np.ndarray
+
+
+class AssignmentResult(NamedTuple):
+    """An immutable, published assignment."""
+
+    # State generation the assignment was solved for (see TaskAssigner)
+    generation: int
+    # Technician ID -> assigned ticket (read-only)
+    assignments: Mapping[str, models.JiraTicket]
+    solver: str | None
+
+
 class TaskAssigner:
+    """
+    Assigns open tasks to technicians.
+
+    The assigner owns a persistent technician-by-task distance matrix (rows are
+    technicians, columns are tasks located at their ticket's server). Location
+    changes update a single row or column of that matrix, are recorded as
+    dirty and bump the state generation. Solving (with the backend chosen by
+    config.ASSIGNMENT_BACKEND, see select_solver) works on a snapshot outside
+    the state lock: once start() is called a background worker re-solves after
+    every batch of changes and publishes an AssignmentResult that latest()
+    returns without locking; otherwise assign_tasks() solves on demand.
+    """
+
     def __init__(
         self,
-        technicians: list[str] = [],
-        tasks: list[models.JiraTicket] = [],
-        distances: list[list[int]] = [],
         priority_weight: float = config.TASK_PRIORITY_WEIGHT,
     ):
         self.priority_weight = priority_weight
-        self.graph: "Graph" | None = None
-        self.technicians: list[str] = technicians
-        self.distances: list[list[int]] = distances
-        self.tasks: list[models.JiraTicket] = tasks
-        self.assignments = {}
+        self.engine = DistanceEngine()
+        self._tasks_by_key: dict[str, models.JiraTicket] = {}
+        # True while a snapshot references _tasks_by_key (copy before writing)
+        self._tasks_shared = False
+        self._task_keys_by_server: dict[str, set[str]] = {}
+        self.solvers = create_solvers()
+        self.last_solver: str | None = None
+        self._stale = False
+        self._full_resolve = True
+        self._dirty_technicians: set[str] = set()
+        self._dirty_tasks: set[str] = set()
+        # Guards the state above; held only for O(row/column) updates
         self.lock = threading.Lock()
+        # Bumped on every state change; the worker waits on _changed
+        self._generation = 0
+        self._changed = threading.Condition(self.lock)
+        # Serializes solves, which own self.solvers' warm-start state
+        self._solve_lock = threading.Lock()
+        # The latest result, replaced (never mutated) on each solve
+        self._result = AssignmentResult(0, MappingProxyType({}), None)
+        self._failed: tuple[int, Exception] | None = None
+        self._published = threading.Condition()
+        # Called with every new result, on the thread that solved it
+        self._listeners: list[Callable[[AssignmentResult], None]] = []
+        self._worker: threading.Thread | None = None
+        self._stopping = False
         logger.info("Initialized TaskAssigner")
 
-    def update_floor(
-        self,
-        technicians: list[str],
-        distances: list[list[int]],
-    ) -> None:
+    @property
+    def technicians(self) -> list[str]:
+        return self.engine.technician_ids
+
+    @property
+    def tasks(self) -> list[models.JiraTicket]:
+        return [self._tasks_by_key[key] for key in self.engine.target_ids]
+
+    @property
+    def distances(self) -> np.ndarray:
+        return self.engine.distances
+
+    @property
+    def assignments(self) -> Mapping[str, models.JiraTicket]:
+        """The latest published assignments (may lag the newest changes)."""
+        return self._result.assignments
+
+    def latest(self) -> AssignmentResult:
+        """The latest published result, read without taking any lock."""
+        return self._result
+
+    def _mark_stale_unsafe(self) -> None:
+        self._stale = True
+        self._generation += 1
+        self._changed.notify()
+
+    def snapshot(self) -> AssignmentSnapshot:
+        """Take an immutable snapshot of the current assignment problem."""
+        with self.lock:
+            return self._snapshot_unsafe()
+
+    def _snapshot_unsafe(self) -> AssignmentSnapshot:
+        engine = self.engine.snapshot()
+        self._tasks_shared = True
+        return AssignmentSnapshot(
+            technician_ids=engine.technician_ids,
+            task_ids=engine.target_ids,
+            tasks=MappingProxyType(self._tasks_by_key),
+            distances=engine.distances,
+        )
+
+    def _own_tasks(self) -> None:
+        if self._tasks_shared:
+            self._tasks_by_key = dict(self._tasks_by_key)
+            self._tasks_shared = False
+
+    def update_floor(self, technicians: list[models.Technician]) -> None:
+        """Replace every technician row and recompute the full matrix."""
         with self.lock:
-            self.technicians = technicians
-            self.distances = distances
-            self._rebuild_graph_unsafe()
+            self.engine.set_technicians(
+                [tech.id for tech in technicians],
+                [tech.location for tech in technicians],
+            )
+            self._full_resolve = True
+            self._mark_stale_unsafe()
 
-    def add_technician(self, technician: str, distances: list[int]) -> None:
+    def add_technician(self, technician: str, location: models.Location) -> None:
+        """Add a technician or move an existing one, updating only its row."""
+        with self.lock:
+            self.engine.upsert_technician(technician, location)
+            self._dirty_technicians.add(technician)
+            self._mark_stale_unsafe()
+
+    def update_technician_location(
+        self, technician: str, location: models.Location
+    ) -> bool:
+        """Move a known technician. Returns False if it is not being assigned."""
         with self.lock:
-            self.technicians.append(technician)
-            self.distances.append(distances)
-            self._rebuild_graph_unsafe()
+            if not self.engine.has_technician(technician):
+                return False
+            self.engine.upsert_technician(technician, location)
+            self._dirty_technicians.add(technician)
+            self._mark_stale_unsafe()
+            return True
+
+    def remove_technician(self, technician: str) -> bool:
+        with self.lock:
+            removed = self.engine.remove_technician(technician)
+            if removed:
+                self._mark_stale_unsafe()
+            return removed
 
     def _CONSTANT_PRIORITIES(self, num_tasks: int) -> np.ndarray:
         return np.array([1] * num_tasks)
 
-    def _rebuild_graph_unsafe(self):
-        if self.technicians and self.tasks and self.distances:
-            self.graph = Graph(
-                technicians=self.technicians,
-                tasks=self.tasks,
-                distances=np.array(self.distances),
-                task_priorities=self._CONSTANT_PRIORITIES(len(self.tasks)),
-                priority_weight=config.TASK_PRIORITY_WEIGHT,
+    def _solve_once(self) -> AssignmentResult:
+        """
+        Solve the current state if it changed since the last solve and
+        publish the result. Only capturing the state holds self.lock.
+        """
+        with self._solve_lock:
+            with self.lock:
+                if not self._stale:
+                    return self._result
+                snapshot = self._snapshot_unsafe()
+                generation = self._generation
+                dirty_technicians, self._dirty_technicians = (
+                    self._dirty_technicians,
+                    set(),
+                )
+                dirty_tasks, self._dirty_tasks = self._dirty_tasks, set()
+                full, self._full_resolve = self._full_resolve, False
+                self._stale = False
+
+            try:
+                task_ids = snapshot.task_ids
+                name = select_solver(len(snapshot.technician_ids), len(task_ids))
+                matches = self.solvers[name].solve(
+                    technician_ids=snapshot.technician_ids,
+                    task_ids=task_ids,
+                    distances=snapshot.distances,
+                    task_costs=self.priority_weight
+                    * self._CONSTANT_PRIORITIES(len(task_ids)),
+                    dirty_technicians=dirty_technicians,
+                    dirty_tasks=dirty_tasks,
+                    full=full,
+                )
+            except Exception as e:
+                # The deltas were consumed; start over on the next change
+                with self.lock:
+                    self._full_resolve = True
+                self._publish(failed=(generation, e))
+                raise
+
+            # Only the incremental solver's state follows the deltas; after any
+            # other backend it has to start from scratch next time.
+            if name != "incremental":
+                with self.lock:
+                    self._full_resolve = True
+            self.last_solver = name
+            result = AssignmentResult(
+                generation,
+                MappingProxyType(
+                    {tech: snapshot.tasks[key] for tech, key in matches.items()}
+                ),
+                name,
             )
+            self._publish(result=result)
+            return result
 
-    def set_distances(self, distances: list[list[int]]) -> None:
-        with self.lock:
-            self.distances = distances
-            self._rebuild_graph_unsafe()
-
-    def refresh_technicians(
+    def _publish(
         self,
-        technicians: list[str],
+        result: AssignmentResult | None = None,
+        failed: tuple[int, Exception] | None = None,
     ) -> None:
+        with self._published:
+            if result is not None:
+                self._result = result
+            if failed is not None:
+                self._failed = failed
+            self._published.notify_all()
+        if result is None:
+            return
+        for listener in list(self._listeners):
+            try:
+                listener(result)
+            except Exception as e:
+                logger.error(f"Assignment listener failed: {e}")
+
+    def add_listener(self, listener: Callable[[AssignmentResult], None]) -> None:
+        """
+        Call listener with every newly published result.
+
+        Listeners run on the solving thread, before the next solve starts, so
+        they should only hand the result off (e.g. to an event loop).
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[AssignmentResult], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def start(self) -> None:
+        """Start the background solver worker (no-op if it is running)."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self.lock:
+            self._stopping = False
+        self._worker = threading.Thread(
+            target=self._run, name="task-assigner-solver", daemon=True
+        )
+        self._worker.start()
+        logger.info("Started background assignment solver")
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background solver worker after its current solve."""
         with self.lock:
-            self.technicians = technicians
-            self._rebuild_graph_unsafe()
+            self._stopping = True
+            self._changed.notify()
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join(timeout)
+        # Wake anyone still waiting on the worker
+        self._publish()
+        logger.info("Stopped background assignment solver")
+
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                while not self._stale and not self._stopping:
+                    self._changed.wait()
+                if self._stopping:
+                    return
+            # Changes made while this solve runs are batched into the next one
+            try:
+                self._solve_once()
+            except Exception as e:
+                logger.error(f"Background assignment solve failed: {e}")
+
+    def wait_for(
+        self, generation: int, timeout: float | None = None
+    ) -> AssignmentResult:
+        """
+        Wait for the worker to publish a result covering a state generation.
+
+        Args:
+            generation: State generation the result must cover
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            The first published result at or after that generation
+
+        Raises:
+            TimeoutError: If no such result was published in time
+            RuntimeError: If solving that generation failed or the worker stopped
+        """
+
+        def settled() -> bool:
+            failed = self._failed
+            return (
+                self._result.generation >= generation
+                or (failed is not None and failed[0] >= generation)
+                or self._worker is None
+            )
+
+        with self._published:
+            if not self._published.wait_for(settled, timeout):
+                raise TimeoutError(f"No assignment for generation {generation} yet")
+            if self._result.generation >= generation:
+                return self._result
+            if self._failed is not None and self._failed[0] >= generation:
+                raise RuntimeError(f"Assignment solve failed: {self._failed[1]}")
+            raise RuntimeError("Assignment solver is not running")
 
     def refresh_tasks(
         self,
         tasks: list[models.JiraTicket],
+        locations: list[models.Location | None] | np.ndarray,
     ) -> None:
+        """
+        Replace every task column.
+
+        Args:
+            tasks: Tickets to assign
+            locations: Location of each ticket's server, None if unknown, or
+                an (S, 3) coordinate array with NaN rows for unknown servers
+        """
         logging.info("Refreshing tasks in TaskAssigner")
         with self.lock:
-            self.tasks = copy.deepcopy(tasks)
-            self._rebuild_graph_unsafe()
+            # Tickets are frozen, so they are shared rather than copied
+            previous_coords = dict(
+                zip(self.engine.target_ids, map(tuple, self.engine.target_coords))
+            )
+            self._tasks_by_key = {task.key: task for task in tasks}
+            self._tasks_shared = False
+            self._task_keys_by_server = {}
+            for task in tasks:
+                self._index_task_server(task)
+            self.engine.set_targets([task.key for task in tasks], locations)
+            # Only tasks that are new or whose location moved need repair.
+            for key, coords in zip(
+                self.engine.target_ids, map(tuple, self.engine.target_coords)
+            ):
+                if not np.array_equal(
+                    previous_coords.get(key, ()), coords, equal_nan=True
+                ):
+                    self._dirty_tasks.add(key)
+            self._mark_stale_unsafe()
+
+    def upsert_task(
+        self, task: models.JiraTicket, location: models.Location | None
+    ) -> None:
+        """Add or replace a single task, updating only its column."""
+        with self.lock:
+            self._remove_task_unsafe(task.key)
+            self._own_tasks()
+            self._tasks_by_key[task.key] = task
+            self._index_task_server(task)
+            self.engine.upsert_target(task.key, location)
+            self._dirty_tasks.add(task.key)
+            self._mark_stale_unsafe()
+
+    def remove_task(self, key: str) -> bool:
+        with self.lock:
+            removed = self._remove_task_unsafe(key)
+            if removed:
+                self._mark_stale_unsafe()
+            return removed
 
-    def assign_tasks(self) -> dict[str, models.JiraTicket]:
+    def update_server_location(
+        self, server_id: str, location: models.Location | None
+    ) -> None:
+        """Recompute the columns of every task on the given server."""
         with self.lock:
-            if self.graph:
-                self.assignments = self.graph.solve_graph()
-        return self.assignments
+            keys = self._task_keys_by_server.get(server_id, ())
+            for key in keys:
+                self.engine.upsert_target(key, location)
+                self._dirty_tasks.add(key)
+            if keys:
+                self._mark_stale_unsafe()
+
+    def _index_task_server(self, task: models.JiraTicket) -> None:
+        if task.server_id:
+            self._task_keys_by_server.setdefault(task.server_id, set()).add(task.key)
+
+    def _remove_task_unsafe(self, key: str) -> bool:
+        if key not in self._tasks_by_key:
+            return False
+        self._own_tasks()
+        task = self._tasks_by_key.pop(key)
+        if task.server_id in self._task_keys_by_server:
+            self._task_keys_by_server[task.server_id].discard(key)
+        self.engine.remove_target(key)
+        return True
+
+    def current_result(self, timeout: float | None = None) -> AssignmentResult:
+        """
+        Get a result that covers every change made so far: waits for the
+        background worker if it is running, otherwise solves in this thread.
+
+        Args:
+            timeout: Seconds to wait for the worker (None waits indefinitely)
+
+        Returns:
+            The published result, with its generation
+        """
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            return self.wait_for(self._generation, timeout)
+        return self._solve_once()
+
+    def assign_tasks(
+        self, timeout: float | None = None
+    ) -> Mapping[str, models.JiraTicket]:
+        """
+        Assignments covering every change made so far (see current_result).
+
+        Returns:
+            Technician ID -> assigned ticket (read-only)
+        """
+        return self.current_result(timeout).assignments
 
 
 class Graph:
@@ -113,13 +470,15 @@ class Graph:
         task_priorities: np.ndarray,
         priority_weight: float,
     ):
-        self.technicians = copy.deepcopy(technicians)
-        self.tasks = copy.deepcopy(tasks)
-        self.distances = copy.deepcopy(distances)
-        self.task_priorities = copy.deepcopy(task_priorities)
+        # Inputs are only read (costs are computed into a new array), so they
+        # are referenced rather than copied
+        self.technicians = technicians
+        self.tasks = tasks
+        self.distances = distances
+        self.task_priorities = task_priorities
         self.priority_weight = priority_weight
-        self.smcf, self.cost_offset = Graph._create_graph(
-            technitions=self.technicians,
+        self.smcf, self.cost_offset, self.assignment_arcs = Graph._create_graph(
+            technicians=self.technicians,
             tasks=self.tasks,
             distances=self.distances,
             task_priorities=self.task_priorities,
@@ -131,107 +490,321 @@ class Graph:
         if status != self.smcf.OPTIMAL:
             raise ValueError("The solver did not find an optimal solution.")
 
-        assignments = {}
+        # Tech-to-task arcs are laid out row-major, so the position of an arc
+        # with flow encodes (technician, task) directly.
+        flows = self.smcf.flows(self.assignment_arcs)
+        assigned = np.flatnonzero(flows > 0)
+        tech_indices, task_indices = np.divmod(assigned, len(self.tasks))
 
-        num_techs = len(self.technicians)
-        num_tasks = len(self.tasks)
-
-        # Tech-to-task arcs start at index num_techs
-        start_index = num_techs
-        end_index = num_techs + num_techs * num_tasks
-
-        # Loop through original combined list of arcs.
-        for arc_index in range(start_index, end_index):
-            flow = self.smcf.flow(arc_index)
-
-            # An assignment has occurred if flow is 1
-            if flow > 0:
-                tech_idx = self.smcf.tail(arc_index) - 1
-                task_idx = self.smcf.head(arc_index) - (num_techs + 1)
-                cost = self.smcf.unit_cost(arc_index) - self.cost_offset
-
-                assignments[self.technicians[tech_idx]] = self.tasks[task_idx]
-
-        return assignments
+        return {
+            self.technicians[tech_idx]: self.tasks[task_idx]
+            for tech_idx, task_idx in zip(
+                tech_indices.tolist(), task_indices.tolist()
+            )
+        }
 
+    @staticmethod
     def _create_graph(
-        technitions: list[str],
+        technicians: list[str],
         tasks: list[str],
         distances: np.ndarray,
         task_priorities: np.ndarray,
         priority_weight: float,
-    ) -> tuple[min_cost_flow.SimpleMinCostFlow, float]:
+    ) -> tuple[min_cost_flow.SimpleMinCostFlow, float, np.ndarray]:
         """
-        Create and return a min cost flow graph for assigning technicians to tasks
+        Create and return a min cost flow graph for assigning technicians to tasks,
+        along with the cost offset and the indices of the tech-to-task arcs.
         """
 
-        costs = (distances - priority_weight * task_priorities).astype(int)
         # Convert all costs to int for OR-Tools
-        costs = costs.astype(int)
+        costs = (distances - priority_weight * task_priorities).astype(np.int64)
         # OR-Tools requires costs to be non-negative.
         min_cost = np.min(costs)
         cost_offset = 0 if min_cost >= 0 else abs(min_cost)
         non_negative_costs = costs + cost_offset
 
-        num_techs = len(technitions)
+        num_techs = len(technicians)
         num_tasks = len(tasks)
 
-        SOURCE_NODE = 0
-        SINK_NODE = num_techs + num_tasks + 1
-        TECH_NODES = range(1, num_techs + 1)
-        TASK_NODES = range(num_techs + 1, num_techs + num_tasks + 1)
-
-        smcf = min_cost_flow.SimpleMinCostFlow()
-
-        # Source -> Technician arcs
-        source_to_tech_starts = [SOURCE_NODE] * num_techs
-        source_to_tech_ends = list(TECH_NODES)
-        source_to_tech_capacities = [1] * num_techs
-        source_to_tech_costs = [0] * num_techs
-
-        # Technician -> Task arcs
-        tech_to_task_starts = []
-        tech_to_task_ends = []
-        for i in range(num_techs):
-            for j in range(num_tasks):
-                tech_to_task_starts.append(TECH_NODES[i])
-                tech_to_task_ends.append(TASK_NODES[j])
-        tech_to_task_costs = non_negative_costs.flatten().tolist()
-        tech_to_task_capacities = [1] * len(tech_to_task_costs)
-
-        # Task -> Sink arcs
-        task_to_sink_starts = list(TASK_NODES)
-        task_to_sink_ends = [SINK_NODE] * num_tasks
-        task_to_sink_capacities = [1] * num_tasks
-        task_to_sink_costs = [0] * num_tasks
-
-        # Combine all arcs
-        start_nodes = source_to_tech_starts + tech_to_task_starts + task_to_sink_starts
-        end_nodes = source_to_tech_ends + tech_to_task_ends + task_to_sink_ends
-        capacities = (
-            source_to_tech_capacities
-            + tech_to_task_capacities
-            + task_to_sink_capacities
+        # Technician -> Task arcs in row-major order
+        smcf, assignment_arcs = build_assignment_network(
+            num_techs,
+            num_tasks,
+            np.repeat(np.arange(num_techs, dtype=np.int32), num_tasks),
+            np.tile(np.arange(num_tasks, dtype=np.int32), num_techs),
+            non_negative_costs.ravel(),
         )
-        costs_list = source_to_tech_costs + tech_to_task_costs + task_to_sink_costs
+        return (smcf, cost_offset, assignment_arcs)
+
+
+def build_assignment_network(
+    num_techs: int,
+    num_tasks: int,
+    arc_techs: np.ndarray,
+    arc_tasks: np.ndarray,
+    arc_costs: np.ndarray,
+) -> tuple[min_cost_flow.SimpleMinCostFlow, np.ndarray]:
+    """
+    Build the source -> technician -> task -> sink flow network with unit
+    capacities, using only the given technician-to-task arcs.
+
+    Args:
+        num_techs: Number of technicians
+        num_tasks: Number of tasks
+        arc_techs: Technician index of each candidate arc
+        arc_tasks: Task index of each candidate arc
+        arc_costs: Non-negative integer cost of each candidate arc
+
+    Returns:
+        The network and the arc indices of the technician-to-task arcs
+    """
+    SOURCE_NODE = 0
+    SINK_NODE = num_techs + num_tasks + 1
+    TECH_NODES = np.arange(1, num_techs + 1, dtype=np.int32)
+    TASK_NODES = np.arange(num_techs + 1, num_techs + num_tasks + 1, dtype=np.int32)
+    num_arcs = arc_techs.shape[0]
+
+    smcf = min_cost_flow.SimpleMinCostFlow()
+
+    # Source -> Technician, Technician -> Task, Task -> Sink
+    start_nodes = np.concatenate(
+        [
+            np.full(num_techs, SOURCE_NODE, dtype=np.int32),
+            TECH_NODES[arc_techs],
+            TASK_NODES,
+        ]
+    )
+    end_nodes = np.concatenate(
+        [
+            TECH_NODES,
+            TASK_NODES[arc_tasks],
+            np.full(num_tasks, SINK_NODE, dtype=np.int32),
+        ]
+    )
+    capacities = np.ones(start_nodes.shape[0], dtype=np.int64)
+    unit_costs = np.concatenate(
+        [
+            np.zeros(num_techs, dtype=np.int64),
+            np.asarray(arc_costs, dtype=np.int64),
+            np.zeros(num_tasks, dtype=np.int64),
+        ]
+    )
+
+    arcs = smcf.add_arcs_with_capacity_and_unit_cost(
+        start_nodes, end_nodes, capacities, unit_costs
+    )
+
+    # Only min(techs, tasks) units can reach the sink, so the source must
+    # supply exactly that much or the problem is unbalanced.
+    flow = min(num_tasks, num_techs)
+    supplies = np.zeros(SINK_NODE + 1, dtype=np.int64)
+    supplies[SOURCE_NODE] = flow
+    supplies[SINK_NODE] = -flow
+    smcf.set_nodes_supplies(np.arange(SINK_NODE + 1, dtype=np.int32), supplies)
+
+    return smcf, arcs[num_techs : num_techs + num_arcs]
+
+
+class AssignmentSolver(ABC):
+    """
+    Interface for assignment solver backends.
+
+    A backend maps technicians to at most one task each (and each task to at
+    most one technician), assigning min(technicians, tasks) pairs at minimum
+    total cost, where cost = trunc(distance - task_cost). Stateless backends
+    ignore the dirty sets; incremental_assignment.IncrementalAssignmentSolver
+    implements the same interface (and is registered as a virtual subclass)
+    and uses them to warm-start.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def solve(
+        self,
+        technician_ids: list[str],
+        task_ids: list[str],
+        distances: np.ndarray,
+        task_costs: np.ndarray,
+        dirty_technicians: AbstractSet[str] = frozenset(),
+        dirty_tasks: AbstractSet[str] = frozenset(),
+        full: bool = True,
+    ) -> dict[str, str]:
+        """
+        Args:
+            technician_ids: Technician IDs in distance-matrix row order
+            task_ids: Task IDs in distance-matrix column order
+            distances: (T, S) technician-to-task distances
+            task_costs: (S,) per-task cost subtracted from distances
+            dirty_technicians: Technicians whose row changed since the last solve
+            dirty_tasks: Tasks whose column changed since the last solve
+            full: Whether the previous solution must be discarded
+
+        Returns:
+            Mapping of technician ID to assigned task ID
+        """
+
+
+AssignmentSolver.register(IncrementalAssignmentSolver)
+
+
+class MinCostFlowSolver(AssignmentSolver):
+    """Builds the OR-Tools min-cost-flow Graph and solves it from scratch."""
 
-        # Add the arcs
-        for i in range(len(start_nodes)):
-            smcf.add_arc_with_capacity_and_unit_cost(
-                start_nodes[i], end_nodes[i], capacities[i], costs_list[i]
+    name = "min_cost_flow"
+
+    def solve(self, technician_ids, task_ids, distances, task_costs, **_):
+        if not technician_ids or not task_ids:
+            return {}
+        graph = Graph(
+            technicians=technician_ids,
+            tasks=task_ids,
+            distances=distances,
+            task_priorities=task_costs,
+            priority_weight=1,
+        )
+        return graph.solve_graph()
+
+
+class LinearSumAssignmentSolver(AssignmentSolver):
+    """Solves the dense rectangular cost matrix with SciPy's LAPJV solver."""
+
+    name = "linear_sum_assignment"
+
+    def solve(self, technician_ids, task_ids, distances, task_costs, **_):
+        if not technician_ids or not task_ids:
+            return {}
+        costs = np.trunc(distances - np.asarray(task_costs, dtype=np.float64))
+        rows, cols = linear_sum_assignment(costs)
+        return {
+            technician_ids[i]: task_ids[j]
+            for i, j in zip(rows.tolist(), cols.tolist())
+        }
+
+
+class SparseMinCostFlowSolver(AssignmentSolver):
+    """
+    Min-cost flow over a sparse k-nearest candidate graph.
+
+    Each technician only gets arcs to its k cheapest tasks, and each task to
+    its k cheapest technicians, so the network has O(k * (techs + tasks)) arcs
+    instead of techs * tasks. If the candidate graph cannot route
+    min(techs, tasks) units of flow, k is doubled and the graph rebuilt; once k
+    covers the whole matrix the dense linear-sum-assignment backend is used.
+    """
+
+    name = "sparse_min_cost_flow"
+
+    def __init__(self, k: int = config.SPARSE_ASSIGNMENT_K):
+        self.k = k
+        self.last_k: int | None = None
+
+    def solve(self, technician_ids, task_ids, distances, task_costs, **_):
+        if not technician_ids or not task_ids:
+            return {}
+        num_techs, num_tasks = len(technician_ids), len(task_ids)
+        task_costs = np.asarray(task_costs, dtype=np.float64)
+        required_flow = min(num_techs, num_tasks)
+
+        k = self.k
+        while k < max(num_techs, num_tasks):
+            arc_techs, arc_tasks = nearest_candidates(distances, task_costs, k)
+            costs = np.trunc(distances[arc_techs, arc_tasks] - task_costs[arc_tasks])
+            costs = costs.astype(np.int64)
+            costs -= min(0, costs.min())
+
+            smcf, assignment_arcs = build_assignment_network(
+                num_techs, num_tasks, arc_techs, arc_tasks, costs
+            )
+            status = smcf.solve_max_flow_with_min_cost()
+            if status == smcf.OPTIMAL and smcf.maximum_flow() >= required_flow:
+                self.last_k = k
+                assigned = np.flatnonzero(smcf.flows(assignment_arcs) > 0)
+                return {
+                    technician_ids[i]: task_ids[j]
+                    for i, j in zip(
+                        arc_techs[assigned].tolist(), arc_tasks[assigned].tolist()
+                    )
+                }
+            logger.info(
+                f"Sparse graph with k={k} routed {smcf.maximum_flow()} of "
+                f"{required_flow} assignments, widening"
             )
+            k *= 2
 
-        # Define the supply/demand for the nodes (source and sink)
-        supplies = [0] * (SINK_NODE + 1)  # All nodes start with 0 supply
-        supplies[SOURCE_NODE] = num_techs
-        supplies[SINK_NODE] = -min(
-            num_tasks, num_techs
-        )  # Sink demands flow maxed by technicians.
+        self.last_k = max(num_techs, num_tasks)
+        return LinearSumAssignmentSolver().solve(
+            technician_ids, task_ids, distances, task_costs
+        )
 
-        for i in range(len(supplies)):
-            smcf.set_node_supply(i, supplies[i])
 
-        return (smcf, cost_offset)
+def nearest_candidates(
+    distances: np.ndarray, task_costs: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Select the k cheapest tasks per technician and the k cheapest technicians
+    per task, scanning the matrix in bounded blocks.
+
+    Returns:
+        (technician indices, task indices) of the unique candidate arcs
+    """
+    num_techs, num_tasks = distances.shape
+    k_tasks = min(k, num_tasks)
+    k_techs = min(k, num_techs)
+    techs, tasks = [], []
+
+    block = max(1, MAX_BLOCK_CELLS // num_tasks)
+    for start in range(0, num_techs, block):
+        costs = distances[start : start + block] - task_costs
+        nearest = np.argpartition(costs, k_tasks - 1, axis=1)[:, :k_tasks]
+        techs.append(np.repeat(np.arange(start, start + costs.shape[0]), k_tasks))
+        tasks.append(nearest.ravel())
+
+    # A task's cost is the same for every technician, so ranking technicians
+    # per task only needs the distances. Transposed blocks keep the partition
+    # on contiguous rows.
+    block = max(1, MAX_BLOCK_CELLS // num_techs)
+    for start in range(0, num_tasks, block):
+        columns = np.ascontiguousarray(distances[:, start : start + block].T)
+        nearest = np.argpartition(columns, k_techs - 1, axis=1)[:, :k_techs]
+        techs.append(nearest.ravel())
+        tasks.append(np.repeat(np.arange(start, start + columns.shape[0]), k_techs))
+
+    arcs = np.sort(np.concatenate(techs) * num_tasks + np.concatenate(tasks))
+    arcs = arcs[np.concatenate(([True], arcs[1:] != arcs[:-1]))]
+    arc_techs, arc_tasks = np.divmod(arcs, num_tasks)
+    return arc_techs.astype(np.int32), arc_tasks.astype(np.int32)
+
+
+def create_solvers() -> dict[str, AssignmentSolver]:
+    """Create one instance of every solver backend, keyed by name."""
+    return {
+        IncrementalAssignmentSolver.name: IncrementalAssignmentSolver(),
+        LinearSumAssignmentSolver.name: LinearSumAssignmentSolver(),
+        MinCostFlowSolver.name: MinCostFlowSolver(),
+        SparseMinCostFlowSolver.name: SparseMinCostFlowSolver(),
+    }
+
+
+def select_solver(num_techs: int, num_tasks: int) -> str:
+    """
+    Pick the solver backend for a problem of the given shape.
+
+    config.ASSIGNMENT_BACKEND overrides the choice unless it is "auto". Under
+    "auto", lopsided problems (many more tasks than technicians or vice versa)
+    use the incremental solver: its augmenting paths are short, so solving
+    from scratch costs about the same as SciPy and later deltas are repaired
+    in milliseconds. Near-square problems, where augmenting paths get long,
+    go to the dense linear-sum-assignment backend.
+    """
+    if config.ASSIGNMENT_BACKEND != "auto":
+        return config.ASSIGNMENT_BACKEND
+    smaller, larger = sorted((num_techs, num_tasks))
+    if config.INCREMENTAL_ASSIGNMENT and (
+        smaller == 0 or larger / smaller >= config.INCREMENTAL_MIN_ASPECT_RATIO
+    ):
+        return "incremental"
+    return LinearSumAssignmentSolver.name
 
 
 task_assigner: TaskAssigner = TaskAssigner(priority_weight=config.TASK_PRIORITY_WEIGHT)
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from change_log import ChangeLog
 from models import Technician, Location
 import logging
 import threading
@@ -11,6 +12,9 @@ class TechnicianStore:
     def __init__(self):
         self._technicians: Dict[str, Technician] = {}
         self.lock = threading.Lock()
+        # Technician IDs changed at each version, for versioned responses and
+        # delta sync
+        self.changes = ChangeLog()
 
     def add_technician(self, technician: Technician) -> Technician:
         """
@@ -24,6 +28,7 @@ class TechnicianStore:
         """
         with self.lock:
             self._technicians[technician.id] = technician
+            self.changes.record([technician.id])
             logger.info(
                 f"Technician {technician.id} added/updated at location ({technician.location.x}, {technician.location.y}, {technician.location.z})"
             )
@@ -42,6 +47,7 @@ class TechnicianStore:
         with self.lock:
             if technician_id in self._technicians:
                 del self._technicians[technician_id]
+                self.changes.record(removed=[technician_id])
                 logger.info(f"Technician {technician_id} removed from store")
                 return True
             return False
@@ -85,12 +91,44 @@ class TechnicianStore:
         with self.lock:
             if technician_id in self._technicians:
                 self._technicians[technician_id].location = location
+                self.changes.record([technician_id])
                 logger.info(
                     f"Technician {technician_id} location updated to ({location.x}, {location.y}, {location.z})"
                 )
                 return self._technicians[technician_id]
             return None
 
+    @property
+    def version(self) -> int:
+        """Version of the stored technicians; changes whenever they do."""
+        return self.changes.version
+
+    def get_changes_since(self, since: int) -> Optional[Tuple[int, List[Technician], List[str]]]:
+        """
+        Get the technicians that changed after a version of the store.
+
+        Args:
+            since: Version from the client's previous response
+
+        Returns:
+            The current version, the changed technicians and the removed
+            technician IDs, or None if the change log no longer covers `since`
+        """
+        with self.lock:
+            changes = self.changes.changes_since(since)
+            if changes is None:
+                return None
+            technicians = [
+                self._technicians[technician_id]
+                for technician_id in changes.upserted
+                if technician_id in self._technicians
+            ]
+            removed = changes.removed + [
+                technician_id for technician_id in changes.upserted
+                if technician_id not in self._technicians
+            ]
+            return self.changes.version, technicians, removed
+
     def get_technician_count(self) -> int:
         """
         Get the count of active technicians.
@@ -107,6 +145,7 @@ class TechnicianStore:
         """
         with self.lock:
             self._technicians.clear()
+            self.changes.reset()
             logger.info("All technicians cleared from store")
 
 
@@ -0,0 +1,143 @@
+"""Assignment backends against SciPy's linear_sum_assignment."""
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+import config
+from task_assignment import (
+    AssignmentSolver,
+    Graph,
+    LinearSumAssignmentSolver,
+    SparseMinCostFlowSolver,
+    create_solvers,
+    nearest_candidates,
+    select_solver,
+)
+
+SHAPES = [(1, 1), (8, 30), (30, 8), (25, 25)]
+
+
+def random_problem(seed, num_techs, num_tasks):
+    rng = np.random.default_rng(seed)
+    tech_ids = [f"tech-{i}" for i in range(num_techs)]
+    task_ids = [f"task-{j}" for j in range(num_tasks)]
+    distances = rng.integers(0, 1000, size=(num_techs, num_tasks)).astype(np.int32)
+    task_costs = rng.integers(0, 4, size=num_tasks) * 250.0
+    return tech_ids, task_ids, distances, task_costs
+
+
+def optimal_cost(distances, task_costs):
+    costs = np.trunc(distances - task_costs)
+    rows, cols = linear_sum_assignment(costs)
+    return costs[rows, cols].sum()
+
+
+def assignment_cost(assignment, tech_ids, task_ids, distances, task_costs):
+    assert len(assignment) == min(len(tech_ids), len(task_ids))
+    assert len(set(assignment.values())) == len(assignment)
+    costs = np.trunc(distances - task_costs)
+    return sum(
+        costs[tech_ids.index(tech), task_ids.index(task)]
+        for tech, task in assignment.items()
+    )
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_graph_is_optimal(shape):
+    problem = random_problem(sum(shape), *shape)
+    assignment = Graph(*problem, priority_weight=1).solve_graph()
+    assert assignment_cost(assignment, *problem) == optimal_cost(*problem[2:])
+
+
+def test_graph_lays_out_arcs_row_major():
+    tech_ids, task_ids, distances, task_costs = random_problem(0, 3, 4)
+    graph = Graph(tech_ids, task_ids, distances, task_costs, priority_weight=2)
+    smcf = graph.smcf
+    costs = (distances - 2 * task_costs).astype(np.int64) + graph.cost_offset
+    for position, arc in enumerate(graph.assignment_arcs.tolist()):
+        tech, task = divmod(position, len(task_ids))
+        assert smcf.tail(arc) == 1 + tech
+        assert smcf.head(arc) == 1 + len(tech_ids) + task
+        assert smcf.unit_cost(arc) == costs[tech, task] >= 0
+    assert smcf.num_arcs() == len(tech_ids) * len(task_ids) + len(tech_ids) + len(task_ids)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("backend", sorted(create_solvers()))
+def test_backends_are_optimal(backend, shape):
+    problem = random_problem(sum(shape), *shape)
+    assignment = create_solvers()[backend].solve(*problem)
+    assert assignment_cost(assignment, *problem) == optimal_cost(*problem[2:])
+
+
+@pytest.mark.parametrize("backend", sorted(create_solvers()))
+def test_backends_handle_empty_problems(backend):
+    solver = create_solvers()[backend]
+    assert solver.solve([], ["task-0"], np.empty((0, 1)), np.zeros(1)) == {}
+    assert solver.solve(["tech-0"], [], np.empty((1, 0)), np.zeros(0)) == {}
+
+
+def test_backends_implement_the_interface():
+    for name, solver in create_solvers().items():
+        assert isinstance(solver, AssignmentSolver)
+        assert solver.name == name
+    with pytest.raises(TypeError):
+        AssignmentSolver()
+
+
+def test_select_solver(monkeypatch):
+    monkeypatch.setattr(config, "ASSIGNMENT_BACKEND", "auto")
+    monkeypatch.setattr(config, "INCREMENTAL_ASSIGNMENT", True)
+    monkeypatch.setattr(config, "INCREMENTAL_MIN_ASPECT_RATIO", 2)
+    assert select_solver(50, 500) == "incremental"
+    assert select_solver(500, 50) == "incremental"
+    assert select_solver(0, 10) == "incremental"
+    assert select_solver(100, 150) == LinearSumAssignmentSolver.name
+
+    monkeypatch.setattr(config, "INCREMENTAL_ASSIGNMENT", False)
+    assert select_solver(50, 500) == LinearSumAssignmentSolver.name
+
+    monkeypatch.setattr(config, "ASSIGNMENT_BACKEND", "min_cost_flow")
+    assert select_solver(50, 500) == "min_cost_flow"
+
+
+def test_sparse_solver_widens_candidates_until_optimal():
+    # Every technician's nearest tasks are the same few, so k=1 cannot
+    # route a full assignment and the candidate graph must be widened
+    tech_ids = [f"tech-{i}" for i in range(6)]
+    task_ids = [f"task-{j}" for j in range(12)]
+    distances = np.tile(np.arange(12, dtype=np.int32) * 10, (6, 1))
+    distances += np.arange(6, dtype=np.int32)[:, None]
+    task_costs = np.zeros(12)
+    solver = SparseMinCostFlowSolver(k=1)
+    assignment = solver.solve(tech_ids, task_ids, distances, task_costs)
+    assert assignment_cost(assignment, tech_ids, task_ids, distances, task_costs) == (
+        optimal_cost(distances, task_costs))
+    assert solver.last_k > 1
+
+
+@pytest.mark.parametrize("shape", [(40, 300), (300, 40)])
+def test_sparse_solver_is_optimal_on_larger_floors(shape):
+    problem = random_problem(7, *shape)
+    solver = SparseMinCostFlowSolver(k=4)
+    assignment = solver.solve(*problem)
+    assert assignment_cost(assignment, *problem) == optimal_cost(*problem[2:])
+
+
+def test_nearest_candidates_are_k_cheapest_per_row_and_column():
+    rng = np.random.default_rng(3)
+    num_techs, num_tasks, k = 20, 35, 3
+    # Distinct costs, so the k cheapest are well defined
+    distances = rng.permutation(num_techs * num_tasks).reshape(num_techs, num_tasks) * 2
+    task_costs = np.arange(num_tasks) * 0.01
+    arc_techs, arc_tasks = nearest_candidates(distances, task_costs, k)
+    arcs = list(zip(arc_techs.tolist(), arc_tasks.tolist()))
+    assert len(set(arcs)) == len(arcs)
+
+    costs = distances - task_costs
+    expected = {
+        (i, j) for i in range(num_techs) for j in np.argsort(costs[i])[:k].tolist()
+    } | {
+        (i, j) for j in range(num_tasks) for i in np.argsort(distances[:, j])[:k].tolist()
+    }
+    assert set(arcs) == expected
@@ -0,0 +1,80 @@
+"""Attachment size cap on POST /items/{ticket_key}/attachments."""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import config
+import main
+
+
+class RecordingJiraClient:
+    """Reads the upload the way add_attachment_stream does."""
+
+    def __init__(self):
+        self.uploaded = None
+
+    async def add_attachment_stream(self, ticket_key, read, filename, size=None, content_type=None):
+        data = b""
+        while chunk := await read(256):
+            data += chunk
+        self.uploaded = (ticket_key, filename, data)
+        return {"filename": filename, "size": len(data)}
+
+
+@pytest.fixture
+def jira(monkeypatch):
+    monkeypatch.setattr(config, "ATTACHMENT_MAX_BYTES", 1000)
+    monkeypatch.setattr(config, "ATTACHMENT_FORM_OVERHEAD_BYTES", 500)
+    client = RecordingJiraClient()
+    monkeypatch.setattr(main, "get_jira_client", lambda: client)
+    return client
+
+
+def test_upload_within_cap_is_streamed_to_jira(jira):
+    response = TestClient(main.app).post(
+        "/items/OPS-1/attachments", files={"file": ("photo.jpg", b"x" * 1000)})
+    assert response.status_code == 200
+    assert jira.uploaded == ("OPS-1", "photo.jpg", b"x" * 1000)
+
+
+@pytest.mark.parametrize("size", [1001, 5000])
+def test_oversized_upload_is_rejected(jira, size):
+    response = TestClient(main.app).post(
+        "/items/OPS-1/attachments", files={"file": ("photo.jpg", b"x" * size)})
+    assert response.status_code == 413
+    assert jira.uploaded is None
+
+
+def test_chunked_upload_is_cut_off_while_reading(jira):
+    # No Content-Length, so only counting the body as it arrives can stop it
+    def body():
+        for _ in range(100):
+            yield b"y" * 500
+
+    response = TestClient(main.app).post(
+        "/items/OPS-1/attachments", content=body(),
+        headers={"content-type": "multipart/form-data; boundary=xyz"})
+    assert response.status_code == 413
+    assert jira.uploaded is None
+
+
+def test_missing_file_field(jira):
+    response = TestClient(main.app).post(
+        "/items/OPS-1/attachments", files={"other": ("photo.jpg", b"x")})
+    assert response.status_code == 422
+
+
+def test_limit_read_stops_a_file_larger_than_declared():
+    chunks = [b"a" * 600, b"a" * 600, b""]
+
+    async def read(n):
+        return chunks.pop(0)
+
+    async def run():
+        limited = main.limit_read(read, 1000)
+        assert len(await limited(600)) == 600
+        with pytest.raises(main.AttachmentTooLarge):
+            await limited(600)
+
+    asyncio.run(run())
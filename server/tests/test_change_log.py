@@ -0,0 +1,66 @@
+"""ChangeLog deltas and resyncs."""
+from fastapi.testclient import TestClient
+
+import main
+from change_log import ChangeLog
+
+
+def test_changes_since_keeps_latest_change_per_key():
+    log = ChangeLog(max_entries=10)
+    start = log.version
+    log.record(upserted=["OPS-1", "OPS-2"])
+    log.record(removed=["OPS-1"])
+    changes = log.changes_since(start)
+    assert changes.upserted == ["OPS-2"]
+    assert changes.removed == ["OPS-1"]
+
+
+def test_changes_since_stops_at_upto():
+    log = ChangeLog(max_entries=10)
+    start = log.version
+    served = log.record(upserted=["OPS-1"])
+    log.record(upserted=["OPS-2"])
+    assert log.changes_since(start, upto=served).upserted == ["OPS-1"]
+
+
+def test_rollover_requires_resync():
+    log = ChangeLog(max_entries=3)
+    start = log.version
+    first = log.record(upserted=["OPS-1", "OPS-2"])
+    log.record(upserted=["OPS-3", "OPS-4"])
+    # OPS-1 rolled off, so only clients past the first version get a delta
+    assert log.changes_since(start) is None
+    assert sorted(log.changes_since(first).upserted) == ["OPS-3", "OPS-4"]
+
+
+def test_oversized_change_set_and_reset_require_resync():
+    log = ChangeLog(max_entries=2)
+    start = log.version
+    log.record(upserted=["OPS-1", "OPS-2", "OPS-3"])
+    assert log.changes_since(start) is None
+
+    current = log.version
+    log.reset()
+    assert log.changes_since(current) is None
+
+
+def test_future_version_requires_resync():
+    log = ChangeLog()
+    assert log.changes_since(log.version + 1) is None
+
+
+class StaleJiraClient:
+    version = 42
+
+    def get_changes_since(self, since, status=None):
+        return None
+
+
+def test_items_endpoint_answers_stale_since_with_resync(monkeypatch):
+    monkeypatch.setattr(main, "get_jira_client", lambda: StaleJiraClient())
+    response = TestClient(main.app).get("/items", params={"since": 7})
+    assert response.status_code == 200
+    body = response.json()
+    assert body == {
+        **main.resync_response(42, 7), "tickets": [], "removed": [], "count": 0,
+    }
@@ -0,0 +1,175 @@
+"""Assignment pushes, send queues and heartbeats of technician sessions."""
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+import config
+import main
+from connection_manager import ASSIGNMENT, PING, ConnectionManager
+from models import JiraTicket
+from task_assignment import AssignmentResult
+
+TICKET_1 = JiraTicket(key="OPS-1")
+TICKET_2 = JiraTicket(key="OPS-2")
+
+
+def result(generation, **assignments):
+    return AssignmentResult(generation, assignments, "test")
+
+
+def connect(manager, technician_id):
+    session = manager.open(websocket=None)
+    manager.bind(session, technician_id)
+    return session
+
+
+def queued(session):
+    return [json.loads(message) for message in session._outbox.values()]
+
+
+def test_only_changed_assignments_are_queued():
+    manager = ConnectionManager()
+    session = connect(manager, "t1")
+    # No assignment yet and nothing sent, so nothing to withdraw
+    assert not manager.send_assignment("t1", result(1))
+    assert manager.send_assignment("t1", result(2, t1=TICKET_1))
+    assert not manager.send_assignment("t1", result(3, t1=TICKET_1))
+    assert manager.send_assignment("t1", result(4))
+    assert queued(session) == [{"event_type": "unassigned", "payload": None}]
+    assert manager.counters["messages_coalesced"] == 1
+
+
+def test_older_results_are_never_queued_after_newer_ones():
+    manager = ConnectionManager()
+    session = connect(manager, "t1")
+    assert manager.send_assignment("t1", result(5, t1=TICKET_2))
+    assert not manager.send_assignment("t1", result(4, t1=TICKET_1))
+    assert queued(session)[0]["payload"]["key"] == "OPS-2"
+
+
+def test_unknown_technician_is_skipped():
+    assert not ConnectionManager().send_assignment("t1", result(1, t1=TICKET_1))
+
+
+def test_broadcast_counts_queued_changes():
+    manager = ConnectionManager()
+    sessions = {tech: connect(manager, tech) for tech in ("t1", "t2", "t3")}
+    assert manager.broadcast(result(1, t1=TICKET_1, t2=TICKET_2)) == 2
+    assert manager.broadcast(result(2, t1=TICKET_1, t3=TICKET_2)) == 2
+    # t1's unchanged assignment is still queued once, not twice
+    assert list(sessions["t1"]._outbox) == [ASSIGNMENT]
+    assert [m["event_type"] for m in queued(sessions["t2"])] == ["unassigned"]
+    assert manager.metrics()["technicians"] == 3
+
+
+def test_rebinding_replaces_the_previous_session():
+    manager = ConnectionManager()
+    old = connect(manager, "t1")
+    manager.send_assignment("t1", result(1, t1=TICKET_1))
+    new = connect(manager, "t1")
+    assert old.closed and old.close_reason == "replaced by a new connection"
+    # The new connection starts from scratch and gets the assignment again
+    assert manager.send_assignment("t1", result(1, t1=TICKET_1))
+    assert queued(new)[0]["payload"]["key"] == "OPS-1"
+    manager.remove(old)
+    assert manager.metrics()["technicians"] == 1
+
+
+class FakeWebSocket:
+    """Feeds queued client messages and records what the server sends."""
+
+    def __init__(self, send_delay=0.0):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+        self.send_delay = send_delay
+        self.closed = False
+
+    async def receive_text(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.send_delay)
+        self.sent.append(json.loads(message))
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fast_heartbeat(monkeypatch):
+    monkeypatch.setattr(config, "WS_PING_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(config, "WS_PING_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(config, "WS_SEND_TIMEOUT_SECONDS", 0.05)
+
+
+def serve_for(websocket, seconds, client_messages=()):
+    """Serve a session for up to `seconds`; returns it once it has stopped."""
+
+    async def run():
+        session = ConnectionManager().open(websocket)
+        for message in client_messages:
+            websocket.incoming.put_nowait(message)
+        serving = asyncio.create_task(session.serve(main.handle_technician_message))
+        await asyncio.wait([serving], timeout=seconds)
+        session.close("test finished")
+        await serving
+        return session
+
+    return asyncio.run(run())
+
+
+def test_queued_messages_of_a_kind_coalesce():
+    manager = ConnectionManager()
+    session = manager.open(websocket=None)
+    assert session.enqueue(ASSIGNMENT, "first")
+    assert session.enqueue(PING, "ping")
+    assert session.enqueue(ASSIGNMENT, "second")
+    # Latest wins and keeps the place of the message it replaced
+    assert list(session._outbox.items()) == [(ASSIGNMENT, "second"), (PING, "ping")]
+    assert session.queue_depth == 2
+    assert manager.counters["messages_coalesced"] == 1
+
+
+def test_closed_session_drops_messages():
+    manager = ConnectionManager()
+    session = manager.open(websocket=None)
+    session.enqueue(ASSIGNMENT, "pending")
+    session.close("gone")
+    assert not session.enqueue(ASSIGNMENT, "late")
+    assert session.queue_depth == 0
+    assert manager.counters["messages_dropped"] == 2
+
+
+def test_heartbeat_keeps_clients_that_never_pong(fast_heartbeat):
+    websocket = FakeWebSocket()
+    session = serve_for(websocket, 0.3)
+    assert session.close_reason == "test finished"
+    assert {"event_type": "ping", "payload": None} in websocket.sent
+
+
+def test_heartbeat_closes_clients_that_stop_answering(fast_heartbeat):
+    websocket = FakeWebSocket()
+    session = serve_for(websocket, 2, client_messages=['{"event_type": "pong"}'])
+    assert session.answers_pings
+    assert session.close_reason == "heartbeat timed out"
+    assert session.manager.counters["heartbeat_timeouts"] == 1
+    assert websocket.closed
+
+
+def test_slow_consumer_is_closed(fast_heartbeat):
+    websocket = FakeWebSocket(send_delay=1)
+    session = serve_for(websocket, 2)
+    assert session.close_reason == "send timed out"
+    assert session.manager.counters["slow_consumer_closes"] == 1
+
+
+def test_client_disconnect_ends_the_session(fast_heartbeat):
+    websocket = FakeWebSocket()
+    session = serve_for(websocket, 2, client_messages=[None])
+    assert session.close_reason == "disconnected"
+    assert not websocket.closed
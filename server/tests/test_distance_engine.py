@@ -0,0 +1,144 @@
+"""Distance matrix against the scalar formula, and DistanceEngine updates."""
+import math
+
+import numpy as np
+import pytest
+
+import config
+from distance_engine import DistanceEngine, compute_distance_matrix, locations_to_array
+from models import Location
+
+
+def scalar_distance(tech, target, floor_weight=config.FLOOR_WEIGHT):
+    """The per-pair formula /floor_updates used before vectorization."""
+    if any(math.isnan(c) for c in (*tech, *target)):
+        return config.UNKNOWN_LOCATION_DISTANCE
+    return int(
+        ((tech[0] - target[0]) ** 2 + (tech[1] - target[1]) ** 2) ** 0.5
+        + abs(tech[2] - target[2]) * floor_weight
+    )
+
+
+def brute_force(techs, targets):
+    return np.array(
+        [[scalar_distance(t, s) for s in targets] for t in techs], dtype=np.int32
+    ).reshape(len(techs), len(targets))
+
+
+def random_coords(rng, n):
+    coords = np.column_stack([
+        rng.uniform(0, 500, n), rng.uniform(0, 500, n), rng.integers(0, 3, n)
+    ]).astype(np.float64)
+    return coords
+
+
+def test_matches_scalar_formula():
+    rng = np.random.default_rng(1)
+    techs, targets = random_coords(rng, 40), random_coords(rng, 70)
+    np.testing.assert_array_equal(
+        compute_distance_matrix(techs, targets), brute_force(techs, targets))
+
+
+def test_unknown_locations_get_sentinel_distance():
+    techs = locations_to_array([Location(x=1, y=2, z=0), None])
+    targets = locations_to_array([Location(x=4, y=6, z=1), None])
+    distances = compute_distance_matrix(techs, targets)
+    assert distances[0, 0] == scalar_distance(techs[0], targets[0])
+    assert distances[0, 1] == distances[1, 0] == distances[1, 1] == (
+        config.UNKNOWN_LOCATION_DISTANCE)
+
+
+def test_blocked_computation_matches_single_pass(monkeypatch):
+    import distance_engine
+
+    rng = np.random.default_rng(2)
+    techs, targets = random_coords(rng, 25), random_coords(rng, 30)
+    expected = compute_distance_matrix(techs, targets)
+    # Force several row blocks, including a short last one
+    monkeypatch.setattr(distance_engine, "MAX_BLOCK_CELLS", 30 * 4)
+    np.testing.assert_array_equal(compute_distance_matrix(techs, targets), expected)
+
+
+@pytest.mark.parametrize("shape", [(0, 5), (5, 0), (0, 0)])
+def test_empty_sides(shape):
+    techs, targets = np.empty((shape[0], 3)), np.empty((shape[1], 3))
+    assert compute_distance_matrix(techs, targets).shape == shape
+
+
+def location(coords):
+    return Location(x=coords[0], y=coords[1], z=coords[2])
+
+
+def assert_engine_consistent(engine):
+    """Every cell equals the distance between the IDs' current coordinates."""
+    np.testing.assert_array_equal(
+        engine.distances,
+        compute_distance_matrix(engine.technician_coords, engine.target_coords),
+    )
+    assert engine.distances.shape == (len(engine.technician_ids), len(engine.target_ids))
+
+
+def test_engine_updates_match_full_recompute():
+    rng = np.random.default_rng(3)
+    engine = DistanceEngine()
+    engine.set_technicians(
+        [f"tech-{i}" for i in range(5)], [location(c) for c in random_coords(rng, 5)])
+    engine.set_targets([f"rack-{j}" for j in range(4)], random_coords(rng, 4))
+    coords = {}
+    for _ in range(200):
+        op = rng.integers(0, 4)
+        if op == 0:
+            tech = f"tech-{rng.integers(0, 12)}"
+            coords[tech] = random_coords(rng, 1)[0]
+            engine.upsert_technician(tech, location(coords[tech]))
+        elif op == 1 and engine.technician_ids:
+            engine.remove_technician(rng.choice(engine.technician_ids))
+        elif op == 2:
+            engine.upsert_target(f"rack-{rng.integers(0, 12)}", location(random_coords(rng, 1)[0]))
+        elif engine.target_ids:
+            engine.remove_target(rng.choice(engine.target_ids))
+        assert_engine_consistent(engine)
+        for tech, expected in coords.items():
+            if engine.has_technician(tech):
+                row = engine.technician_ids.index(tech)
+                np.testing.assert_array_equal(engine.technician_coords[row], expected)
+
+
+def test_engine_grows_by_doubling():
+    engine = DistanceEngine()
+    engine.set_targets(["rack-0"], [Location(x=0, y=0, z=0)])
+    capacities = set()
+    for i in range(33):
+        engine.upsert_technician(f"tech-{i}", Location(x=i, y=0, z=0))
+        capacities.add(engine._matrix.shape[0])
+    assert capacities == {1, 2, 4, 8, 16, 32, 64}
+    assert engine.distances[:, 0].tolist() == list(range(33))
+
+
+def test_remove_swaps_last_row_and_column_into_the_gap():
+    engine = DistanceEngine()
+    engine.set_technicians(["a", "b", "c"], [Location(x=i, y=0, z=0) for i in range(3)])
+    engine.set_targets(["r", "s", "t"], [Location(x=0, y=i, z=0) for i in range(3)])
+    assert engine.remove_technician("a")
+    assert engine.remove_target("r")
+    assert engine.technician_ids == ["c", "b"]
+    assert engine.target_ids == ["t", "s"]
+    assert not engine.remove_technician("a")
+    assert_engine_consistent(engine)
+
+
+def test_snapshot_is_not_changed_by_later_updates():
+    engine = DistanceEngine()
+    engine.set_technicians(["a", "b"], [Location(x=0, y=0, z=0), Location(x=5, y=0, z=0)])
+    engine.set_targets(["r", "s"], [Location(x=1, y=0, z=0), Location(x=2, y=0, z=0)])
+    snapshot = engine.snapshot()
+    before = snapshot.distances.copy()
+    assert not snapshot.distances.flags.writeable
+
+    engine.upsert_technician("a", Location(x=100, y=0, z=0))
+    engine.remove_target("r")
+    engine.upsert_technician("c", Location(x=9, y=9, z=1))
+
+    np.testing.assert_array_equal(snapshot.distances, before)
+    assert snapshot.technician_ids == ("a", "b")
+    assert_engine_consistent(engine)
@@ -0,0 +1,102 @@
+"""IncrementalAssignmentSolver against SciPy after random edits."""
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from incremental_assignment import IncrementalAssignmentSolver
+
+
+class Problem:
+    """Technicians and tasks at random points, edited one change at a time."""
+
+    def __init__(self, rng, num_techs, num_tasks):
+        self.rng = rng
+        self.techs = {f"tech-{i}": self.point() for i in range(num_techs)}
+        self.tasks = {f"task-{j}": (self.point(), self.cost()) for j in range(num_tasks)}
+        self.next_id = max(num_techs, num_tasks)
+
+    def point(self):
+        return self.rng.uniform(0, 1000, size=3)
+
+    def cost(self):
+        return float(self.rng.integers(0, 4) * 100)
+
+    def matrices(self):
+        tech_ids, task_ids = list(self.techs), list(self.tasks)
+        techs = np.array([self.techs[t] for t in tech_ids])
+        tasks = np.array([self.tasks[t][0] for t in task_ids])
+        distances = np.linalg.norm(techs[:, None, :] - tasks[None, :, :], axis=2)
+        task_costs = np.array([self.tasks[t][1] for t in task_ids])
+        return tech_ids, task_ids, distances, task_costs
+
+    def edit(self):
+        """Apply one random edit; returns (dirty technicians, dirty tasks)."""
+        kind = self.rng.choice(["move", "reprioritize", "add_tech", "add_task",
+                                "remove_tech", "remove_task"])
+        self.next_id += 1
+        if kind == "move":
+            tech = self.rng.choice(list(self.techs))
+            self.techs[tech] = self.point()
+            return {tech}, set()
+        if kind == "reprioritize":
+            task = self.rng.choice(list(self.tasks))
+            self.tasks[task] = (self.tasks[task][0], self.cost())
+            return set(), {task}
+        if kind == "add_tech":
+            self.techs[f"tech-{self.next_id}"] = self.point()
+        elif kind == "add_task":
+            self.tasks[f"task-{self.next_id}"] = (self.point(), self.cost())
+        elif kind == "remove_tech" and len(self.techs) > 1:
+            del self.techs[self.rng.choice(list(self.techs))]
+        elif kind == "remove_task" and len(self.tasks) > 1:
+            del self.tasks[self.rng.choice(list(self.tasks))]
+        # New and removed IDs are picked up without being marked dirty
+        return set(), set()
+
+
+def total_cost(assignment, tech_ids, task_ids, costs):
+    rows = {t: i for i, t in enumerate(tech_ids)}
+    cols = {t: j for j, t in enumerate(task_ids)}
+    return sum(costs[rows[tech], cols[task]] for tech, task in assignment.items())
+
+
+@pytest.mark.parametrize("num_techs,num_tasks", [(30, 200), (200, 30), (60, 60)])
+def test_matches_linear_sum_assignment_after_random_edits(num_techs, num_tasks):
+    rng = np.random.default_rng(num_techs * 1000 + num_tasks)
+    problem = Problem(rng, num_techs, num_tasks)
+    solver = IncrementalAssignmentSolver()
+    dirty_techs, dirty_tasks = set(), set()
+
+    for _ in range(60):
+        tech_ids, task_ids, distances, task_costs = problem.matrices()
+        assignment = solver.solve(
+            tech_ids, task_ids, distances, task_costs,
+            dirty_technicians=dirty_techs, dirty_tasks=dirty_tasks,
+        )
+
+        costs = np.trunc(distances - task_costs)
+        rows, cols = linear_sum_assignment(costs)
+        assert len(assignment) == min(len(tech_ids), len(task_ids))
+        assert len(set(assignment.values())) == len(assignment)
+        assert total_cost(assignment, tech_ids, task_ids, costs) == pytest.approx(
+            costs[rows, cols].sum())
+
+        dirty_techs, dirty_tasks = problem.edit()
+
+    assert solver.incremental_solves > 0
+
+
+def test_full_solve_discards_previous_solution():
+    rng = np.random.default_rng(7)
+    problem = Problem(rng, 20, 50)
+    solver = IncrementalAssignmentSolver()
+    tech_ids, task_ids, distances, task_costs = problem.matrices()
+    solver.solve(tech_ids, task_ids, distances, task_costs)
+    solver.solve(tech_ids, task_ids, distances, task_costs, full=True)
+    assert solver.full_solves == 2
+    assert solver.incremental_solves == 0
+
+
+def test_empty_side_returns_no_assignment():
+    solver = IncrementalAssignmentSolver()
+    assert solver.solve([], ["task-1"], np.empty((0, 1)), np.zeros(1)) == {}
@@ -0,0 +1,129 @@
+"""AdaptiveLimiter, RetryBudget and Retry-After parsing."""
+import asyncio
+
+import httpx
+import pytest
+
+from jira_rate_limit import (
+    BACKGROUND,
+    INTERACTIVE,
+    AdaptiveLimiter,
+    RetryBudget,
+    backoff_seconds,
+    retry_after_seconds,
+)
+
+
+def test_limiter_halves_once_per_congestion_event_then_recovers():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=8, min_limit=1)
+        started = [await limiter.acquire() for _ in range(4)]
+        # Requests sent before the decrease count as one event
+        for start in started:
+            limiter.release(start, throttled=True)
+        assert int(limiter.limit) == 4
+
+        start = await limiter.acquire()
+        limiter.release(start, throttled=True)
+        assert int(limiter.limit) == 2
+
+        for _ in range(100):
+            limiter.release(await limiter.acquire())
+        assert limiter.limit == 8
+        assert limiter.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_limiter_never_drops_below_min_limit():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=4, min_limit=2)
+        for _ in range(5):
+            limiter.release(await limiter.acquire(), throttled=True)
+        assert limiter.limit == 2
+
+    asyncio.run(run())
+
+
+def test_limiter_dispatches_interactive_before_background():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=1, min_limit=1)
+        held = await limiter.acquire()
+        order = []
+
+        async def request(name, priority):
+            start = await limiter.acquire(priority)
+            order.append(name)
+            limiter.release(start)
+
+        tasks = [
+            asyncio.create_task(request("sync-1", BACKGROUND)),
+            asyncio.create_task(request("sync-2", BACKGROUND)),
+            asyncio.create_task(request("comment", INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queued() == {"background": 2, "interactive": 1}
+        limiter.release(held)
+        await asyncio.gather(*tasks)
+        assert order == ["comment", "sync-1", "sync-2"]
+
+    asyncio.run(run())
+
+
+def test_limiter_waits_out_retry_after():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=2, min_limit=1)
+        limiter.release(await limiter.acquire(), throttled=True, retry_after=0.1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        limiter.release(await limiter.acquire())
+        assert loop.time() - start >= 0.09
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        limiter = AdaptiveLimiter(max_limit=1, min_limit=1)
+        held = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release(held)
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        limiter.release(await asyncio.wait_for(limiter.acquire(), 1))
+
+    asyncio.run(run())
+
+
+def test_retry_budget_refills_from_first_attempts():
+    budget = RetryBudget(ratio=0.5, reserve=2)
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.balance == 2
+
+
+def test_retry_after_seconds():
+    now = 1_700_000_000.0
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "5"}), now) == 5
+    assert retry_after_seconds(
+        httpx.Headers({"Retry-After": "Tue, 14 Nov 2023 22:13:30 GMT"}), now) == 10
+    assert retry_after_seconds(
+        httpx.Headers({"X-RateLimit-Reset": "2023-11-14T22:13:40Z"}), now) == 20
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "soon"}), now) is None
+    assert retry_after_seconds(httpx.Headers(), now) is None
+
+
+def test_backoff_never_undercuts_retry_after():
+    for attempt in range(1, 6):
+        assert backoff_seconds(attempt, retry_after=3) >= 3
+        assert backoff_seconds(attempt) >= 0
@@ -0,0 +1,140 @@
+"""JiraClient syncs against the local Jira stand-in."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import config
+from jira import JiraClient
+from jira_standin import STATUSES, StandinServer, create_standin_app, jira_timestamp
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    app = create_standin_app(300, seed=1)
+    with StandinServer(app) as server:
+        monkeypatch.setenv("JIRA_URL", server.url)
+        monkeypatch.setenv("JIRA_USERNAME", "test")
+        monkeypatch.setenv("JIRA_API_TOKEN", "test")
+        monkeypatch.setenv("JIRA_PROJECT_KEY", "OPS")
+        yield app.state.jira
+
+
+def run_with_client(test):
+    async def run():
+        client = JiraClient()
+        try:
+            return await test(client)
+        finally:
+            await client.transport.aclose()
+
+    return asyncio.run(run())
+
+
+def change_status(state, key, status):
+    issue = state.get(key)
+    issue["fields"]["status"] = {"name": status, "id": STATUSES[status]}
+    state.touch(issue)
+
+
+def test_delta_sync_fetches_only_updated_tickets(standin):
+    async def test(client):
+        first = await client.sync_tickets()
+        assert first.full
+        assert len(first.updated) == 300
+
+        assert await client.sync_tickets() == (False, [], [])
+
+        ticket = client.tickets[10]
+        status = next(s for s in STATUSES if s != ticket["status"])
+        change_status(standin, ticket["key"], status)
+        delta = await client.sync_tickets()
+        assert not delta.full
+        assert [t["key"] for t in delta.updated] == [ticket["key"]]
+        assert delta.updated[0]["status"] == status
+        assert client.get_tickets_by_status(status).count(delta.updated[0]) == 1
+        assert len(client.tickets) == 300
+
+    run_with_client(test)
+
+
+def test_delta_sync_adds_new_tickets_and_reconcile_drops_deleted(standin, monkeypatch):
+    async def test(client):
+        await client.sync_tickets()
+        created = standin.create_issue(datetime.now(timezone.utc))
+        delta = await client.sync_tickets()
+        assert [t["key"] for t in delta.updated] == [created["key"]]
+        # Newest created first, like a full fetch
+        assert client.tickets[0]["key"] == created["key"]
+
+        deleted = client.tickets[5]["key"]
+        issue = standin.issues.pop(deleted)
+        standin.issues.pop(issue["id"])
+        standin.version += 1
+        # Deletions are not visible to an updated-since query...
+        assert (await client.sync_tickets()).removed == []
+        # ...but the periodic reconcile drops them
+        monkeypatch.setattr(config, "JIRA_RECONCILE_INTERVAL_MINUTES", 0)
+        reconcile = await client.sync_tickets()
+        assert reconcile.full
+        assert reconcile.removed == [deleted]
+        assert deleted not in {t["key"] for t in client.tickets}
+
+    run_with_client(test)
+
+
+def test_delta_sync_overlaps_the_watermark(standin):
+    async def test(client):
+        await client.sync_tickets()
+        # An update stamped slightly before the newest one we have (clock
+        # skew between Jira nodes) must still be picked up
+        ticket = client.tickets[-1]
+        issue = standin.get(ticket["key"])
+        status = next(s for s in STATUSES if s != ticket["status"])
+        issue["fields"]["status"] = {"name": status, "id": STATUSES[status]}
+        issue["fields"]["updated"] = jira_timestamp(
+            client._watermark.astimezone(timezone.utc) - timedelta(minutes=1))
+        standin.version += 1
+        delta = await client.sync_tickets()
+        assert [t["key"] for t in delta.updated] == [ticket["key"]]
+
+    run_with_client(test)
+
+
+def test_full_fetch_pages_ids_and_keeps_query_order(standin, monkeypatch):
+    # Several ID pages and bulkfetch batches, the last of each partial
+    monkeypatch.setattr(config, "JIRA_ID_PAGE_SIZE", 70)
+    monkeypatch.setattr(config, "JIRA_BULK_FETCH_SIZE", 40)
+    jql = "project = OPS ORDER BY created DESC"
+
+    async def test(client):
+        return await client._fetch_tickets(jql)
+
+    tickets = run_with_client(test)
+    assert [t["key"] for t in tickets] == [i["key"] for i in standin.search(jql)]
+    assert len(tickets) == 300
+
+
+def test_failed_batch_cancels_the_others(standin):
+    started, cancelled = [], []
+
+    async def test(client):
+        async def bulk_fetch(issue_ids):
+            started.append(issue_ids)
+            if len(started) == 2:
+                raise RuntimeError("Jira is down")
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(issue_ids)
+                raise
+            return []
+
+        client._bulk_fetch = bulk_fetch
+        with pytest.raises(RuntimeError, match="Jira is down"):
+            await client._fetch_tickets("project = OPS ORDER BY created DESC")
+        assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+    run_with_client(test)
+    assert len(started) == 3
+    assert len(cancelled) == 2
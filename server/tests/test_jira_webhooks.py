@@ -0,0 +1,121 @@
+"""Webhook signature checks, delivery dedup, event parsing and apply order."""
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from jira import JiraClient
+from jira_webhooks import (
+    DELIVERY_ID_HEADER,
+    ISSUE_UPDATED,
+    SIGNATURE_HEADER,
+    WebhookReceiver,
+    parse_event,
+    verify_signature,
+)
+
+SECRET = "s3cret"
+BODY = json.dumps({"webhookEvent": ISSUE_UPDATED, "issue": {"id": "1", "key": "OPS-1"}}).encode()
+
+
+def sign(body, secret=SECRET):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_verify_signature_accepts_matching_signature():
+    assert verify_signature(SECRET, BODY, sign(BODY))
+
+
+@pytest.mark.parametrize("signature", [
+    None,
+    "",
+    sign(BODY, "other-secret"),
+    sign(BODY + b" "),
+    "sha1=" + hmac.new(SECRET.encode(), BODY, hashlib.sha1).hexdigest(),
+    "sha256",
+])
+def test_verify_signature_rejects(signature):
+    assert not verify_signature(SECRET, BODY, signature)
+
+
+def test_receiver_checks_signature_header():
+    receiver = WebhookReceiver(secret=SECRET)
+    assert receiver.authenticate(BODY, {SIGNATURE_HEADER: sign(BODY)})
+    assert not receiver.authenticate(BODY, {SIGNATURE_HEADER: sign(BODY, "other-secret")})
+    assert not receiver.authenticate(BODY, {})
+
+
+def test_receiver_without_secret_fails_closed():
+    assert not WebhookReceiver(secret="", allow_unsigned=False).authenticate(BODY, {})
+    assert WebhookReceiver(secret="", allow_unsigned=True).authenticate(BODY, {})
+
+
+def test_claim_is_exclusive_until_released_or_remembered():
+    receiver = WebhookReceiver(secret=SECRET, dedup_size=2)
+    event = parse_event(json.loads(BODY), {DELIVERY_ID_HEADER: "delivery-1"})
+
+    assert receiver.claim(event)
+    # A retry arriving while the original is still being applied
+    assert not receiver.claim(event)
+    receiver.release(event)
+    assert receiver.claim(event)
+    receiver.remember(event)
+    assert not receiver.claim(event)
+
+
+def test_remembered_deliveries_are_bounded():
+    receiver = WebhookReceiver(secret=SECRET, dedup_size=2)
+    events = [
+        parse_event(json.loads(BODY), {DELIVERY_ID_HEADER: f"delivery-{i}"})
+        for i in range(3)
+    ]
+    for event in events:
+        assert receiver.claim(event)
+        receiver.remember(event)
+    assert receiver.claim(events[0])
+    assert not receiver.claim(events[2])
+
+
+def test_parse_event_without_delivery_id_uses_event_fields():
+    payload = dict(json.loads(BODY), timestamp=1700000000000)
+    first = parse_event(payload, {})
+    assert first.issue_key == "OPS-1"
+    assert first.delivery_id == parse_event(dict(payload), {}).delivery_id
+    assert first.delivery_id != parse_event(dict(payload, timestamp=1), {}).delivery_id
+
+
+@pytest.mark.parametrize("payload", [[], {}, {"webhookEvent": ISSUE_UPDATED}])
+def test_parse_event_rejects_non_events(payload):
+    with pytest.raises(ValueError):
+        parse_event(payload, {})
+
+
+def test_deleted_ticket_is_not_resurrected_and_followups_run_in_order(monkeypatch):
+    monkeypatch.setenv("JIRA_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("JIRA_USERNAME", "test")
+    monkeypatch.setenv("JIRA_API_TOKEN", "test")
+    ticket = {"key": "OPS-1", "status": "To Do", "server_id": None,
+              "updated": "2026-01-01T10:00:00.000+0000"}
+    applied = []
+
+    async def run():
+        client = JiraClient()
+
+        async def follow_up(name):
+            # Slow enough that an unordered update would overtake it
+            await asyncio.sleep(0.01)
+            applied.append(name)
+
+        await asyncio.gather(
+            client.apply_ticket(ticket, lambda: follow_up("upsert")),
+            client.remove_ticket("OPS-1", lambda: follow_up("remove")),
+        )
+        late_update = dict(ticket, updated="2026-01-01T11:00:00.000+0000")
+        assert not await client.apply_ticket(late_update, lambda: follow_up("late"))
+        assert client.tickets == []
+        await client.transport.aclose()
+
+    asyncio.run(run())
+    assert applied == ["upsert", "remove"]
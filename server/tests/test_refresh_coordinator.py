@@ -0,0 +1,113 @@
+"""Debouncing and coalescing of RefreshCoordinator."""
+import asyncio
+
+import pytest
+
+from refresh_coordinator import RefreshCoordinator
+
+
+class Refresher:
+    """Counts refreshes; each one waits for `release` if given."""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self.started = asyncio.Event()
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        self.started.set()
+        if self.release is not None:
+            await self.release.wait()
+        if self.fail:
+            raise RuntimeError("Jira is down")
+        return call
+
+
+def test_concurrent_requests_share_one_refresh():
+    async def run():
+        refresh = Refresher()
+        coordinator = RefreshCoordinator(refresh, window_seconds=0.01)
+        results = await asyncio.gather(
+            *(coordinator.request("schedule") for _ in range(5)),
+            coordinator.request("manual"),
+        )
+        return refresh, coordinator, results
+
+    refresh, coordinator, results = asyncio.run(run())
+    assert refresh.calls == 1
+    assert results == [1] * 6
+    stats = coordinator.stats()
+    assert stats["triggers"] == 6
+    assert stats["coalesced"] == 5
+    assert stats["refreshes"] == 1
+    assert stats["triggers_by_reason"] == {"schedule": 5, "manual": 1}
+    assert not stats["pending"] and not stats["running"]
+
+
+def test_request_during_a_refresh_gets_a_later_one():
+    async def run():
+        refresh = Refresher()
+        refresh.release = asyncio.Event()
+        coordinator = RefreshCoordinator(refresh, window_seconds=0)
+        first = coordinator.trigger(debounce=False)
+        await refresh.started.wait()
+        assert coordinator.stats()["running"]
+        # Both join the one refresh waiting for the running one to finish
+        second = coordinator.trigger()
+        third = coordinator.trigger()
+        assert second is third
+        refresh.release.set()
+        return refresh, await first, await second
+
+    refresh, first, second = asyncio.run(run())
+    assert (first, second) == (1, 2)
+    assert refresh.calls == 2
+
+
+def test_failures_reach_every_waiter():
+    async def run():
+        coordinator = RefreshCoordinator(Refresher(fail=True), window_seconds=0)
+        results = await asyncio.gather(
+            coordinator.request(), coordinator.request(), return_exceptions=True
+        )
+        return coordinator, results
+
+    coordinator, results = asyncio.run(run())
+    assert all(isinstance(e, RuntimeError) for e in results)
+    assert coordinator.stats()["failures"] == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_refresh():
+    async def run():
+        refresh = Refresher()
+        coordinator = RefreshCoordinator(refresh, window_seconds=0.05)
+        impatient = asyncio.create_task(coordinator.request())
+        patient = asyncio.create_task(coordinator.request())
+        await asyncio.sleep(0)
+        impatient.cancel()
+        return refresh, await patient
+
+    refresh, result = asyncio.run(run())
+    assert result == 1 and refresh.calls == 1
+
+
+def test_close_cancels_waiting_and_running_refreshes():
+    async def run():
+        refresh = Refresher()
+        refresh.release = asyncio.Event()
+        coordinator = RefreshCoordinator(refresh, window_seconds=0)
+        running = coordinator.trigger(debounce=False)
+        await refresh.started.wait()
+        waiting = coordinator.trigger()
+        await coordinator.close()
+        return coordinator, running, waiting
+
+    coordinator, running, waiting = asyncio.run(run())
+    assert running.cancelled() and waiting.cancelled()
+    stats = coordinator.stats()
+    assert not stats["pending"] and not stats["running"]
+    with pytest.raises(asyncio.CancelledError):
+        running.result()
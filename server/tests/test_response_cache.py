@@ -0,0 +1,114 @@
+"""ETag/304 and gzip handling of pre-serialized responses."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from response_cache import ResponseCache, _accepts_gzip, _etag_matches
+
+
+class Source:
+    def __init__(self, size):
+        self.version = 1
+        self.size = size
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return {"version": self.version, "items": ["x" * 10] * self.size}
+
+
+def make_client(source, cache):
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(request: Request):
+        return cache.respond(request, "items", source.version, source.render)
+
+    return TestClient(app)
+
+
+def test_unchanged_version_gets_304_and_renders_once():
+    source = Source(size=5)
+    client = make_client(source, ResponseCache())
+    first = client.get("/items")
+    assert first.status_code == 200
+    assert first.json()["version"] == 1
+    etag = first.headers["etag"]
+
+    assert client.get("/items").content == first.content
+    not_modified = client.get("/items", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert source.renders == 1
+
+    source.version = 2
+    changed = client.get("/items", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["version"] == 2
+    assert source.renders == 2
+
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it():
+    source = Source(size=500)
+    client = make_client(source, ResponseCache(gzip_min_bytes=1024))
+    raw = client.get("/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == raw.json()
+    assert source.renders == 1
+
+
+def test_small_bodies_are_not_compressed():
+    client = make_client(Source(size=1), ResponseCache(gzip_min_bytes=1024))
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_least_recently_used_keys_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    renders = []
+
+    def render(key):
+        renders.append(key)
+        return {"key": key}
+
+    app = FastAPI()
+
+    @app.get("/{key}")
+    def get(key: str, request: Request):
+        return cache.respond(request, key, 1, lambda: render(key))
+
+    client = TestClient(app)
+    for key in ["a", "b", "a", "c", "a", "b"]:
+        assert client.get(f"/{key}").json() == {"key": key}
+    # "b" was evicted by "c" while "a" stayed in use
+    assert renders == ["a", "b", "c", "b"]
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"x", W/"abc"', True),
+    ("*", True),
+    ('W/"abd"', False),
+])
+def test_etag_matching(header, expected):
+    assert _etag_matches(header, 'W/"abc"') is expected
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, False),
+    ("gzip", True),
+    ("br, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("*", True),
+    ("deflate", False),
+])
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
@@ -0,0 +1,66 @@
+"""PrefixIndex lookups against filtering every ID."""
+import random
+
+import pytest
+
+from server_ids import PrefixIndex, parse_server_id, prefix_from_levels
+
+
+def random_ids(rng, n):
+    return {
+        f"{rng.randint(1, 2):02d}-{rng.randint(1, 3):02d}-{rng.randint(1, 4):02d}"
+        f"-{rng.randint(1, 5):02d}-U{rng.randint(1, 4)}"
+        for _ in range(n)
+    }
+
+
+def matches(server_id, prefix):
+    path = parse_server_id(server_id)
+    return all(part is None or part == actual for part, actual in zip(prefix, path))
+
+
+@pytest.fixture
+def index_and_ids():
+    rng = random.Random(5)
+    ids = random_ids(rng, 300)
+    index = PrefixIndex()
+    for server_id in ids:
+        index.add(server_id, server_id)
+    for server_id in rng.sample(sorted(ids), 60):
+        assert index.discard(server_id)
+        ids.remove(server_id)
+    return rng, index, ids
+
+
+def test_find_matches_filter(index_and_ids):
+    rng, index, ids = index_and_ids
+    samples = sorted(ids)
+    for _ in range(100):
+        path = parse_server_id(rng.choice(samples))
+        levels = [part if rng.random() < 0.6 else None for part in path]
+        prefix = prefix_from_levels(*levels)
+        assert index.find(prefix) == {i for i in ids if matches(i, prefix)}
+    assert index.find(prefix_from_levels("99")) == set()
+    assert len(index) == len(ids)
+
+
+def test_results_are_copies(index_and_ids):
+    _, index, ids = index_and_ids
+    found = index.find(prefix_from_levels())
+    server_id = next(iter(sorted(ids)))
+    exact = index.exact(server_id)
+    index.add("02-03-04-05-U9", "02-03-04-05-U9")
+    index.discard(server_id)
+    assert found == ids
+    assert exact == {server_id}
+
+
+def test_discard_prunes_empty_branches():
+    index = PrefixIndex()
+    index.add("01-01-01-01-U1", "OPS-1")
+    index.add("01-01-01-01-U1", "OPS-2")
+    assert index.exact("01-01-01-01-U1") == {"OPS-1", "OPS-2"}
+    assert index.discard("OPS-1") and index.discard("OPS-2")
+    assert not index.discard("OPS-2")
+    assert index.find(prefix_from_levels("01")) == set()
+    assert index._root.children == {}
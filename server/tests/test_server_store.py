@@ -0,0 +1,120 @@
+"""SpatialIndex queries against a brute-force scan, and ServerStore locking."""
+import threading
+
+import numpy as np
+import pytest
+
+from distance_engine import compute_distance_matrix, locations_to_array
+from models import Location, Server
+from server_store import ServerStore
+from spatial_index import SpatialIndex
+
+
+def random_points(rng, n):
+    return {
+        f"rack-{i}": Location(
+            x=float(rng.uniform(-50, 250)),
+            y=float(rng.uniform(-50, 250)),
+            z=float(rng.integers(0, 3)),
+        )
+        for i in range(n)
+    }
+
+
+def brute_force_distances(location, points):
+    ids = list(points)
+    distances = compute_distance_matrix(
+        locations_to_array([location]), locations_to_array(points.values()))[0]
+    return dict(zip(ids, distances.tolist()))
+
+
+@pytest.fixture
+def indexed_points():
+    rng = np.random.default_rng(11)
+    points = random_points(rng, 400)
+    index = SpatialIndex(cell_size=20)
+    for point_id, location in points.items():
+        index.insert(point_id, location)
+    # Move and remove some points so stale buckets would show up
+    for point_id in list(points)[:50]:
+        points[point_id] = Location(x=float(rng.uniform(0, 200)), y=0.0, z=1.0)
+        index.insert(point_id, points[point_id])
+    for point_id in list(points)[50:80]:
+        del points[point_id]
+        assert index.remove(point_id)
+    return rng, index, points
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 1000])
+def test_nearest_matches_brute_force(indexed_points, k):
+    rng, index, points = indexed_points
+    for _ in range(20):
+        location = Location(x=float(rng.uniform(-100, 300)), y=float(rng.uniform(-100, 300)),
+                            z=float(rng.integers(0, 3)))
+        expected = sorted(brute_force_distances(location, points).values())[:k]
+        found = index.nearest(location, k)
+        assert [distance for _, distance in found] == expected
+        for point_id, distance in found:
+            assert brute_force_distances(location, {point_id: points[point_id]})[point_id] == distance
+
+
+@pytest.mark.parametrize("radius", [0, 15, 60.5, 400])
+def test_within_radius_matches_brute_force(indexed_points, radius):
+    rng, index, points = indexed_points
+    for _ in range(20):
+        location = Location(x=float(rng.uniform(0, 200)), y=float(rng.uniform(0, 200)),
+                            z=float(rng.integers(0, 3)))
+        expected = {
+            point_id: distance
+            for point_id, distance in brute_force_distances(location, points).items()
+            if distance <= radius
+        }
+        found = index.within_radius(location, radius)
+        assert dict(found) == expected
+        assert [distance for _, distance in found] == sorted(expected.values())
+
+
+def test_coordinates_of_unknown_points_are_nan():
+    index = SpatialIndex()
+    index.insert("rack-1", Location(x=1, y=2, z=3))
+    coords = index.coordinates(["rack-1", "missing", None])
+    assert coords[0].tolist() == [1, 2, 3]
+    assert np.isnan(coords[1:]).all()
+
+
+def test_queries_survive_concurrent_removals():
+    store = ServerStore()
+    servers = [
+        Server(id=f"rack-{i}", name=f"rack-{i}", location=Location(x=i % 50, y=i // 50, z=0))
+        for i in range(500)
+    ]
+    for server in servers:
+        store.add_server(server)
+    stop = threading.Event()
+    errors = []
+
+    def churn():
+        while not stop.is_set():
+            for server in servers[:100]:
+                store.remove_server(server.id)
+            for server in servers[:100]:
+                store.add_server(server)
+
+    def query():
+        try:
+            for _ in range(200):
+                store.get_nearest_servers(Location(x=5, y=1, z=0), 50)
+                store.get_servers_within(Location(x=5, y=1, z=0), 10)
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=churn)
+    writer.start()
+    readers = [threading.Thread(target=query) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join()
+    stop.set()
+    writer.join()
+    assert errors == []
@@ -0,0 +1,117 @@
+"""TicketIndex lookups against scanning the ticket list, and patching."""
+import asyncio
+import random
+
+import pytest
+
+from jira import JiraClient, TicketIndex
+from server_ids import parse_server_id
+
+STATUSES = ["To Do", "In Progress", "Done", "done", None]
+SERVERS = [f"01-01-01-{rack:02d}-U{u}" for rack in range(1, 4) for u in range(1, 4)]
+
+
+def make_ticket(i, status, server_id):
+    return {"key": f"OPS-{i}", "summary": f"Ticket {i}", "status": status,
+            "server_id": server_id}
+
+
+def random_tickets(rng, n):
+    return [
+        make_ticket(i, rng.choice(STATUSES), rng.choice(SERVERS + [None]))
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_lookups_match_scan(seed):
+    tickets = random_tickets(random.Random(seed), 60)
+    index = TicketIndex(tickets)
+
+    assert index.by_key == {t["key"]: t for t in tickets}
+    for server_id in SERVERS:
+        assert index.by_server.get(server_id, []) == [
+            t for t in tickets if t["server_id"] == server_id]
+    for status in {s.lower() for s in STATUSES if s}:
+        assert index.by_status.get(status, []) == [
+            t for t in tickets if (t["status"] or "").lower() == status]
+    for rack in ("01", "02", "03"):
+        expected = [
+            t for t in tickets
+            if t["server_id"] and parse_server_id(t["server_id"])[3] == rack
+        ]
+        assert index.resolve(index.by_location.find(("01", "01", "01", rack))) == expected
+
+
+def test_resolve_keeps_list_order():
+    tickets = random_tickets(random.Random(9), 10)
+    index = TicketIndex(tickets)
+    assert index.resolve(["OPS-7", "OPS-2", "OPS-5"]) == [tickets[2], tickets[5], tickets[7]]
+
+
+def assert_same_index(patched, rebuilt):
+    assert patched.tickets == rebuilt.tickets
+    assert patched.positions == rebuilt.positions
+    assert patched.by_key == rebuilt.by_key
+    assert patched.by_server == rebuilt.by_server
+    assert patched.by_status == rebuilt.by_status
+    for server_id in rebuilt.by_server:
+        assert patched.by_location.exact(server_id) == rebuilt.by_location.exact(server_id)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_patched_index_equals_rebuild(seed):
+    rng = random.Random(seed)
+    index = TicketIndex(random_tickets(rng, 50))
+    for _ in range(30):
+        old = rng.choice(index.tickets)
+        ticket = dict(old, status=rng.choice(STATUSES), summary=f"Edited {rng.random()}")
+        patched = index.with_ticket(ticket, version=index.version + 1)
+
+        rebuilt = TicketIndex(
+            [ticket if t["key"] == ticket["key"] else t for t in index.tickets])
+        assert_same_index(patched, rebuilt)
+        assert patched.version == index.version + 1
+        index = patched
+
+
+def test_new_or_moved_ticket_needs_rebuild():
+    index = TicketIndex([make_ticket(1, "To Do", "01-01-01-01-U1")])
+    assert index.with_ticket(make_ticket(2, "To Do", "01-01-01-01-U1")) is None
+    assert index.with_ticket(make_ticket(1, "To Do", "01-01-01-02-U1")) is None
+
+
+def test_patch_leaves_original_untouched():
+    index = TicketIndex([make_ticket(1, "To Do", "01-01-01-01-U1")])
+    index.with_ticket(make_ticket(1, "Done", "01-01-01-01-U1"))
+    assert index.by_key["OPS-1"]["status"] == "To Do"
+    assert list(index.by_status) == ["to do"]
+
+
+def test_apply_ticket_patches_cache_and_ignores_older_updates(monkeypatch):
+    monkeypatch.setenv("JIRA_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("JIRA_USERNAME", "test")
+    monkeypatch.setenv("JIRA_API_TOKEN", "test")
+
+    async def run():
+        client = JiraClient()
+        tickets = [
+            dict(make_ticket(i, "To Do", SERVERS[i]), updated="2026-01-01T10:00:00.000+0000")
+            for i in range(3)
+        ]
+        client._index_tickets(tickets)
+        version = client.version
+
+        newer = dict(tickets[1], status="Done", updated="2026-01-01T11:00:00.000+0000")
+        assert await client.apply_ticket(newer)
+        assert client.get_tickets_by_status("done") == [newer]
+        assert client.changes.changes_since(version).upserted == ["OPS-1"]
+
+        # A delivery that was overtaken by a newer one changes nothing
+        older = dict(tickets[1], status="In Progress")
+        assert not await client.apply_ticket(older)
+        assert not await client.apply_ticket(newer)
+        assert client.tickets[1] == newer
+        await client.transport.aclose()
+
+    asyncio.run(run())